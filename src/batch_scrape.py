@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - ASYNC BATCH SCRAPE
+===========================================================
+
+Description:
+    Çok sayıda menü / bilgi sayfasını eşzamanlı çeken ve ayrıştıran
+    async toplu kazıma. scrape_info_items / scrap_all_pages /
+    fetch_raw_html'in tek URL'lik mantığını aiohttp üzerinde çalıştırır:
+        - Eşzamanlılık   : settings.max_concurrent_requests işçi
+        - Akış           : sonuçlar tamamlandıkça üretilir (sırasız,
+                           her sonuçta "index" alanı vardır)
+        - Hata yalıtımı  : başarısız URL {"ok": False, "error": ...}
+                           döner, diğerleri etkilenmez
+        - Önbellek       : http_cache ile ortak (taze kayıtta ağa
+                           gidilmez, bayatsa koşullu istek)
+        - Birleştirme    : aynı anda istenen aynı URL tek kez çekilir
+                           (src.single_flight, thread çağıranlarla ortak)
+        - Yeniden deneme : 5xx / bağlantı hatalarında http_retries
+                           kez, jitter'lı üstel geri çekilme
+        - Hız sınırı     : her istek (ve deneme) host başına token
+                           bucket'tan geçer; allowed_domains dışı URL
+                           hata sonucu döner (src.rate_limiter)
+
+    use_browser=True ve tarayıcı havuzu açıksa sayfalar havuzdaki
+    sürücülerle açılır (havuz boyutu da max_concurrent_requests).
+
+    CLI (URL listesi -> JSONL):
+        python -m src.batch_scrape urls.txt [-o sonuc.jsonl] [--mode items|text|html]
+                                   [--selector CSS] [--concurrency N] [--browser]
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import asyncio, itertools, logging, random, time
+from typing import AsyncIterator, Iterable, List, Optional
+
+import aiohttp
+
+from src.settings import settings
+from src.html_parser import iter_text_lines
+from src.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (500, 502, 503, 504)
+MODES = ("items", "text", "html")
+URL_READ_BATCH = 256  # dosyadan okunan URL'ler event loop dışında bu boyutta parçalarla alınır
+
+
+
+def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+    if retry_after and retry_after.strip().isdigit(): return min(30.0, float(retry_after))
+    return min(30.0, settings.http_backoff * (2 ** attempt)) + random.uniform(0, settings.http_backoff_jitter)
+
+
+async def _get(session: aiohttp.ClientSession, url: str, *, timeout: float, headers: dict, encoding: Optional[str]):
+    """GET + yeniden deneme; (status, headers, body) döner. 304'te gövde boştur, 4xx/son 5xx hata fırlatır."""
+    retries = max(0, settings.http_retries)
+    for attempt in range(retries + 1):
+        retry_after = None
+        await get_rate_limiter().aacquire(url)  # her deneme host'un kovasından token alır
+        try:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                if resp.status in RETRY_STATUSES and attempt < retries: retry_after = resp.headers.get("Retry-After")
+                else:
+                    resp.raise_for_status()
+                    body = "" if resp.status == 304 else await resp.text(encoding=encoding, errors="replace")
+                    return resp.status, resp.headers, body
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt >= retries: raise
+        await asyncio.sleep(_backoff(attempt, retry_after))
+    raise RuntimeError("unreachable")
+
+
+async def fetch_html(session: aiohttp.ClientSession, url: str, *, timeout: float = 20, encoding: Optional[str] = None, use_browser: bool = False) -> str:
+    """Tek URL'nin HTML'i (fetch_raw_html'in async karşılığı; aynı önbelleği kullanır)."""
+    from src.scrap_page import ensure_browser, fetch_raw_html
+    from src.single_flight import fetch_key, get_single_flight
+    get_rate_limiter().check(url)
+    if ensure_browser(use_browser):
+        return await asyncio.to_thread(fetch_raw_html, url, timeout=int(timeout), encoding=encoding, use_browser=True)
+    # aynı anda aynı URL'yi isteyen (async veya thread) çağıranlar tek isteği paylaşır
+    return await get_single_flight().ado(fetch_key(url, encoding=encoding, use_browser=use_browser), _fetch_http,
+                                         session, url, timeout=timeout, encoding=encoding)
+
+
+async def _fetch_http(session: aiohttp.ClientSession, url: str, *, timeout: float, encoding: Optional[str]) -> str:
+    headers = {"User-Agent": settings.browser_config.user_agent or "Mozilla/5.0"}
+    if not settings.enable_cache: return (await _get(session, url, timeout=timeout, headers=headers, encoding=encoding))[2]
+    from src.http_cache import cache_key, get_http_cache, revalidation_headers, store_response, unconditional_headers
+    cache = get_http_cache()
+    key = cache_key(url, "http", encoding)
+    entry = await asyncio.to_thread(cache.get, key)
+    if entry is not None and entry.fresh: return entry.body
+    status, resp_headers, body = await _get(session, url, timeout=timeout, headers=revalidation_headers(entry, headers), encoding=encoding)
+    if status == 304 and entry is None:  # elde gövde yok: koşulsuz yeniden çek
+        status, resp_headers, body = await _get(session, url, timeout=timeout, headers=unconditional_headers(headers), encoding=encoding)
+    return await asyncio.to_thread(store_response, cache, key, url, entry, status, resp_headers, body)
+
+
+def _extract(html: str, mode: str, selector: str, include_html: bool):
+    if mode == "html": return html
+    if mode == "text": return "\n".join(iter_text_lines([html]))
+    from src.scrap_page import extract_info_items
+    return extract_info_items(html, selector=selector, include_html=include_html)
+
+
+async def scrape_many(
+    urls: Iterable[str],
+    *,
+    mode: str = "items",
+    selector: str = ".info-content-column__item",
+    include_html: bool = False,
+    timeout: float = 20,
+    encoding: Optional[str] = None,
+    use_browser: bool = False,
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[dict]:
+    """
+    URL'leri eşzamanlı çekip ayrıştırır, sonuçları tamamlandıkça üretir.
+
+    Sonuç formatı:
+        {"index": int, "url": str, "ok": bool, "elapsed_ms": float,
+         "items" | "text" | "html": ... (mode'a göre), "error": str (yalnızca ok=False)}
+    """
+    if mode not in MODES: raise ValueError(f"Geçersiz mode: {mode} ({', '.join(MODES)})")
+    workers = max(1, concurrency or settings.max_concurrent_requests)
+    pending: asyncio.Queue = asyncio.Queue(workers * 2)  # URL listesi tümüyle belleğe alınmaz
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def scrape_one(session: aiohttp.ClientSession, index: int, url: str) -> dict:
+        start = time.perf_counter()
+        result: dict = {"index": index, "url": url, "ok": True}
+        try:
+            html = await fetch_html(session, url, timeout=timeout, encoding=encoding, use_browser=use_browser)
+            result[mode] = await asyncio.to_thread(_extract, html, mode, selector, include_html)
+        except asyncio.CancelledError: raise
+        except Exception as e:
+            result.update(ok=False, error=f"{type(e).__name__}: {e}")
+            logger.warning(f"Toplu kazıma hatası ({url}): {e}")
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    async def produce() -> None:
+        # list/tuple doğrudan; diğer iterable'lar (ör. _read_urls: dosya / stdin) bloklayabilir -> parça parça thread'de okunur
+        source = iter(urls)
+        read = (lambda: list(itertools.islice(source, URL_READ_BATCH)))
+        index = 0
+        while batch := (read() if isinstance(urls, (list, tuple)) else await asyncio.to_thread(read)):
+            for url in batch:
+                await pending.put((index, url))
+                index += 1
+        for _ in range(workers): await pending.put(None)
+
+    async def work(session: aiohttp.ClientSession) -> None:
+        while (job := await pending.get()) is not None: await results.put(await scrape_one(session, *job))
+
+    connector = aiohttp.TCPConnector(limit=workers, limit_per_host=settings.http_pool_maxsize, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def supervise() -> None:
+            try: await asyncio.gather(produce(), *(work(session) for _ in range(workers)))
+            finally: results.put_nowait(None)
+
+        supervisor = asyncio.create_task(supervise())
+        try:
+            while (result := await results.get()) is not None: yield result
+            await supervisor  # üretici / işçi beklenmedik şekilde çöktüyse hatayı yüzeye çıkar
+        finally:
+            # tüketici erken çıktıysa (break / iptal) kalan işler iptal edilir
+            supervisor.cancel()
+            await asyncio.gather(supervisor, return_exceptions=True)
+
+
+
+# ================== CLI ==================
+def _read_urls(path: str) -> Iterable[str]:
+    """Satır satır okuyan üreteç (bloklayan I/O): scrape_many bunu event loop dışında, parça parça tüketir."""
+    import sys
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"): yield line
+    finally:
+        if f is not sys.stdin: f.close()
+
+
+async def _run_cli(argv: List[str]) -> int:
+    import argparse, json, sys
+    parser = argparse.ArgumentParser(prog="python -m src.batch_scrape", description="URL listesini eşzamanlı kazıyıp JSONL yazar.")
+    parser.add_argument("urls", help="Satır başına bir URL içeren dosya ('-' = stdin, '#' ile başlayanlar atlanır)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL çıktı dosyası ('-' = stdout)")
+    parser.add_argument("--mode", choices=MODES, default="items")
+    parser.add_argument("--selector", default=".info-content-column__item")
+    parser.add_argument("--include-html", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=None, help="varsayılan: settings.max_concurrent_requests")
+    parser.add_argument("--timeout", type=float, default=20)
+    parser.add_argument("--browser", action="store_true", help="sayfaları tarayıcı havuzuyla aç")
+    args = parser.parse_args(argv)
+
+    pool = None
+    if args.browser:
+        from src.browser_pool import get_browser_pool
+        pool = get_browser_pool()
+        await asyncio.to_thread(lambda: pool.release(pool.acquire()))  # havuzu ısıt: ensure_browser açık sürücü görür
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    ok = failed = 0
+    start = time.perf_counter()
+    try:
+        async for result in scrape_many(_read_urls(args.urls), mode=args.mode, selector=args.selector, include_html=args.include_html,
+                                        timeout=args.timeout, use_browser=args.browser, concurrency=args.concurrency):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            if result["ok"]: ok += 1
+            else: failed += 1
+    finally:
+        if out is not sys.stdout: out.close()
+        if pool is not None: await asyncio.to_thread(pool.close)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {ok} başarılı, ❌ {failed} hatalı — {elapsed:.1f} s ({(ok + failed) / elapsed if elapsed else 0:.1f} URL/s)", file=sys.stderr)
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(asyncio.run(_run_cli(sys.argv[1:])))
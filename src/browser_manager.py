@@ -26,12 +26,15 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
-from webdriver_manager.chrome import ChromeDriverManager
-import asyncio, logging, time, os, base64, platform, subprocess, psutil
+# webdriver_manager yalnızca driver indirilmesi gerekirse (settings._get_chrome_driver_path) yüklenir
+import asyncio, logging, time, os, base64, platform, subprocess, psutil, json, re, socket
 from typing import Optional, Dict, Any, List, Union
 from pathlib import Path
 
 from src.settings import settings, _get_chrome_driver_path
+from src.driver_executor import DriverCommandExecutor, PRIORITY_HEALTH
+from src.request_policy import NETWORK_ENABLE_PARAMS, apply_request_policy, page_load_stats
+from src.rate_limiter import DomainNotAllowed, get_rate_limiter
 
 # Logger initialization
 logger = logging.getLogger(__name__)
@@ -47,6 +50,112 @@ def _terminate_chrome_tasks():
         logger.info("Açık Chrome görevleri sonlandırıldı.")
     except Exception as e: logger.error(f"Chrome görevlerini sonlandırırken hata oluştu: {e}")
 
+def _free_port() -> int:
+    """Boş bir port isteği için socket kullanarak kullanılabilir port elde et (başarısızsa 0)."""
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+        s.close()
+        return port
+    except Exception: return 0
+
+
+def _build_chrome_options(config, profile_name: str) -> Options:
+    """Ortak Chrome seçenekleri. Her eşzamanlı Chrome örneği ayrı profil dizini kullanmalıdır."""
+    chrome_options = Options()
+
+    user_data_dir = os.path.join(settings.app_base_dir, "chrome_profiles", profile_name)
+    os.makedirs(user_data_dir, exist_ok=True)
+    logger.info(f"Chrome user data dir: {user_data_dir}")
+    chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+    chrome_options.add_argument("--profile-directory=Default")
+    chrome_options.add_argument("--start-maximized")
+    # Log seviyesini düşür
+    chrome_options.add_argument("--log-level=3")
+    # Sesli girişi devre dışı bırak
+    chrome_options.add_argument("--disable-voice-input")
+    # Temel güvenilir / performans flag'leri
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+
+    # chrome_options.add_argument("--disable-gpu")
+
+    # Remote debugging FLAG EKLEME (DevTools listening mesajı normal ve zararsız)
+
+    # Bot / otomasyon gizleme
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+
+    # UA
+    if config.user_agent: chrome_options.add_argument(f"--user-agent={config.user_agent}")
+
+    # Ek kullanıcı tanımlı seçenekler
+    for option in config.chrome_options: chrome_options.add_argument(option)
+
+    if config.proxy: chrome_options.add_argument(f"--proxy-server={config.proxy}")
+    return chrome_options
+
+
+def _spawn_chromedriver(chromedriver_path, port: int) -> subprocess.Popen:
+    """chromedriver'ı çıktısı susturulmuş olarak başlatır (Windows'ta pencere açmadan)."""
+    chromedriver_cmd = [str(chromedriver_path), f"--port={port}"] if port else [str(chromedriver_path)]
+    creationflags = 0
+    if platform.system().lower() == "windows":
+        creationflags = subprocess.CREATE_NO_WINDOW
+    return subprocess.Popen( chromedriver_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=creationflags, )
+
+
+def _wait_for_port(port: int, timeout: float = 5.0) -> bool:
+    """Senkron bekleme: chromedriver bağlantı kabul edene kadar (yalnızca worker thread'lerinden çağrılır)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), 0.5): return True
+        except OSError: time.sleep(0.1)
+    return False
+
+
+def _remote_connection(port: int):
+    """ChromiumRemoteConnection: execute_cdp_cmd (goog/cdp/execute) komutunu da tanır."""
+    from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+    return ChromiumRemoteConnection(f"http://127.0.0.1:{port}", vendor_prefix="goog", browser_name="chrome")
+
+
+def _connect_driver(port: int, chrome_options: Options) -> WebDriver:
+    """Çalışan chromedriver'a bağlanır ve yeni oturum (yeni Chrome) açar."""
+    return webdriver.Remote(command_executor=_remote_connection(port), options=chrome_options)
+
+
+def _attach_driver(port: int, session_id: str, caps: dict, chrome_options: Options) -> WebDriver:
+    """Çalışan chromedriver'daki mevcut oturuma yeni bir HTTP bağlantısıyla bağlanır (yeni oturum açmaz)."""
+    class _AttachedRemote(webdriver.Remote):
+        def start_session(self, capabilities: dict) -> None:
+            self.session_id, self.caps = session_id, caps
+    return _AttachedRemote(command_executor=_remote_connection(port), options=chrome_options)
+
+
+def _apply_stealth(driver: WebDriver) -> None:
+    """Bot detection bypass"""
+    try:
+        # WebDriver property'sini gizle
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        # Chrome Detection bypass
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', { "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36' })
+        # Permissions override
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+            "source": """
+                Object.defineProperty(navigator, 'permissions', {
+                    get: () => ({
+                        query: () => Promise.resolve({ state: 'granted' })
+                    })
+                });
+            """
+        })
+    except Exception as e: logger.warning(f"Stealth setup failed: {e}")
+
+
 class BrowserManager:
     """Singleton class to manage the Selenium browser instance."""
     _instance = None
@@ -66,6 +175,9 @@ class BrowserManager:
         self.config = settings.browser_config
         self.start_time = time.time()
         self.session_count = 0
+        self.startup_timings: Dict[str, float] = {}
+        # Bu driver'a ait tüm Selenium komutları tek thread'li, öncelikli kuyrukta çalışır
+        self.executor = DriverCommandExecutor("main")
         self._initialized = True
         
     async def initialize_browser(self) -> bool:
@@ -78,74 +190,38 @@ class BrowserManager:
             os.environ.setdefault("ABSL_CPP_MIN_LOG_LEVEL", "3")
             os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
             
-            chromedriver_path = _get_chrome_driver_path()
+            t0 = time.perf_counter()
             # _terminate_chrome_tasks()
 
-            chrome_options = Options()
-
-            user_data_dir = os.path.join(settings.app_base_dir, "chrome_profiles", "BOTum_ben")
-            os.makedirs(user_data_dir, exist_ok=True)
-            logger.info(f"Chrome user data dir: {user_data_dir}")
-            chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
-            chrome_options.add_argument("--profile-directory=Default")
-            chrome_options.add_argument("--start-maximized")
-            # Log seviyesini düşür
-            chrome_options.add_argument("--log-level=3")
-            # Sesli girişi devre dışı bırak
-            chrome_options.add_argument("--disable-voice-input")
-            # Temel güvenilir / performans flag'leri
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-
-            # chrome_options.add_argument("--disable-gpu")
-
-            # Remote debugging FLAG EKLEME (DevTools listening mesajı normal ve zararsız)
-
-            # Bot / otomasyon gizleme
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-
-            # UA
-            if self.config.user_agent: chrome_options.add_argument(f"--user-agent={self.config.user_agent}")
-
-            # Ek kullanıcı tanımlı seçenekler
-            for option in self.config.chrome_options: chrome_options.add_argument(option)
+            # Birbirinden bağımsız hazırlıklar paralel: driver yolu / sürüm kontrolü (gerekirse indirme) ve profil + seçenekler
+            chromedriver_path, chrome_options = await asyncio.gather(
+                asyncio.to_thread(_get_chrome_driver_path),
+                asyncio.to_thread(_build_chrome_options, self.config, "BOTum_ben"),
+            )
+            t_prepared = time.perf_counter()
 
-            if self.config.proxy: chrome_options.add_argument(f"--proxy-server={self.config.proxy}")
+            # Network capture modu: CDP Network olayları performance log'a düşsün
+            if settings.capture_mode == "network":
+                chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+                chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
 
             # --- Manuel chromedriver başlat: stdout/stderr'i DEVNULL yaparak Chrome'un absl/TF loglarını bastır ---
-            # Uygulama Windows olduğundan CREATE_NO_WINDOW kullan (gerekiyorsa)
-            try:
-                # boş bir port isteği için socket kullanarak kullanılabilir port elde et
-                import socket
-                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                s.bind(('127.0.0.1', 0))
-                port = s.getsockname()[1]
-                s.close()
-            except Exception: port = 0
-
-            chromedriver_cmd = [str(chromedriver_path), f"--port={port}"] if port else [str(chromedriver_path)]
-            creationflags = 0
-            if platform.system().lower() == "windows":
-                creationflags = subprocess.CREATE_NO_WINDOW
-
-            # Başlat ve çıktıyı sustur
-            self._chromedriver_proc = subprocess.Popen( chromedriver_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=creationflags, )
-
-            # Wait for chromedriver to accept connections (kısa bekleme döngüsü)
-            import time, socket
+            port = _free_port()
+            self._chromedriver_proc = _spawn_chromedriver(chromedriver_path, port)
+
+            # Wait for chromedriver to accept connections (kısa bekleme döngüsü; event loop bloklanmaz)
             start = time.time()
             timeout = 5.0
             connected = False
             port_to_try = port if port else 9515
             while time.time() - start < timeout:
                 try:
-                    with socket.create_connection(("127.0.0.1", port_to_try), timeout=0.5):
-                        connected = True
-                        break
+                    _, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port_to_try), 0.5)
+                    writer.close()
+                    connected = True
+                    break
                 except Exception:
-                    time.sleep(0.1)
+                    await asyncio.sleep(0.1)
                     continue
 
             if not connected:
@@ -157,31 +233,28 @@ class BrowserManager:
                 except Exception:  pass
                 raise RuntimeError("Chromedriver process başlatılamadı veya bağlantı kurulamadı.")
 
-            # ChromeOptions ile remote driver'a bağlan
-            from selenium.webdriver.remote.webdriver import WebDriver
-            from selenium.webdriver.remote.remote_connection import RemoteConnection
-
-            executor_url = f"http://127.0.0.1:{port_to_try}"
-            loop = asyncio.get_event_loop()
-            # webdriver.Remote kullanarak chromedriver'a bağlan
-            self.driver = await loop.run_in_executor(
-                None,
-                lambda: webdriver.Remote(command_executor=executor_url, options=chrome_options)
-            )
+            t_driver = time.perf_counter()
+            # webdriver.Remote ile chromedriver'a bağlan (driver'ın kendi thread'inde)
+            self.driver = await self.executor.run(_connect_driver, port_to_try, chrome_options)
+            # kurtarma sırasında aynı chromedriver'a yeniden bağlanabilmek için
+            self._port, self._chrome_options = port_to_try, chrome_options
 
             if not self.driver:
                 logger.error("Failed to initialize the browser driver.")
                 return False
             
             
-            await loop.run_in_executor(None, self._setup_stealth)
-
-            self.driver.set_page_load_timeout(settings.browser_timeout)
-            self.driver.implicitly_wait(10)
+            await self.executor.run(self._after_connect)
 
             self.is_initialized = True
             self.session_count += 1
-            logger.info("Browser initialized successfully")
+            t_done = time.perf_counter()
+            # Soğuk başlangıç gerilemelerini izlemek için aşama süreleri (saniye)
+            self.startup_timings = {
+                "prepare": round(t_prepared - t0, 3), "chromedriver": round(t_driver - t_prepared, 3),
+                "session": round(t_done - t_driver, 3), "total": round(t_done - t0, 3),
+            }
+            logger.info(f"Browser initialized successfully ({self.startup_timings})")
             return True
         except Exception as e:
             logger.error(f"Browser initialization failed: {e}")
@@ -209,15 +282,13 @@ class BrowserManager:
                     try:
                         async with session.get(f"{api_url}/health", timeout=aiohttp.ClientTimeout(total=5)) as response:
                             if response.status == 200:
-                                loop = asyncio.get_event_loop()
-                                await loop.run_in_executor(None, self.driver.get, api_url)
+                                await self.executor.run(self.driver.get, api_url)
                                 logger.info(f"Browser loaded API homepage: {api_url}")
                                 return
                     except: pass
             except Exception as e: logger.debug(f"API load attempt {attempt + 1} failed: {e}")
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self.driver.get, "about:blank")
+            await self.executor.run(self.driver.get, "about:blank")
             logger.info("Opened about:blank as fallback")
         except Exception as e: logger.warning(f"Could not load any page: {e}")
     
@@ -226,22 +297,7 @@ class BrowserManager:
         if not self.driver:
             logger.error("Browser is not initialized.")
             return
-        try:
-            # WebDriver property'sini gizle
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            # Chrome Detection bypass
-            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', { "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36' })
-            # Permissions override
-            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                "source": """
-                    Object.defineProperty(navigator, 'permissions', {
-                        get: () => ({
-                            query: () => Promise.resolve({ state: 'granted' })
-                        })
-                    });
-                """
-            })
-        except Exception as e: logger.warning(f"Stealth setup failed: {e}")
+        _apply_stealth(self.driver)
     
     
     
@@ -249,6 +305,57 @@ class BrowserManager:
     
     
     
+    def enable_network_capture(self) -> bool:
+        """CDP Network domain'ini aç; yanıt gövdeleri Network.getResponseBody ile okunabilir olur."""
+        if not self.driver:
+            logger.error("Browser is not initialized.")
+            return False
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", NETWORK_ENABLE_PARAMS)
+            self._pending_responses: Dict[str, Dict[str, Any]] = {}
+            logger.info("Network capture enabled")
+            return True
+        except Exception as e:
+            logger.error(f"Network capture could not be enabled: {e}")
+            return False
+
+    def drain_network_responses(self, url_patterns: List[str]) -> List[Dict[str, Any]]:
+        """
+        performance log'daki Network olaylarını tüketir; URL'si desenlerden birine uyan ve
+        yüklemesi tamamlanan yanıtların gövdelerini döner: [{"url", "status", "mime", "body"}]
+        """
+        if not self.driver: return []
+        pending = getattr(self, "_pending_responses", None)
+        if pending is None: pending = self._pending_responses = {}
+        regexes = [re.compile(p) for p in url_patterns]
+        try: entries = self.driver.execute("getLog", {"type": "performance"})["value"] or []
+        except Exception as e:
+            logger.warning(f"Performance log okunamadı: {e}")
+            return []
+        responses = []
+        for entry in entries:
+            try: msg = json.loads(entry["message"])["message"]
+            except Exception: continue
+            method, params = msg.get("method"), msg.get("params", {})
+            if method == "Network.responseReceived":
+                resp = params.get("response", {})
+                url = resp.get("url", "")
+                # sayfa gezintileri (Document) hiç alınmaz: yalnızca XHR / fetch gövdeleri istenir
+                if params.get("type") != "Document" and any(r.search(url) for r in regexes):
+                    pending[params["requestId"]] = {"url": url, "status": resp.get("status"), "mime": resp.get("mimeType", "")}
+            elif method == "Network.loadingFailed": pending.pop(params.get("requestId"), None)
+            elif method == "Network.loadingFinished":
+                info = pending.pop(params.get("requestId"), None)
+                if not info: continue
+                try:
+                    body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                    text = body.get("body", "")
+                    if body.get("base64Encoded"): text = base64.b64decode(text).decode("utf-8", "replace")
+                    responses.append({**info, "body": text})
+                except Exception as e: logger.debug(f"Response body alınamadı ({info['url']}): {e}")
+        return responses
+
+
     async def navigate_to_url(self, url: str, timeout: Optional[int] = None) -> bool:
         """URL'ye git"""
         if not self.is_initialized or not self.driver:
@@ -257,15 +364,20 @@ class BrowserManager:
         try:
             if not self.is_initialized: await self.initialize_browser()
             timeout = timeout or settings.browser_timeout or 60
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self.driver.get, url)
+            await get_rate_limiter().aacquire(url)
+            await self.executor.run(apply_request_policy, self.driver, url)
+            await self.executor.run(self.driver.get, url)
             # Sayfa yüklenene kadar bekle
-            await loop.run_in_executor(None, lambda: WebDriverWait(self.driver, timeout).until(lambda d: d.execute_script("return document.readyState") == "complete")) # type: ignore
-            logger.info(f"Successfully navigated to: {url}")
+            await self.executor.run(lambda: WebDriverWait(self.driver, timeout).until(lambda d: d.execute_script("return document.readyState") == "complete")) # type: ignore
+            stats = await self.executor.run(page_load_stats, self.driver)
+            logger.info(f"Successfully navigated to: {url} ({stats['requests']} istek, {stats['bytes'] / 1024:.0f} KB)")
             return True
         except TimeoutException:
             logger.error(f"Navigation timeout for URL: {url}")
             return False
+        except DomainNotAllowed as e:
+            logger.error(f"Navigation blocked: {e}")
+            return False
         except Exception as e:
             logger.error(f"Navigation failed for URL {url}: {e}")
             return False
@@ -284,7 +396,6 @@ class BrowserManager:
             logger.error("Browser is not initialized.")
             return False
         try:
-            loop = asyncio.get_event_loop()
             wait = WebDriverWait(self.driver, timeout)
             
             by_mapping = {
@@ -298,8 +409,7 @@ class BrowserManager:
             
             by_method = by_mapping.get(by, By.CSS_SELECTOR)
             
-            await loop.run_in_executor(
-                None,
+            await self.executor.run(
                 wait.until,
                 EC.presence_of_element_located((by_method, selector))
             )
@@ -322,8 +432,7 @@ class BrowserManager:
         try:
             if not element:
                 return False
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, element.click)
+            await self.executor.run(element.click)
             return True
         except Exception as e:
             logger.error(f"Click failed: {e}")
@@ -335,11 +444,10 @@ class BrowserManager:
             logger.error("Browser is not initialized.")
             return False
         try:
-            loop = asyncio.get_event_loop()
             for _ in range(count):
                 if direction == "down":
-                    await loop.run_in_executor(None, self.driver.execute_script, "window.scrollTo(0, document.body.scrollHeight);")
-                elif direction == "up": await loop.run_in_executor(None, self.driver.execute_script, "window.scrollTo(0, 0);")
+                    await self.executor.run(self.driver.execute_script, "window.scrollTo(0, document.body.scrollHeight);")
+                elif direction == "up": await self.executor.run(self.driver.execute_script, "window.scrollTo(0, 0);")
                 await asyncio.sleep(1)
             return True
         except Exception as e:
@@ -360,12 +468,11 @@ class BrowserManager:
             logger.error("Browser is not initialized.")
             return False
         try:
-            loop = asyncio.get_event_loop()
             Path(file_path).parent.mkdir(parents=True, exist_ok=True)
             if full_page:
-                await loop.run_in_executor( None, self.driver.save_screenshot, file_path )
+                await self.executor.run(self.driver.save_screenshot, file_path)
             else:
-                screenshot_data = await loop.run_in_executor( None, self.driver.get_screenshot_as_png )
+                screenshot_data = await self.executor.run(self.driver.get_screenshot_as_png)
                 with open(file_path, 'wb') as f: f.write(screenshot_data)
             logger.info(f"Screenshot saved: {file_path}")
             return True
@@ -384,11 +491,10 @@ class BrowserManager:
             logger.error("Browser is not initialized.")
             return {"error": "Browser is not initialized."}
         try:
-            loop = asyncio.get_event_loop()
             return {
-                "current_url": await loop.run_in_executor(None, lambda: self.driver.current_url),           # type: ignore
-                "title": await loop.run_in_executor(None, lambda: self.driver.title),                       # type: ignore
-                "window_size": await loop.run_in_executor(None, lambda: self.driver.get_window_size()),     # type: ignore
+                "current_url": await self.executor.run(lambda: self.driver.current_url, priority=PRIORITY_HEALTH),           # type: ignore
+                "title": await self.executor.run(lambda: self.driver.title, priority=PRIORITY_HEALTH),                       # type: ignore
+                "window_size": await self.executor.run(lambda: self.driver.get_window_size(), priority=PRIORITY_HEALTH),     # type: ignore
                 "session_id": self.driver.session_id,
                 "capabilities": self.driver.capabilities,
                 "uptime": time.time() - self.start_time,
@@ -411,10 +517,85 @@ class BrowserManager:
             logger.error(f"Browser restart failed: {e}")
             return False
     
+    def _after_connect(self) -> None:
+        """Yeni oturum sonrası ayarlar."""
+        self._setup_stealth()
+        self.driver.set_page_load_timeout(settings.browser_timeout)  # type: ignore
+        self.driver.implicitly_wait(10)  # type: ignore
+
+    def _chromedriver_alive(self) -> bool:
+        proc = getattr(self, "_chromedriver_proc", None)
+        return bool(proc and proc.poll() is None and getattr(self, "_port", None))
+
+    def _probe_session(self) -> bool:
+        """Oturum yanıt veriyor mu? Odaklanılan sekme kapandıysa kalan bir sekmeye geçer."""
+        from selenium.common.exceptions import NoSuchWindowException
+        handles = self.driver.window_handles  # type: ignore
+        if not handles: return False
+        try: self.driver.current_url  # type: ignore
+        except NoSuchWindowException: self.driver.switch_to.window(handles[0])  # type: ignore
+        return self.driver.execute_script("return document.readyState") is not None  # type: ignore
+
+    def _reattach(self) -> bool:
+        """Aynı chromedriver'daki aynı oturuma taze bağlantıyla bağlanır (ör. bozulan keep-alive bağlantısı)."""
+        old = self.driver
+        if not old or not old.session_id: return False
+        self.driver = _attach_driver(self._port, old.session_id, old.caps, self._chrome_options)
+        if self._probe_session(): return True
+        self.driver = old
+        return False
+
+    def _new_session(self) -> None:
+        """Chrome öldüyse: çalışan chromedriver'da yeni oturum açar (driver başlatma ve sürüm kontrolleri atlanır)."""
+        if self.driver:
+            # eski oturum profili kilitliyor olabilir
+            try: self.driver.quit()
+            except Exception: pass
+        self.driver = _connect_driver(self._port, self._chrome_options)
+        self._after_connect()
+        self._pending_responses = {}
+
+    async def recover(self, timeout: float = 15.0) -> Optional[str]:
+        """
+        Kademeli kurtarma; en ucuz yöntemden başlar:
+            "alive"       oturum zaten yaşıyor (geçici hata / kapanan sekme)
+            "reattach"    aynı oturuma yeni bağlantı
+            "new_session" aynı chromedriver'da yeni Chrome oturumu
+            "relaunch"    chromedriver + Chrome baştan başlatıldı
+        Başarısızsa None. Sekmeler "alive"/"reattach" durumunda korunur.
+        """
+        if self.driver:
+            try:
+                if await self.executor.run(self._probe_session, priority=PRIORITY_HEALTH, timeout=timeout): return "alive"
+            except Exception as e: logger.info(f"Oturum yanıt vermiyor: {e}")
+        if self.driver and self._chromedriver_alive():
+            try:
+                if await self.executor.run(self._reattach, priority=PRIORITY_HEALTH, timeout=timeout): return "reattach"
+            except Exception as e: logger.info(f"Oturuma yeniden bağlanılamadı: {e}")
+        if self._chromedriver_alive():
+            try:
+                await self.executor.run(self._new_session, priority=PRIORITY_HEALTH, timeout=settings.browser_timeout)
+                self.is_initialized = True
+                self.session_count += 1
+                return "new_session"
+            except Exception as e: logger.warning(f"Mevcut chromedriver'da yeni oturum açılamadı: {e}")
+        await self.close_browser()
+        return "relaunch" if await self.initialize_browser() else None
+
+    async def health_check(self, timeout: float = 5.0) -> bool:
+        """Sürücü yanıt veriyor mu? Toplu işlerin önüne geçen öncelikle çalışır."""
+        if not self.driver: return False
+        try:
+            await self.executor.run(lambda: self.driver.title, priority=PRIORITY_HEALTH, timeout=timeout)  # type: ignore
+            return True
+        except Exception as e:
+            logger.warning(f"Health check failed: {e}")
+            return False
+
     async def close_browser(self):
         if self.driver:
             try:
-                self.driver.quit()
+                await self.executor.run(self.driver.quit, priority=PRIORITY_HEALTH, timeout=30)
                 logger.info("Browser closed successfully.")
             except Exception as e:
                 logger.error(f"Error closing browser: {e}")
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - BROWSER POOL
+===========================================================
+
+Description:
+    scrap_page gibi tek seferlik sayfa çekimleri için ayrı Chrome
+    sürücülerinden oluşan havuz. Sipariş paneli (BrowserManager.driver)
+    bu havuzun dışında kalır; uzun bir fetch_raw_html gezintisi artık
+    dashboard sekmesini ele geçiremez.
+
+        - Havuz boyutu          : settings.max_concurrent_requests
+        - Checkout / iade       : sync (with pool.checkout()) veya
+                                  async (async with pool.acheckout())
+        - Boşta sağlık kontrolü : pool_health_interval saniyede bir
+        - Geri dönüşüm          : pool_recycle_navigations gezinti veya
+                                  pool_recycle_minutes dakika sonra
+                                  sürücü kapatılıp yenisi açılır
+                                  (Chrome bellek şişmesini atar)
+
+    Sürücüler ihtiyaç oldukça açılır; her birinin kendi profil dizini
+    (chrome_profiles/pool_<n>) ve kendi komut yürütücüsü vardır.
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import asyncio, contextlib, logging, threading, time
+from typing import Any, Callable, Iterator, AsyncIterator, List, Optional
+
+from src.settings import settings
+from src.driver_executor import DriverCommandExecutor, PRIORITY_HEALTH, PRIORITY_NORMAL
+from src.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+
+class PoolTimeout(TimeoutError):
+    """Süresi içinde boş sürücü bulunamadı."""
+
+
+
+class PooledDriver:
+    """Havuzdaki tek bir Chrome sürücüsü ve ona ait chromedriver süreci / yürütücüsü."""
+
+    def __init__(self, slot: int) -> None:
+        self.slot = slot
+        self.executor = DriverCommandExecutor(f"pool-{slot}")
+        self.driver = None
+        self._proc = None
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.navigations = 0
+        self.broken = False
+
+    # ---------- yaşam döngüsü (yürütücü thread'inde) ----------
+    def _start(self) -> None:
+        from src.settings import _get_chrome_driver_path
+        from src.browser_manager import _build_chrome_options, _free_port, _spawn_chromedriver, _wait_for_port, _connect_driver, _apply_stealth
+        port = _free_port() or 9515 + self.slot + 1
+        self._proc = _spawn_chromedriver(_get_chrome_driver_path(), port)
+        if not _wait_for_port(port): raise RuntimeError(f"Havuz chromedriver'ı başlatılamadı (slot {self.slot}).")
+        self.driver = _connect_driver(port, _build_chrome_options(settings.browser_config, f"pool_{self.slot}"))
+        _apply_stealth(self.driver)
+        self.driver.set_page_load_timeout(settings.browser_timeout)
+
+    def start(self) -> None:
+        try: self.executor.call(self._start, priority=PRIORITY_HEALTH)
+        except Exception:
+            self.close()
+            raise
+        self.created_at = self.last_used = time.monotonic()
+        logger.info(f"Havuz sürücüsü açıldı (slot {self.slot})")
+
+    def close(self) -> None:
+        if self.driver is not None:
+            try: self.executor.call(self.driver.quit, priority=PRIORITY_HEALTH, timeout=30)
+            except Exception as e: logger.debug(f"Havuz sürücüsü kapatma hatası (slot {self.slot}): {e}")
+            self.driver = None
+        if self._proc is not None and self._proc.poll() is None:
+            try: self._proc.kill()
+            except Exception: pass
+        self._proc = None
+        self.executor.shutdown(wait=False)
+
+    # ---------- kullanım ----------
+    def call(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """fn(driver, *args) komutunu bu sürücünün yürütücüsünde çalıştırır."""
+        return self.executor.call(fn, self.driver, *args, priority=PRIORITY_NORMAL, timeout=timeout, **kwargs)
+
+    def ping(self, timeout: float = 5.0) -> bool:
+        try:
+            self.executor.call(lambda: self.driver.title, priority=PRIORITY_HEALTH, timeout=timeout)  # type: ignore
+            return True
+        except Exception: return False
+
+    @property
+    def age_minutes(self) -> float: return (time.monotonic() - self.created_at) / 60.0
+
+
+
+class BrowserPool:
+    """Sync ve async checkout destekli, kendini iyileştiren sürücü havuzu (thread-safe)."""
+
+    def __init__(self, size: Optional[int] = None, recycle_navigations: Optional[int] = None, recycle_minutes: Optional[float] = None, health_interval: Optional[float] = None) -> None:
+        self.size = max(1, size if size is not None else settings.max_concurrent_requests)
+        self.recycle_navigations = recycle_navigations if recycle_navigations is not None else settings.pool_recycle_navigations
+        self.recycle_minutes = recycle_minutes if recycle_minutes is not None else settings.pool_recycle_minutes
+        self.health_interval = health_interval if health_interval is not None else settings.pool_health_interval
+        self._idle: List[PooledDriver] = []
+        self._free_slots = list(range(self.size))
+        self._cond = threading.Condition()
+        self._closed = False
+        self._health_thread: Optional[threading.Thread] = None
+        self.created = 0
+        self.recycled = 0
+        self.health_failures = 0
+
+    @property
+    def active(self) -> int:
+        """Açık (boşta veya kullanımda) sürücü sayısı."""
+        with self._cond: return self.size - len(self._free_slots)
+
+    def _expired(self, pd: PooledDriver) -> bool:
+        if pd.broken or pd.driver is None: return True
+        if self.recycle_navigations and pd.navigations >= self.recycle_navigations: return True
+        return bool(self.recycle_minutes) and pd.age_minutes >= self.recycle_minutes
+
+    def _retire(self, pd: PooledDriver) -> None:
+        """Sürücüyü kapatır ve slotunu serbest bırakır (kilit dışında çağrılmalı)."""
+        pd.close()
+        with self._cond:
+            self._free_slots.append(pd.slot)
+            self._cond.notify()
+
+    # ---------- checkout / iade ----------
+    def acquire(self, timeout: Optional[float] = None) -> PooledDriver:
+        """Boş sürücü döner; yoksa ve slot varsa yenisini açar, hiçbiri yoksa bekler."""
+        self._ensure_health_thread()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed: raise RuntimeError("Browser pool kapatıldı.")
+                    if self._idle:
+                        pd, slot = self._idle.pop(), None
+                        break
+                    if self._free_slots:
+                        pd, slot = None, self._free_slots.pop(0)
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0: raise PoolTimeout(f"{timeout}s içinde boş sürücü yok (havuz: {self.size}).")
+                    self._cond.wait(remaining)
+            if pd is not None:
+                if not self._expired(pd): return pd
+                self.recycled += 1
+                self._retire(pd)
+                continue
+            pd = PooledDriver(slot)  # type: ignore[arg-type]
+            try: pd.start()
+            except Exception:
+                with self._cond:
+                    self._free_slots.append(slot)  # type: ignore[arg-type]
+                    self._cond.notify()
+                raise
+            self.created += 1
+            return pd
+
+    def release(self, pd: PooledDriver, broken: bool = False) -> None:
+        """Sürücüyü havuza iade eder; bozuk veya geri dönüşüm sınırını aşmışsa kapatır."""
+        pd.last_used = time.monotonic()
+        pd.broken = pd.broken or broken
+        if self._closed or self._expired(pd):
+            if not pd.broken and not self._closed: self.recycled += 1
+            self._retire(pd)
+            return
+        with self._cond:
+            self._idle.append(pd)
+            self._cond.notify()
+
+    @contextlib.contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[PooledDriver]:
+        """with pool.checkout() as pd: pd.call(fn, ...) — hata WebDriver kaynaklıysa sürücü bozuk sayılır."""
+        from selenium.common.exceptions import WebDriverException
+        pd = self.acquire(timeout)
+        broken = False
+        try: yield pd
+        except WebDriverException:
+            broken = True
+            raise
+        finally: self.release(pd, broken)
+
+    @contextlib.asynccontextmanager
+    async def acheckout(self, timeout: Optional[float] = None) -> AsyncIterator[PooledDriver]:
+        """async with pool.acheckout() as pd: await asyncio.to_thread(pd.call, fn, ...)"""
+        from selenium.common.exceptions import WebDriverException
+        pd = await asyncio.to_thread(self.acquire, timeout)
+        broken = False
+        try: yield pd
+        except WebDriverException:
+            broken = True
+            raise
+        finally: await asyncio.to_thread(self.release, pd, broken)
+
+    def navigate(self, url: str, timeout: Optional[int] = None, checkout_timeout: Optional[float] = None) -> str:
+        """Havuzdan bir sürücüyle URL'yi açıp page_source döner."""
+        timeout = timeout or settings.browser_timeout
+        get_rate_limiter().acquire(url)  # sürücü tutulmadan önce beklenir
+        with self.checkout(checkout_timeout) as pd:
+            pd.navigations += 1
+            return pd.call(_get_page_source, url, timeout, timeout=timeout + 30)
+
+    # ---------- sağlık kontrolü ----------
+    def _ensure_health_thread(self) -> None:
+        if not self.health_interval or (self._health_thread and self._health_thread.is_alive()): return
+        self._health_thread = threading.Thread(target=self._health_loop, name="browser-pool-health", daemon=True)
+        self._health_thread.start()
+
+    def _health_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed, self.health_interval)
+                if self._closed: return
+                # yalnızca uzun süredir boşta olanlar kontrol edilir; kontrol sırasında havuz dışında tutulur
+                now = time.monotonic()
+                to_check = [pd for pd in self._idle if now - pd.last_used >= self.health_interval]
+                for pd in to_check: self._idle.remove(pd)
+            for pd in to_check:
+                if self._expired(pd):
+                    self.recycled += 1
+                    self._retire(pd)
+                elif not pd.ping():
+                    self.health_failures += 1
+                    logger.warning(f"Havuz sürücüsü yanıt vermiyor, kapatılıyor (slot {pd.slot})")
+                    self._retire(pd)
+                else:
+                    with self._cond:
+                        self._idle.append(pd)
+                        self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"size": self.size, "idle": len(self._idle), "active": self.size - len(self._free_slots),
+                    "created": self.created, "recycled": self.recycled, "health_failures": self.health_failures}
+
+    def close(self) -> None:
+        """Boştaki sürücüleri kapatır; kullanımdakiler iade edildiklerinde kapanır."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for pd in idle: self._retire(pd)
+
+
+
+def _get_page_source(driver, url: str, timeout: int) -> str:
+    from src.request_policy import apply_request_policy
+    apply_request_policy(driver, url)
+    driver.set_page_load_timeout(timeout)
+    driver.get(url)
+    return driver.page_source or ""
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool() -> BrowserPool:
+    """BrowserPool nesnesini döner, yoksa oluşturur."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed: _pool = BrowserPool()
+        return _pool
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - DRIVER COMMAND EXECUTOR
+===========================================================
+
+Description:
+    Her WebDriver'a bağlı, tek thread'li komut yürütücüsü.
+    Selenium sürücüsü thread-safe değildir; tüm komutlar bu
+    thread'de sırayla çalışır, event loop hiçbir zaman WebDriver
+    I/O'su ile bloklanmaz.
+
+    - Öncelik : düşük sayı önce çalışır (sağlık kontrolleri toplu
+                işlerin önüne geçer)
+    - Deadline: başlamadan önce süresi dolan komut çalıştırılmaz
+    - İptal   : kuyrukta bekleyen komut Future.cancel() ile düşer;
+                çalışmakta olan Selenium çağrısı kesilemez, sadece
+                sonucu beklenmez
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import asyncio, itertools, logging, queue, threading, time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HEALTH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_BULK = 20
+
+
+class CommandDeadlineExceeded(TimeoutError):
+    """Komut, başlayamadan deadline'ı geçti."""
+
+
+
+class DriverCommandExecutor:
+    """Öncelikli kuyruklu, deadline ve iptal destekli tek thread'li yürütücü."""
+
+    def __init__(self, name: str = "driver") -> None:
+        self.name = name
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.executed = 0
+        self.expired = 0
+        self.cancelled = 0
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._closed: raise RuntimeError(f"Executor kapatıldı: {self.name}")
+            if self._thread and self._thread.is_alive(): return
+            self._thread = threading.Thread(target=self._run, name=f"driver-exec-{self.name}", daemon=True)
+            self._thread.start()
+
+    @property
+    def in_worker_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    @property
+    def pending(self) -> int: return self._queue.qsize()
+
+    # ---------- gönderim ----------
+    def submit(self, fn: Callable[..., Any], *args: Any, priority: int = PRIORITY_NORMAL, deadline: Optional[float] = None, **kwargs: Any) -> Future:
+        """Komutu kuyruğa ekler. deadline: saniye cinsinden, başlaması için tanınan süre."""
+        self._ensure_thread()
+        fut: Future = Future()
+        deadline_at = time.monotonic() + deadline if deadline is not None else None
+        self._queue.put((priority, next(self._seq), fut, fn, args, kwargs, deadline_at))
+        return fut
+
+    def call(self, fn: Callable[..., Any], *args: Any, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Senkron çağıranlar için: komutu çalıştırıp sonucunu döner (worker thread'inden çağrılırsa doğrudan çalıştırır)."""
+        if self.in_worker_thread: return fn(*args, **kwargs)
+        fut = self.submit(fn, *args, priority=priority, deadline=timeout, **kwargs)
+        try: return fut.result(timeout)
+        except TimeoutError:
+            fut.cancel()
+            raise
+
+    async def run(self, fn: Callable[..., Any], *args: Any, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Async çağıranlar için: timeout dolarsa (veya task iptal edilirse) kuyruktaki komut da iptal edilir."""
+        fut = self.submit(fn, *args, priority=priority, deadline=timeout, **kwargs)
+        afut = asyncio.wrap_future(fut)
+        try: return await asyncio.wait_for(asyncio.shield(afut), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            fut.cancel()
+            raise
+
+    # ---------- çalışma ----------
+    def _run(self) -> None:
+        while True:
+            priority, _, fut, fn, args, kwargs, deadline_at = self._queue.get()
+            if fut is None: break
+            if not fut.set_running_or_notify_cancel():
+                self.cancelled += 1
+                continue
+            if deadline_at is not None and time.monotonic() > deadline_at:
+                self.expired += 1
+                fut.set_exception(CommandDeadlineExceeded(f"{getattr(fn, '__name__', fn)} başlamadan deadline aşıldı"))
+                continue
+            try: fut.set_result(fn(*args, **kwargs))
+            except BaseException as e: fut.set_exception(e)
+            finally: self.executed += 1
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = 10.0) -> None:
+        """Kuyruktakileri iptal etmeden sırası gelince durur (en düşük öncelikle sona eklenir)."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if not thread or not thread.is_alive(): return
+        self._queue.put((float("inf"), next(self._seq), None, None, (), {}, None))
+        if wait and not self.in_worker_thread: thread.join(timeout)
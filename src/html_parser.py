@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - HTML PARSER BACKENDS
+===========================================================
+
+Description:
+    BeautifulSoup "html.parser" yerine daha hızlı ayrıştırıcıları
+    kullanabilen ince bir katman. Desteklenen backend'ler:
+        - selectolax : lexbor tabanlı C ayrıştırıcı (en hızlı)
+        - lxml       : BeautifulSoup + lxml tree builder
+        - html.parser: saf Python, her zaman mevcut (eski davranış)
+
+    parse_html() her backend için BeautifulSoup'un kullandığımız alt
+    kümesini (select, select_one, find_all, get_text) sunan bir kök
+    nesne döner; çağıran kod backend'den bağımsız kalır.
+
+    Yalnızca görünür metin gerekiyorsa iter_text_lines() ağaç kurmadan
+    (stdlib HTMLParser ile) parça parça tokenize eder ve temizlenmiş
+    satırları üretir; tokenizer'ın belleği sayfa boyutundan bağımsızdır
+    (parçaları üreten kaynak sayfayı tümüyle tutmuyorsa: bkz.
+    scrap_page._iter_html). Çıktı BeautifulSoup "html.parser" get_text
+    ile aynıdır; tek istisna rakamsız "&#" sonrası: stdlib tüm belge bir
+    kerede verildiğinde geri kalanı metin sayar, akışta ayrıştırma sürer.
+
+    Karşılaştırma için:
+        python -m src.html_parser [snapshot_dizini]
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import logging, re
+from html.entities import html5 as _HTML5_ENTITIES
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, List, Optional
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# get_text() sırasında BeautifulSoup'un da atladığı metin kapları
+_NON_TEXT_TAGS = frozenset(("script", "style", "template"))
+# Akış halinde metin çıkarırken içeriği tamamen atlanan etiketler (scrap_all_pages'in eski remove_tags listesi)
+SKIPPED_TEXT_TAGS = frozenset(("script", "style", "noscript", "template"))
+# Parçanın sonunda yarım kalmış karakter referansı ("&cop", "&#x4"): sonraki parçaya devredilir
+_PARTIAL_REF = re.compile(r"&(#[xX]?[0-9a-fA-F]*|[a-zA-Z][-.a-zA-Z0-9]*)?$")
+
+
+
+def _has_module(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except Exception: return False
+
+def available_backends() -> List[str]:
+    """Bu ortamda kullanılabilir backend'leri hız sırasına göre döner."""
+    found = []
+    if _has_module("selectolax.lexbor"): found.append("selectolax")
+    if _has_module("lxml"): found.append("lxml")
+    found.append("html.parser")
+    return found
+
+_resolved: dict = {}
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """İstenen (veya settings.html_parser) backend'i kullanılabilir olana çözer."""
+    wanted = (name or settings.html_parser or "auto").strip().lower()
+    if wanted in _resolved: return _resolved[wanted]
+    available = available_backends()
+    if wanted == "auto": backend = available[0]
+    elif wanted in available: backend = wanted
+    else:
+        backend = available[0]
+        logger.warning(f"HTML parser backend '{wanted}' kullanılamıyor, '{backend}' kullanılacak.")
+    _resolved[wanted] = backend
+    return backend
+
+
+
+class LexborNode:
+    """
+    selectolax düğümünü BeautifulSoup Tag arayüzüne benzeten sarmalayıcı.
+    selectolax css() çağrıldığı düğümü de eşleştirir, BeautifulSoup yalnızca torunları: düğümün kendisi elenir.
+    Kimlik mem_id ile karşılaştırılır; Node.__eq__ iki düğümü de HTML'e serileştirir (büyük sayfada ~100x yavaş).
+    """
+    __slots__ = ("_node",)
+
+    def __init__(self, node) -> None: self._node = node
+
+    @property
+    def name(self) -> str: return "[document]" if self._node.tag == "-document" else self._node.tag
+
+    def select(self, selector: str) -> List["LexborNode"]:
+        own = self._node.mem_id
+        return [LexborNode(n) for n in self._node.css(selector) if n.mem_id != own]
+
+    def select_one(self, selector: str) -> Optional["LexborNode"]:
+        n = self._node.css_first(selector)
+        own = self._node.mem_id
+        if n is not None and n.mem_id == own: n = next((m for m in self._node.css(selector) if m.mem_id != own), None)
+        return LexborNode(n) if n is not None else None
+
+    def find_all(self, names) -> List["LexborNode"]:
+        if isinstance(names, str): names = [names]
+        return self.select(", ".join(names))
+
+    def __call__(self, names) -> List["LexborNode"]: return self.find_all(names)
+
+    def _strings(self, node) -> Iterator[str]:
+        # BeautifulSoup ile aynı: yorumlar ve script/style/template içerikleri metin sayılmaz
+        for child in node.iter(include_text=True):
+            tag = child.tag
+            if tag == "-text": yield child.text_content or ""
+            elif tag in _NON_TEXT_TAGS or tag.startswith("-"): continue
+            else: yield from self._strings(child)
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        strings = self._strings(self._node)
+        if strip: return separator.join(s for s in (x.strip() for x in strings) if s)
+        return separator.join(strings)
+
+    def decompose(self) -> None: self._node.decompose()
+
+    def __str__(self) -> str: return self._node.html or ""
+
+
+
+def parse_html(html: str, backend: Optional[str] = None):
+    """HTML'i seçilen backend ile ayrıştırır ve BeautifulSoup benzeri kök döner."""
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        # kök = belge düğümü (BeautifulSoup nesnesi gibi): <!DOCTYPE> str() çıktısında korunur
+        tree = LexborHTMLParser(html or "")
+        return LexborNode(tree.root.parent if tree.root is not None and tree.root.parent is not None else tree.root)
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html or "", backend)
+
+def remove_tags(root, names: Iterable[str]) -> None:
+    """Verilen etiketleri (içerikleriyle) ağaçtan siler."""
+    for tag in root.find_all(list(names)): tag.decompose()
+
+def strip_tags(html: str, names: Iterable[str], backend: Optional[str] = None) -> str:
+    """Etiketleri kaldırılmış HTML'i string olarak döner."""
+    root = parse_html(html, backend)
+    remove_tags(root, names)
+    return str(root)
+
+
+
+class TextLineExtractor(HTMLParser):
+    """
+    Beslendikçe görünür metni temizlenmiş satırlar olarak biriktirir (bkz. iter_text_lines).
+    Her metin düğümü (CDATA dahil) ayrı satır sayılır: get_text(separator="\n") ile aynı bölünme.
+    Karakter referansları BeautifulSoup "html.parser" gibi çözülür (convert_charrefs=False +
+    handle_charref / handle_entityref): bozuk / bilinmeyen referanslar da aynı metni verir.
+    """
+
+    def __init__(self, skip_tags: Iterable[str] = SKIPPED_TEXT_TAGS) -> None:
+        super().__init__(convert_charrefs=False)
+        self.skip_tags = frozenset(skip_tags)
+        self._skip_depth = 0
+        self._text: List[str] = []  # parça sınırında bölünen metin düğümü bir sonraki etikete kadar birleştirilir
+        self.lines: List[str] = []
+        self._tail = ""
+
+    def feed(self, data: str) -> None:
+        # HTMLParser "&copy-" sonunu "&copy" + "-" diye çözer, tümü gelince "&copy---" bilinmeyen referans olur:
+        # parça sınırı sonucu değiştirmesin diye yarım referans bir sonraki parçayla birlikte verilir
+        data = self._tail + data
+        m = _PARTIAL_REF.search(data, max(0, len(data) - 64))
+        cut = m.start() if m else len(data)
+        self._tail = data[cut:]
+        if cut: super().feed(data[:cut])
+
+    def _flush(self) -> None:
+        if not self._text: return
+        data, self._text = "".join(self._text), []
+        for ln in data.splitlines():
+            ln = ln.strip()
+            if not ln or all(ch in "-_=*" for ch in ln): continue  # boş / ayraç satırları
+            self.lines.append(" ".join(ln.split()))
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        self._flush()
+        if tag in self.skip_tags: self._skip_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush()
+        if tag in self.skip_tags and self._skip_depth: self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth: self._text.append(data)
+
+    def handle_charref(self, name: str) -> None:
+        try: code = int(name[1:], 16) if name[:1] in ("x", "X") else int(name)
+        except ValueError: code = -1
+        data = None
+        if 0 <= code < 256:  # &#147; gibi windows-1252 kod noktaları
+            try: data = bytes([code]).decode("windows-1252")
+            except UnicodeDecodeError: pass
+        if not data:
+            try: data = chr(code)
+            except (ValueError, OverflowError): pass
+        self.handle_data(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name: str) -> None:
+        # bilinmeyen ad HTML'de düz metindir: "&ad" (noktalı virgül ayrıştırıcıda tüketilir)
+        self.handle_data(_HTML5_ENTITIES.get(name + ";") or f"&{name}")
+
+    def handle_comment(self, data: str) -> None: self._flush()
+    def handle_decl(self, decl: str) -> None: self._flush()
+    def handle_pi(self, data: str) -> None: self._flush()
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush()
+        if data.upper().startswith("CDATA["):  # CDATA içeriği ayrı bir metin düğümüdür
+            self.handle_data(data[len("CDATA["):])
+            self._flush()
+
+    def close(self) -> None:
+        if self._tail: super().feed(self._tail)
+        self._tail = ""
+        super().close()
+        self._flush()
+
+
+def iter_text_lines(chunks: Iterable[str], skip_tags: Iterable[str] = SKIPPED_TEXT_TAGS) -> Iterator[str]:
+    """
+    HTML parçalarını (str) sırayla tokenize eder, skip_tags içeriklerini atlar ve temizlenmiş
+    satırları hemen üretir. Bellekte en fazla bir parça ve ondan çıkan satırlar tutulur.
+    """
+    parser = TextLineExtractor(skip_tags)
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.lines:
+            yield from parser.lines
+            parser.lines = []
+    parser.close()
+    yield from parser.lines
+
+
+
+def _benchmark(snapshot_dir: str, repeat: int = 3) -> None:
+    """saveAl snapshot'ları üzerinde backend'leri karşılaştırır."""
+    import glob, os, time
+    from src.main import _parse_detail_panel_html
+
+    docs = []
+    for p in sorted(glob.glob(os.path.join(snapshot_dir, "*.html"))):
+        with open(p, "r", encoding="utf-8", errors="ignore") as f: docs.append(f.read())
+    store_dir = os.path.join(snapshot_dir, "snapshots")
+    if os.path.exists(os.path.join(store_dir, "index.sqlite3")):
+        from src.snapshot_store import SnapshotStore
+        store = SnapshotStore(store_dir)
+        docs.extend(html for _, html in store.iter_html())
+        store.close()
+    if not docs:
+        print(f"❌ Snapshot bulunamadı: {snapshot_dir}")
+        return
+    total_mb = sum(len(d) for d in docs) / 1024 / 1024
+    print(f"📂 {len(docs)} dosya, {total_mb:.1f} MB")
+
+    baseline = [_parse_detail_panel_html(d, backend="html.parser") for d in docs]
+    for backend in available_backends():
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = [_parse_detail_panel_html(d, backend=backend) for d in docs]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        mismatches = sum(1 for a, b in zip(baseline, results) if a != b)
+        print(f"{backend:12s} {best:8.3f} s  ({len(docs) / best:8.1f} doc/s)  farklı sonuç: {mismatches}")
+
+
+if __name__ == "__main__":
+    import os, sys
+    default_dir = os.path.join(os.path.expanduser("~"), "Desktop", "saveAl")
+    _benchmark(sys.argv[1] if len(sys.argv) > 1 else default_dir)
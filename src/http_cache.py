@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - HTTP RESPONSE CACHE
+===========================================================
+
+Description:
+    scrap_page çekimleri için iki katmanlı yanıt önbelleği
+    (settings.enable_cache / settings.cache_ttl):
+        - Bellek : bayt bütçeli LRU (cache_memory_bytes)
+        - Disk   : SQLite, gövde zlib ile sıkıştırılmış
+                   (cache_dir, boşsa user_cache_dir()/http —
+                   kaynak ağacının dışında)
+
+    Taze kayıt (cache_ttl ya da yanıttaki Cache-Control max-age
+    içinde) ağa gitmeden döner. Süresi geçen kayıt silinmez;
+    cache_stale_keep boyunca ETag / Last-Modified ile koşullu
+    istekte kullanılır, 304 gelirse gövde yeniden indirilmez.
+    "no-store" yanıtlar önbelleğe alınmaz.
+
+    Tarayıcı yolu (render edilmiş HTML) ayrı anahtarla tutulur;
+    tarayıcıda koşullu istek yapılamadığı için süresi geçince
+    sayfa yeniden açılır.
+
+    İstatistik / temizlik:
+        python -m src.http_cache [stats|purge|clear]
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import logging, os, sqlite3, threading, time, zlib
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from src.settings import settings, user_cache_dir
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL = 600  # saniye; disk katmanında bayat kayıt temizliği aralığı
+
+
+
+class CacheEntry:
+    """Önbellekteki tek yanıt (gövde + doğrulayıcılar + son kullanma zamanı)."""
+    __slots__ = ("key", "url", "body", "etag", "last_modified", "stored_at", "expires_at", "size")
+
+    def __init__(self, key: str, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 stored_at: Optional[float] = None, expires_at: float = 0.0, size: Optional[int] = None) -> None:
+        self.key = key
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at if stored_at is not None else time.time()
+        self.expires_at = expires_at
+        self.size = size if size is not None else len(body.encode("utf-8", "ignore"))
+
+    @property
+    def fresh(self) -> bool: return time.time() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool: return bool(self.etag or self.last_modified)
+
+
+
+def cache_key(url: str, source: str = "http", encoding: Optional[str] = None) -> str:
+    """Kaynak (http | browser) ve zorlanan kodlama anahtara dahildir: aynı URL farklı gövde üretebilir."""
+    return f"{source}|{encoding or ''}|{url}"
+
+
+def ttl_from_headers(headers, default: int) -> Optional[int]:
+    """
+    Cache-Control'e göre saklama süresi; None = saklama (no-store), 0 = her seferinde doğrula.
+    Bu önbellek tek kullanıcılı (private) bir istemci önbelleğidir: "private" yanıtlar saklanır,
+    yalnızca paylaşılan önbellekler için olan s-maxage dikkate alınmaz.
+    """
+    cc = (headers.get("Cache-Control") or "").lower() if headers else ""
+    directives = {d.split("=", 1)[0].strip(): d.split("=", 1)[1].strip() if "=" in d else "" for d in cc.split(",") if d.strip()}
+    if "no-store" in directives: return None
+    if "no-cache" in directives: return 0
+    if "max-age" in directives:
+        try: return max(0, int(directives["max-age"].strip('"')))
+        except ValueError: pass
+    return default
+
+
+
+class ResponseCache:
+    """Bellek (LRU, bayt bütçeli) + disk (SQLite) katmanlı, thread-safe yanıt önbelleği."""
+
+    def __init__(self, directory: Optional[str] = None, memory_bytes: Optional[int] = None, stale_keep: Optional[int] = None) -> None:
+        self.directory = directory or settings.cache_dir or str(user_cache_dir() / "http")
+        self.memory_bytes = max(0, memory_bytes if memory_bytes is not None else settings.cache_memory_bytes)
+        self.stale_keep = stale_keep if stale_keep is not None else settings.cache_stale_keep
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.RLock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(self.directory, "responses.sqlite3"), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT NOT NULL, body BLOB NOT NULL, size INTEGER NOT NULL, "
+            "etag TEXT, last_modified TEXT, stored_at REAL NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._last_purge = 0.0
+        self.counters: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+        self.purge()
+
+    # ---------- bellek katmanı ----------
+    def _remember(self, entry: CacheEntry) -> None:
+        old = self._memory.pop(entry.key, None)
+        if old is not None: self._memory_used -= old.size
+        if entry.size > self.memory_bytes: return  # bütçeden büyük gövde yalnızca diskte tutulur
+        self._memory[entry.key] = entry
+        self._memory_used += entry.size
+        while self._memory_used > self.memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= evicted.size
+            self.counters["evictions"] += 1
+
+    # ---------- okuma / yazma ----------
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Kaydı döner (taze veya bayat; entry.fresh ile kontrol edilir), yoksa None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits" if entry.fresh else "stale"] += 1
+                return entry
+            row = self._conn.execute("SELECT url, body, size, etag, last_modified, stored_at, expires_at FROM responses WHERE key=?", (key,)).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+            url, blob, size, etag, last_modified, stored_at, expires_at = row
+            try: body = zlib.decompress(blob).decode("utf-8")
+            except Exception as e:
+                logger.warning(f"Bozuk önbellek kaydı siliniyor ({url}): {e}")
+                self._conn.execute("DELETE FROM responses WHERE key=?", (key,))
+                self.counters["misses"] += 1
+                return None
+            entry = CacheEntry(key, url, body, etag, last_modified, stored_at, expires_at, size)
+            self._remember(entry)
+            self.counters["disk_hits" if entry.fresh else "stale"] += 1
+            return entry
+
+    def put(self, key: str, url: str, body: str, ttl: Optional[int] = None, etag: Optional[str] = None, last_modified: Optional[str] = None) -> CacheEntry:
+        ttl = settings.cache_ttl if ttl is None else ttl
+        raw = body.encode("utf-8", "ignore")
+        now = time.time()
+        entry = CacheEntry(key, url, body, etag, last_modified, now, now + ttl, len(raw))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, body, size, etag, last_modified, stored_at, expires_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, zlib.compress(raw, 6), entry.size, etag, last_modified, now, entry.expires_at),
+            )
+            self._remember(entry)
+            self.counters["stores"] += 1
+            if now - self._last_purge >= PURGE_INTERVAL: self.purge()
+        return entry
+
+    def refresh(self, entry: CacheEntry, ttl: Optional[int] = None) -> None:
+        """304 sonrası: gövde aynı kalır, son kullanma zamanı yenilenir."""
+        entry.expires_at = time.time() + (settings.cache_ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute("UPDATE responses SET expires_at=? WHERE key=?", (entry.expires_at, entry.key))
+            self.counters["revalidated"] += 1
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None: self._memory_used -= old.size
+            self._conn.execute("DELETE FROM responses WHERE key=?", (key,))
+
+    def purge(self) -> int:
+        """Süresi cache_stale_keep'ten fazla geçmiş disk kayıtlarını siler."""
+        with self._lock:
+            self._last_purge = time.time()
+            removed = self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (self._last_purge - self.stale_keep,)).rowcount
+        if removed: logger.info(f"HTTP önbelleği: {removed} bayat kayıt silindi")
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._lock:
+            disk_entries, disk_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            c = dict(self.counters)
+            lookups = c["memory_hits"] + c["disk_hits"] + c["stale"] + c["misses"]
+            c.update(memory_entries=len(self._memory), memory_bytes=self._memory_used, disk_entries=disk_entries, disk_bytes=disk_bytes,
+                     hit_ratio=round((c["memory_hits"] + c["disk_hits"] + c["revalidated"]) / lookups, 3) if lookups else 0.0)
+            return c
+
+    def close(self) -> None:
+        with self._lock:
+            try: self._conn.close()
+            except Exception: pass
+
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+def get_http_cache() -> ResponseCache:
+    """ResponseCache nesnesini döner, yoksa oluşturur."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None: _cache = ResponseCache()
+    return _cache
+
+
+def revalidation_headers(entry: Optional[CacheEntry], headers: Optional[dict] = None) -> dict:
+    """Bayat kayıt için koşullu istek başlıkları (If-None-Match / If-Modified-Since)."""
+    headers = dict(headers or {})
+    if entry is not None:
+        if entry.etag: headers["If-None-Match"] = entry.etag
+        if entry.last_modified: headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+
+_CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since", "if-match", "if-unmodified-since", "if-range")
+
+def unconditional_headers(headers: Optional[dict] = None) -> dict:
+    """Koşullu istek başlıkları çıkarılmış kopya: elde kayıt yokken gelen 304'ten sonra tam gövdeyi istemek için."""
+    return {k: v for k, v in (headers or {}).items() if k.lower() not in _CONDITIONAL_HEADERS}
+
+
+def store_response(cache: ResponseCache, key: str, url: str, entry: Optional[CacheEntry], status: int, headers, body: str) -> str:
+    """
+    Yanıtı önbelleğe işler ve çağırana dönecek gövdeyi verir (304'te kayıttaki gövde).
+    Kayıt yokken 304 gelmemelidir (çağıran koşulsuz yeniden çeker); gelirse boş gövde saklanmaz.
+    """
+    ttl = ttl_from_headers(headers, settings.cache_ttl)
+    if status == 304:
+        if entry is None: return body
+        if ttl is None: cache.invalidate(key)
+        else: cache.refresh(entry, ttl)
+        return entry.body
+    if ttl is None: cache.invalidate(key)
+    else: cache.put(key, url, body, ttl, headers.get("ETag"), headers.get("Last-Modified"))
+    return body
+
+
+def cached_get(url: str, *, timeout: float = 20, headers: Optional[dict] = None, encoding: Optional[str] = None) -> str:
+    """
+    requests yolu: taze kayıt varsa ağa gitmez, bayatsa koşullu GET (If-None-Match / If-Modified-Since) yapar.
+    enable_cache kapalıysa doğrudan havuzlu oturuma gider.
+    """
+    from src import http_client
+    if not settings.enable_cache: return http_client.get(url, timeout=timeout, headers=headers, encoding=encoding).text
+    cache = get_http_cache()
+    key = cache_key(url, "http", encoding)
+    entry = cache.get(key)
+    if entry is not None and entry.fresh: return entry.body
+    resp = http_client.get(url, timeout=timeout, headers=revalidation_headers(entry, headers), encoding=encoding)
+    if resp.status_code == 304 and entry is None:
+        # elde gövde yok (çağıranın kendi If-* başlıkları vb.): ıskalama sayılır, koşulsuz yeniden çekilir
+        resp = http_client.get(url, timeout=timeout, headers=unconditional_headers(headers), encoding=encoding)
+    return store_response(cache, key, url, entry, resp.status_code, resp.headers, "" if resp.status_code == 304 else resp.text)
+
+
+
+if __name__ == "__main__":
+    import json, sys
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    cache = get_http_cache()
+    if command == "purge": print(f"🧹 {cache.purge()} bayat kayıt silindi")
+    elif command == "clear":
+        cache.clear()
+        print("🧹 Önbellek temizlendi")
+    print(json.dumps(cache.stats(), indent=2, ensure_ascii=False))
+    cache.close()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - POOLED HTTP CLIENT
+===========================================================
+
+Description:
+    scrap_page'in requests yolu için paylaşılan, thread-safe HTTP
+    oturumu. Her fetch yeni TCP/TLS el sıkışması yapmaz:
+        - Bağlantı havuzu + keep-alive (host başına en fazla
+          http_pool_maxsize bağlantı; dolarsa istek bekler)
+        - 5xx / bağlantı / okuma hatalarında jitter'lı üstel
+          geri çekilmeyle yeniden deneme (yalnızca GET/HEAD)
+        - gzip/deflate her zaman; brotli / zstd ilgili paket
+          kuruluysa (brotli / brotlicffi / zstandard) şeffaf açılır
+        - Her istek host başına hız sınırından geçer (src.rate_limiter)
+
+    Yerel ölçüm (havuzsuz requests.get ile havuzlu oturum):
+        python -m src.http_client [istek_sayısı] [eşzamanlılık]
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import codecs, logging, threading
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+
+from src.settings import settings
+from src.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=settings.http_retries, connect=settings.http_retries, read=settings.http_retries,
+        status_forcelist=RETRY_STATUSES, allowed_methods=frozenset(("GET", "HEAD")),
+        backoff_factor=settings.http_backoff, backoff_jitter=settings.http_backoff_jitter, backoff_max=30,
+        respect_retry_after_header=True, raise_on_status=False,
+    )
+    # pool_connections: havuzu tutulan host sayısı, pool_maxsize: host başına bağlantı; pool_block: sınırı aşma, bekle
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=settings.http_pool_hosts, pool_maxsize=settings.http_pool_maxsize, pool_block=True)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # urllib3 kurulu çözücülere göre "gzip,deflate[,br][,zstd]" üretir
+    session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+    return session
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Paylaşılan oturumu döner, yoksa oluşturur."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None: _session = _build_session()
+    return _session
+
+def close_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None: _session.close()
+        _session = None
+
+
+def get(url: str, *, timeout: float = 20, headers: Optional[dict] = None, encoding: Optional[str] = None) -> requests.Response:
+    """Havuzlu GET; yeniden denemeler tükenince son yanıt için raise_for_status() uygulanır."""
+    get_rate_limiter().acquire(url)
+    resp = get_session().get(url, timeout=timeout, headers=headers)
+    resp.raise_for_status()
+    if encoding: resp.encoding = encoding
+    return resp
+
+
+def iter_text(url: str, *, timeout: float = 20, headers: Optional[dict] = None, encoding: Optional[str] = None, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Havuzlu GET; gövdeyi indirildikçe çözülmüş metin parçaları olarak verir (tamamı bellekte tutulmaz)."""
+    get_rate_limiter().acquire(url)
+    with get_session().get(url, timeout=timeout, headers=headers, stream=True) as resp:
+        resp.raise_for_status()
+        try: decoder = codecs.getincrementaldecoder(encoding or resp.encoding or "utf-8")(errors="replace")
+        except LookupError: decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for chunk in resp.iter_content(chunk_size):
+            text = decoder.decode(chunk)
+            if text: yield text
+        tail = decoder.decode(b"", final=True)
+        if tail: yield tail
+
+
+
+# ================== YEREL ÖLÇÜM ==================
+def _serve_local(body: bytes):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True  # başlık + gövde ayrı yazılır; Nagle keep-alive'da ~40 ms gecikme ekler
+        def log_message(self, *args): pass
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def _benchmark(total: int = 500, concurrency: int = 8) -> None:
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    # get() yerine doğrudan oturum: hız sınırlayıcı değil, bağlantı havuzu ölçülür
+    server, url = _serve_local(b"<html><body>" + b"<p>menu item</p>" * 200 + b"</body></html>")
+    try:
+        for name, fetch in (("requests.get (havuzsuz)", lambda: requests.get(url, timeout=10).content),
+                            ("paylaşılan oturum", lambda: get_session().get(url, timeout=10).content)):
+            fetch()  # ısınma
+            start = time.perf_counter()
+            with ThreadPoolExecutor(concurrency) as ex: list(ex.map(lambda _: fetch(), range(total)))
+            elapsed = time.perf_counter() - start
+            print(f"{name:<24} {total / elapsed:>8.0f} istek/s  ({total} istek, {concurrency} thread, {elapsed:.2f} s)")
+    finally:
+        server.shutdown()
+        close_session()
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500, int(sys.argv[2]) if len(sys.argv) > 2 else 8)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - IMPORT TIME BUDGET
+===========================================================
+
+Description:
+    CLI / PyInstaller araçlarının açılış süresini korur. Modül her
+    ölçümde temiz bir Python sürecinde import edilir (önbellek
+    etkisi olmadan); medyan süre bütçeyi aşarsa veya tarayıcı /
+    HTTP yığını (selenium, requests, bs4 ...) import sırasında
+    yüklenirse çıkış kodu 1 olur.
+
+        python -m src.import_budget                      -> src.scrap_page, 0.5 s
+        python -m src.import_budget src.main 1.0 --top 15
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import os, subprocess, sys
+from typing import List, Tuple
+
+# Bu modüller yalnızca ilk kullanımda yüklenmeli
+HEAVY_MODULES = ("selenium", "requests", "bs4", "lxml", "selectolax", "webdriver_manager", "psutil", "aiohttp")
+
+_PROBE = """
+import sys, time
+t = time.perf_counter()
+import {module}
+print(time.perf_counter() - t)
+print(",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+
+def measure(module: str, runs: int = 5) -> Tuple[float, List[str], str]:
+    """(medyan süre, import sırasında yüklenen ağır modüller, son çalıştırmanın -X importtime çıktısı)."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times, heavy, importtime = [], [], ""
+    for _ in range(max(1, runs)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, cwd=root, timeout=120,
+        )
+        if proc.returncode != 0: raise RuntimeError(f"{module} import edilemedi:\n{proc.stderr[-2000:]}")
+        out = proc.stdout.splitlines()
+        times.append(float(out[-2]))
+        heavy = [m for m in out[-1].split(",") if m]
+        importtime = proc.stderr
+    times.sort()
+    return times[len(times) // 2], heavy, importtime
+
+
+def _top_imports(importtime: str, n: int) -> List[Tuple[int, str]]:
+    """-X importtime çıktısından kümülatif süreye göre en pahalı n import (mikrosaniye, modül)."""
+    rows = []
+    for ln in importtime.splitlines():
+        parts = ln.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit(): continue
+        rows.append((int(parts[1]), parts[2].rstrip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def check(module: str = "src.scrap_page", budget: float = 0.5, runs: int = 5, top: int = 10) -> bool:
+    median, heavy, importtime = measure(module, runs)
+    ok = median <= budget and not heavy
+    print(f"{'✅' if ok else '❌'} import {module}: {median * 1000:.0f} ms (bütçe: {budget * 1000:.0f} ms, {runs} ölçüm medyanı)")
+    if heavy: print(f"❌ Import sırasında yüklenen ağır modüller: {', '.join(heavy)}")
+    if top:
+        print(f"En pahalı {top} import (kümülatif):")
+        for us, name in _top_imports(importtime, top): print(f"  {us / 1000:8.1f} ms  {name}")
+    return ok
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    top = int(sys.argv[sys.argv.index("--top") + 1]) if "--top" in sys.argv else 10
+    if "--top" in sys.argv: args.remove(str(top))
+    module = args[0] if args else "src.scrap_page"
+    budget = float(args[1]) if len(args) > 1 else 0.5
+    sys.exit(0 if check(module, budget, top=top) else 1)
@@ -1,20 +1,25 @@
-import os, asyncio, time, hashlib
+import os, asyncio, time, hashlib, re, json
 from datetime import datetime
-from typing import List, Optional, Set
-
-from bs4 import BeautifulSoup
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import (
-    WebDriverException,
-    NoSuchElementException,
-    StaleElementReferenceException,
-    TimeoutException,
-)
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+from urllib.parse import parse_qsl, urlsplit
 
+# selenium / browser_manager ilk kullanımda yüklenir: modülü import etmek tarayıcı, dizin veya dosya açmaz
 from src.settings import settings
-from src.browser_manager import get_browser_manager, BrowserManager
+from src.driver_executor import PRIORITY_BULK, PRIORITY_HEALTH
+from src.browser_pool import get_browser_pool
+from src.html_parser import parse_html, strip_tags
+from src.network_capture import process_network_orders
+from src.order_index import ProcessedIndex
+from src.output_writer import get_output_writer
+from src.snapshot_store import SnapshotStore
+from src.order_export import RotatingJsonlWriter, order_record
+from src.scheduler import AdaptivePoller, Scheduler
+from src.request_policy import apply_request_policy
+from src.rate_limiter import get_rate_limiter
+from src.metrics import get_metrics, serve_metrics
+from src.tracing import get_tracer
+
+if TYPE_CHECKING: from src.browser_manager import BrowserManager
 
 # ================== KONSTLAR ==================
 TARGET_URL = "https://partner.tgoyemek.com/meal/245018/order/list"
@@ -24,20 +29,141 @@ DETAIL_PANEL_SELECTOR = ".order-details-item-list"  # sağ tarafta yüklenen det
 
 DESKTOP_DIR = os.path.join(os.path.expanduser("~"), "Desktop")
 SAVE_DIR = os.path.join(DESKTOP_DIR, "saveAl")
-os.makedirs(SAVE_DIR, exist_ok=True)
+# Yeniden başlatmalarda korunur (SAVE_DIR/processed_orders.sqlite3); bellekte sadece sıcak küme tutulur
+_INDEX_PATH = os.path.join(SAVE_DIR, "processed_orders.sqlite3")
+
+# ================== METRİKLER =================
+# Prometheus metin formatı: SAVE_DIR/metrics.prom (settings.metrics_interval) ve/veya settings.metrics_port
+_metrics = get_metrics()
+CARD_SCAN_SECONDS = _metrics.histogram("scrap_card_scan_seconds", "Sipariş kartı listesini tarama süresi")
+CLICK_TO_PANEL_SECONDS = _metrics.histogram("scrap_click_to_panel_seconds", "Kart tıklamasından detay panelinin okunmasına kadar geçen süre")
+PARSE_SECONDS = _metrics.histogram("scrap_parse_seconds", "_parse_detail_panel_html süresi", buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+SNAPSHOT_WRITE_SECONDS = _metrics.histogram("scrap_snapshot_write_seconds", "Snapshot temizleme + depoya yazma süresi (writer thread)")
+LOOP_ITERATION_SECONDS = _metrics.histogram("scrap_loop_iteration_seconds", "Mağaza döngü adımı süresi (bekleme hariç)", ["store"])
+ORDERS_PROCESSED = _metrics.counter("scrap_orders_processed_total", "İşlenen sipariş sayısı", ["store"])
+LOOP_ERRORS = _metrics.counter("scrap_loop_errors_total", "Döngü adımı hataları", ["store", "kind"])
+RESTARTS = _metrics.counter("scrap_restarts_total", "Tarayıcı kurtarmaları (yöntem veya 'failed')", ["method"])
+# Aşama span'leri (Chrome trace-event JSON): settings.trace_file boşsa kapalı, span() boş bağlam döner
+_tracer = get_tracer()
 
 # ================== DURUM =====================
-browser_manager: BrowserManager = get_browser_manager()
-_clicked_cards: Set[str] = set()
-_processed_detail_urls: Set[str] = set()
+# _init_state() ile doldurulur (async_main / benchmark başında)
+browser_manager: Optional["BrowserManager"] = None
+output_writer = None
+order_jsonl: Optional[RotatingJsonlWriter] = None  # SAVE_DIR/orders/orders-YYYYMMDD.jsonl
+snapshot_store: Optional[SnapshotStore] = None  # içerik hash'iyle, sıkıştırılmış: SAVE_DIR/snapshots
+_clicked_cards: Optional[ProcessedIndex] = None
+_processed_detail_urls: Optional[ProcessedIndex] = None
 
-_base_handle: Optional[str] = None
+# Soğuk başlangıç ölçümü: async_main başlangıcından ilk görünen karta (veya ilk yakalanan siparişe) kadar
+_startup: dict = {}
+STARTUP_LOG = os.path.join(SAVE_DIR, "startup_times.jsonl")
+# Kurtarma süreleri (MTTR): hatanın yakalanmasından döngünün devam etmesine kadar
+_recovery_times: List[float] = []
+RECOVERY_LOG = os.path.join(SAVE_DIR, "recoveries.jsonl")
+
+_active_handle: Optional[str] = None  # driver'ın şu an odaklandığı sekme (gereksiz switch round-trip'ini önler)
+
+
+class StoreMonitor:
+    """
+    Tek bir mağaza hedefi: kendi sekmesi, dedup indeksi, çıktı dosyaları ve zamanlayıcısı.
+    Birincil mağaza eski dosya adlarını ve "cards" indeksini kullanır (geriye uyumluluk).
+    """
+
+    def __init__(self, url: str, primary: bool = False) -> None:
+        self.url = url
+        self.primary = primary
+        self.store_id = _store_id(url)
+        if primary:
+            self.clicked_cards = _clicked_cards
+            self.orders_txt = os.path.join(SAVE_DIR, "siparisler.txt")
+            self.order_jsonl = order_jsonl
+        else:
+            self.clicked_cards = ProcessedIndex(_INDEX_PATH, namespace=f"cards:{self.store_id}", hot_size=settings.processed_index_hot_size)
+            self.orders_txt = os.path.join(SAVE_DIR, f"siparisler-{self.store_id}.txt")
+            self.order_jsonl = RotatingJsonlWriter(os.path.join(SAVE_DIR, "orders", self.store_id), max_bytes=settings.order_export_max_bytes)
+        self.handle: Optional[str] = None
+        self.last_print = ""
+        self.poller = AdaptivePoller(settings.poll_min_interval, settings.poll_max_interval, settings.poll_backoff)
+        self.scheduler: Optional[Scheduler] = None
+
+    @property
+    def label(self) -> str: return f"[{self.store_id}] " if len(_stores) > 1 else ""
+
+    def open(self, driver, handle: Optional[str] = None) -> None:
+        """Verilen sekmeyi (yoksa yeni sekme) mağazaya ayır ve hedefe git."""
+        global _active_handle
+        if handle: driver.switch_to.window(handle)
+        else: driver.switch_to.new_window("tab")
+        self.handle = _active_handle = driver.current_window_handle
+        from selenium.webdriver.support.ui import WebDriverWait
+        get_rate_limiter().acquire(self.url)
+        apply_request_policy(driver, self.url)
+        driver.get(self.url)
+        WebDriverWait(driver, settings.browser_timeout).until(lambda d: d.execute_script("return document.readyState") == "complete")
+
+    def activate(self, driver) -> None:
+        """Gerekirse mağazanın sekmesine geç."""
+        global _active_handle
+        if self.handle and _active_handle != self.handle:
+            driver.switch_to.window(self.handle)
+            _active_handle = self.handle
+
+    def close(self) -> None:
+        if not self.primary: self.clicked_cards.close()
+
+
+def _store_id(url: str) -> str:
+    """URL'den mağaza kimliği (ör. .../meal/245018/order/list -> 245018)."""
+    m = re.search(r"/meal/(\d+)", url)
+    return m.group(1) if m else hashlib.sha256(url.encode("utf-8", "ignore")).hexdigest()[:8]
+
+
+_primary_store: Optional[StoreMonitor] = None
+_stores: List[StoreMonitor] = []
+
+
+def _init_state() -> None:
+    """Çıktı dizinini, tarayıcı yöneticisini, yazıcıyı, depoları ve indeksleri oluşturur (idempotent)."""
+    global browser_manager, output_writer, order_jsonl, snapshot_store, _clicked_cards, _processed_detail_urls, _primary_store, _stores
+    if _primary_store is not None: return
+    from src.browser_manager import get_browser_manager
+    os.makedirs(SAVE_DIR, exist_ok=True)
+    browser_manager = get_browser_manager()
+    output_writer = get_output_writer()
+    order_jsonl = RotatingJsonlWriter(os.path.join(SAVE_DIR, "orders"), max_bytes=settings.order_export_max_bytes)
+    snapshot_store = SnapshotStore(
+        os.path.join(SAVE_DIR, "snapshots"),
+        compression=settings.snapshot_compression,
+        archive_after_days=settings.snapshot_archive_after_days,
+        compact_interval=settings.snapshot_compact_interval,
+    )
+    _clicked_cards = ProcessedIndex(_INDEX_PATH, namespace="cards", hot_size=settings.processed_index_hot_size)
+    _processed_detail_urls = ProcessedIndex(_INDEX_PATH, namespace="detail_urls", hot_size=settings.processed_index_hot_size)
+    _primary_store = StoreMonitor(TARGET_URL, primary=True)
+    _stores = [_primary_store]
 
 # ================== YARDIMCI ==================
 def _hash(txt: str) -> str: return hashlib.sha256(txt.encode("utf-8", "ignore")).hexdigest()[:16]
 
 
 
+def _mark_startup(stage: str) -> None:
+    if "t0" in _startup and stage not in _startup: _startup[stage] = time.perf_counter() - _startup["t0"]
+
+
+def _report_first_card() -> None:
+    """İlk kart görüldüğünde (bir kez) başlangıç aşama sürelerini yazdırır ve STARTUP_LOG'a ekler."""
+    if "t0" not in _startup or "first_card" in _startup: return
+    _mark_startup("first_card")
+    stages = {k: round(v, 3) for k, v in _startup.items() if k != "t0"}
+    record = {"ts": datetime.now().isoformat(timespec="seconds"), "mode": settings.capture_mode, **stages,
+              "browser_stages": browser_manager.startup_timings}
+    print(f"⏱️ İlk karta kadar: {stages['first_card']:.2f} s (browser: {stages.get('browser', 0):.2f} s, sayfa: {stages.get('page', 0):.2f} s)")
+    output_writer.append(STARTUP_LOG, json.dumps(record, ensure_ascii=False) + "\n")
+
+
 def _capture_dom_outer_html(driver) -> str:
     try:
         driver.execute_cdp_cmd("DOM.enable", {})
@@ -51,32 +177,33 @@ def _capture_dom_outer_html(driver) -> str:
 
 def _save_html_snapshot(driver, prefix: str) -> str:
     """
-    Driver'dan alınan HTML'i kaydeder. Kaydetmeden önce
-    <script>, <noscript> ve <style> etiketlerini kaldırır.
+    Driver'dan alınan HTML'i snapshot deposuna kaydeder. Kaydetmeden önce
+    <script>, <noscript> ve <style> etiketlerini kaldırır. Kayıt adını döner.
     """
     html_source = _capture_dom_outer_html(driver)
-    try:
-        soup = BeautifulSoup(html_source, "html.parser")
-        for tag in soup.find_all(["script", "noscript", "style"]):  tag.decompose()
-        cleaned_html = str(soup)
-    except Exception:  cleaned_html = html_source
+
+    def _store() -> None:
+        # writer thread'inde çalışır; ayrıştırma / sıkıştırma maliyeti döngüye yansımaz
+        with SNAPSHOT_WRITE_SECONDS.time(), _tracer.span("snapshot_write", cat="io", snapshot=name):
+            try: cleaned_html = strip_tags(html_source, ["script", "noscript", "style"])
+            except Exception:  cleaned_html = html_source
+            digest = snapshot_store.put(cleaned_html, prefix, page_title, ts=ts)
+        print(f"💾 Kaydedildi: {name} -> {digest[:12]}")
 
     ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
     page_title = (getattr(driver, "title", "") or "page").replace(" ", "_").replace("/", "_").replace("\\", "_")
-    path = os.path.join(SAVE_DIR, f"{ts}_{prefix}_{page_title}.html")
-    try:
-        with open(path, "w", encoding="utf-8") as f:  f.write(cleaned_html)
-        print(f"💾 Kaydedildi: {path}")
-    except Exception as e:  print(f"Snapshot kaydedilemedi: {e}")
-    return path
+    name = f"{ts}_{prefix}_{page_title}"
+    output_writer.call(_store)
+    return name
 
 
 
 
 
-def _parse_detail_panel_html(html: str) -> dict:
+def _parse_detail_panel_html(html: str, backend: Optional[str] = None) -> dict:
     """Detay panelindeki sipariş bilgisini ayrıştır ve dict döndür."""
-    soup = BeautifulSoup(html, "html.parser")
+    start = time.perf_counter()
+    soup = parse_html(html, backend)
     result = {"items": [], "note": None, "totals": {}, "customer_info": {}, "delivery_type": None, "payment_method": None}
 
     # Sipariş notu
@@ -126,10 +253,11 @@ def _parse_detail_panel_html(html: str) -> dict:
             label = tds[0].get_text(" ", strip=True)
             value = tds[1].get_text(" ", strip=True)
             result["totals"][label] = value
+    PARSE_SECONDS.observe(time.perf_counter() - start)
     return result
 
 
-def _log_processed_order(parsed: dict, title_preview: str) -> None:
+def _log_processed_order(parsed: dict, title_preview: str, store: Optional[StoreMonitor] = None) -> None:
     """Yeni işlendiğinde masaüstündeki 'açtığı siparişler.txt' dosyasına ekle ve konsola özet bas."""
     # Prepare lines
     lines: list[str] = []
@@ -158,20 +286,16 @@ def _log_processed_order(parsed: dict, title_preview: str) -> None:
         print(l)
     print("--- SON ---\n")
 
-    # Append to SAVE_DIR/siparisler.txt with timestamp header and long separator
-    try:
-        os.makedirs(SAVE_DIR, exist_ok=True)
-        path = os.path.join(SAVE_DIR, "siparisler.txt")
-        sep = "-" * 80
-        # Write timestamp header then details then separator
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(f"[{ts}] {title_preview}\n")
-            for l in lines[1:]:
-                f.write(l + "\n")
-            f.write(sep + "\n\n")
-        print(f"📝 Kaydedildi: {path}")
-    except Exception as e:
-        print(f"Dosyaya yazılamadı: {e}")
+    # Append to SAVE_DIR/siparisler.txt with timestamp header and long separator (arka plan yazıcı)
+    store = store or _primary_store
+    path = store.orders_txt
+    sep = "-" * 80
+    block = f"[{ts}] {title_preview}\n" + "".join(l + "\n" for l in lines[1:]) + sep + "\n\n"
+    output_writer.append(path, block)
+    # Yapısal kopya: dönen JSONL (dosya seçimi gerçek boyuta göre writer thread'inde yapılır)
+    record = order_record(parsed, title_preview)
+    output_writer.call(lambda: store.order_jsonl.write(record))
+    print(f"📝 Yazma kuyruğuna alındı: {path}")
 
 
 # ...existing code...
@@ -180,8 +304,115 @@ def _log_processed_order(parsed: dict, title_preview: str) -> None:
 
 
 
-def _wait_for_detail_panel_change(driver, previous_html: str | None, timeout: float = 6.0) -> Optional[str]:
+DETAIL_INFO_SELECTOR = ".order-details-info"  # bazı sayfalarda müşteri bilgileri panel dışında
+PANEL_SETTLE_MS = 150  # son DOM değişiminden sonra panelin "oturmuş" sayılması için sessizlik süresi
+
+# execute_async_script desteklenmezse (eski driver vb.) polling'e düşülür
+_async_panel_wait = True
+_script_timeouts: Dict[int, float] = {}  # id(driver) -> set_script_timeout ile ayarlanan bekleme (her çağrıda round-trip olmasın)
+
+# Mevcut paneli tarayıcı tarafında referans olarak sakla; sadece uzunluğu döner (HTML kabloya çıkmaz)
+_PANEL_MARK_JS = """
+const p = document.querySelector(arguments[0]);
+window.__scrapLastPanelHtml = p ? p.outerHTML.trim() : '';
+return window.__scrapLastPanelHtml.length;
+"""
+
+_PANEL_MARKED_JS = "return window.__scrapLastPanelHtml === undefined ? null : window.__scrapLastPanelHtml;"
+
+# Panel + bilgi bloğunu tek çağrıda okur
+_PANEL_READ_JS = """
+const p = document.querySelector(arguments[0]), i = document.querySelector(arguments[1]);
+return [p ? p.outerHTML : '', i ? i.outerHTML : ''];
+"""
+
+# MutationObserver: panel referanstan farklılaşıp PANEL_SETTLE_MS boyunca sessiz kalınca HTML'i bir kez döner
+_PANEL_WAIT_JS = """
+const [selector, infoSelector, quietMs, timeoutMs, minLen] = arguments;
+const done = arguments[arguments.length - 1];
+const last = window.__scrapLastPanelHtml || '';
+let finished = false, settleTimer = null, hardTimer = null, observer = null;
+const changed = () => {
+    const p = document.querySelector(selector);
+    if (!p) return null;
+    const h = p.outerHTML.trim();
+    return (last ? h !== last : h.length > minLen) ? h : null;
+};
+const finish = (html) => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(settleTimer); clearTimeout(hardTimer);
+    if (!html) return done(null);
+    window.__scrapLastPanelHtml = html;
+    const info = document.querySelector(infoSelector);
+    done([html, info ? info.outerHTML : '']);
+};
+const schedule = () => {
+    clearTimeout(settleTimer);
+    settleTimer = setTimeout(() => { const h = changed(); if (h) finish(h); }, quietMs);
+};
+observer = new MutationObserver(schedule);
+observer.observe(document.body, {childList: true, subtree: true, characterData: true, attributes: true});
+hardTimer = setTimeout(() => finish(changed()), timeoutMs);
+schedule();
+"""
+
+
+def _mark_detail_panel(driver) -> int:
+    """Tıklamadan önce mevcut paneli referans olarak işaretle, uzunluğunu döndür."""
+    try: return int(driver.execute_script(_PANEL_MARK_JS, DETAIL_PANEL_SELECTOR) or 0)
+    except Exception: return 0
+
+
+def _marked_panel_html(driver) -> Optional[str]:
+    """_mark_detail_panel'in tarayıcıda sakladığı (tıklamadan önceki) panel HTML'i; işaret yoksa None."""
+    try: return driver.execute_script(_PANEL_MARKED_JS)
+    except Exception: return None
+
+
+def _read_detail_html(driver) -> tuple[str, str]:
+    """(panel outerHTML, bilgi bloğu outerHTML) çiftini tek round-trip ile al."""
+    try:
+        panel_html, info_html = driver.execute_script(_PANEL_READ_JS, DETAIL_PANEL_SELECTOR, DETAIL_INFO_SELECTOR)
+        return panel_html or "", info_html or ""
+    except Exception: return "", ""
+
+
+def _wait_for_detail_panel_change(driver, previous_html: str | None, timeout: float = 6.0) -> Optional[tuple[str, str]]:
+    """
+    Detay paneli değişip oturana kadar bekle. (panel, bilgi bloğu) HTML çifti döner veya None.
+    Referans, _mark_detail_panel ile tarayıcı tarafında tutulur; polling modunda previous_html kullanılır.
+    """
+    global _async_panel_wait
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    if _async_panel_wait:
+        try:
+            if _script_timeouts.get(id(driver)) != timeout:
+                driver.set_script_timeout(timeout + 2)
+                _script_timeouts[id(driver)] = timeout
+            result = driver.execute_async_script(_PANEL_WAIT_JS, DETAIL_PANEL_SELECTOR, DETAIL_INFO_SELECTOR, PANEL_SETTLE_MS, int(timeout * 1000), 50)
+            return (result[0] or "", result[1] or "") if result else None
+        except TimeoutException: return None
+        except WebDriverException as e:
+            print(f"⚠️ Async panel beklemesi kullanılamıyor, polling'e geçiliyor: {e}")
+            _async_panel_wait = False
+            # çağıran async modda paneli yalnızca tarayıcıda işaretledi: polling için tıklama öncesi referansı oradan al,
+            # yoksa eski panel "yeni" sanılır ve önceki siparişin detayı bu karta yazılır
+            if previous_html is None:
+                previous_html = _marked_panel_html(driver)
+                if previous_html is None: previous_html = _read_detail_html(driver)[0]
+    panel_html = _poll_for_detail_panel_change(driver, previous_html, timeout)
+    if not panel_html: return None
+    with _tracer.span("info_fetch"): return panel_html, _read_detail_html(driver)[1]
+
+
+def _poll_for_detail_panel_change(driver, previous_html: str | None, timeout: float = 6.0) -> Optional[str]:
     """Detay paneli görünür olana ve içeriği değişene kadar bekle. Yeni outerHTML döner veya None."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
     try:
         wait = WebDriverWait(driver, timeout)
         panel = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, DETAIL_PANEL_SELECTOR)))
@@ -210,128 +441,232 @@ def _wait_for_detail_panel_change(driver, previous_html: str | None, timeout: fl
     return None
 
 
-onceki_print = ""
+# Tüm kartları tek WebDriver çağrısında listeler: index, görünür metin, tıklanabilirlik ve element referansı
+_CARD_SCAN_JS = """
+const cards = document.querySelectorAll(arguments[0]);
+return Array.from(cards, (el, i) => {
+    const r = el.getBoundingClientRect();
+    const st = window.getComputedStyle(el);
+    const clickable = r.width > 0 && r.height > 0 && st.visibility !== 'hidden'
+        && st.display !== 'none' && st.pointerEvents !== 'none' && !el.hasAttribute('disabled');
+    return {index: i, text: (el.innerText || '').trim(), clickable: clickable, el: el};
+});
+"""
+
+# Tıklamadan önce tek çağrıda: target kaldır (yeni sekme açılmasın) + karta scroll
+_CARD_PREPARE_JS = "arguments[0].removeAttribute('target'); arguments[0].scrollIntoView({block:'center'});"
+
+
+def _scan_cards(driver, current_url: str) -> List[dict]:
+    """Kartları tek round-trip ile tarar; her karta kalıcı 'key' ekler."""
+    try:
+        with CARD_SCAN_SECONDS.time(): cards = driver.execute_script(_CARD_SCAN_JS, CARD_SELECTOR) or []
+    except Exception: return []
+    for card in cards:
+        txt = card.get("text") or ""
+        card["key"] = _hash(f"{current_url}|{txt[:160]}") if txt else None
+    return cards
 
-def _click_new_order_cards(driver) -> int:
+
+def _click_new_order_cards(driver, current_url: Optional[str] = None, store: Optional[StoreMonitor] = None) -> int:
     """Her yeni kartı tıkla, detay paneli yüklenmesini bekle, veriyi ayrıştır."""
-    global onceki_print
-    try: cards = driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR)
-    except Exception: return 0
+    from selenium.common.exceptions import WebDriverException, NoSuchElementException, StaleElementReferenceException
+    store = store or _primary_store
+    clicked_cards = store.clicked_cards
+    current_url = current_url if current_url is not None else (driver.current_url or "")
+    with _tracer.span("locate_cards") as sp:
+        cards = _scan_cards(driver, current_url)
+        sp.set(cards=len(cards))
     if not cards:
         print("⏸ Kart bulunamadı.")
         return 0
+    _report_first_card()
     clicked = 0
-    # mevcut panel html'i al (yeniden bul)
-    prev_panel_html = ""
-    try:
-        panel = driver.find_element(By.CSS_SELECTOR, DETAIL_PANEL_SELECTOR)
-        prev_panel_html = panel.get_attribute("outerHTML") or ""
-    except Exception:  prev_panel_html = ""
-    yaz = f"🧭 Bulunan kart sayısı: {len(cards)}  (daha önce işlenen: {len(_clicked_cards)})"
-    if onceki_print != yaz:
+    # mevcut paneli referans al: async modda tarayıcıda kalır, polling modunda HTML çekilir
+    prev_panel_html = None
+    with _tracer.span("panel_mark"):
+        if _async_panel_wait: prev_panel_len = _mark_detail_panel(driver)
+        else:
+            prev_panel_html = _read_detail_html(driver)[0]
+            prev_panel_len = len(prev_panel_html)
+    yaz = f"{store.label}🧭 Bulunan kart sayısı: {len(cards)}  (daha önce işlenen: {len(clicked_cards)})"
+    if store.last_print != yaz:
         print(yaz)
-        onceki_print = yaz
-    # Her döngüde index ile yeniden locate et -> stale referans önlemi
-    for idx in range(len(cards)):
-        try:
-            # yeniden locate edilen element
-            els = driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR)
-            if idx >= len(els): continue
-            el = els[idx]
-            txt = el.text.strip()
-            if not txt: continue
-            key = _hash(f"{driver.current_url}|{txt[:160]}")
-            if key in _clicked_cards: continue
-            # target varsa kaldır (yeni sekme açılmasını engelle)
-            try: driver.execute_script("arguments[0].removeAttribute('target');", el)
-            except Exception:  pass
-            # karta scroll yap
-            try: driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-            except Exception: pass
-            clicked_ok = False  # normal click dene; işe yaramazsa JS click
+        store.last_print = yaz
+    # Sadece yeni kartlarla uğraş; taramadaki element referansları kullanılır
+    new_cards = [c for c in cards if c["key"] and c["key"] not in clicked_cards]
+    for card in new_cards:
+        idx, txt, key, el = card["index"], card["text"], card["key"], card["el"]
+        # "order" span'i bir kartın tüm aşamalarını kapsar: trace'te sipariş başına kritik yol
+        with _tracer.span("order", key=key, index=idx, store=store.store_id) as order_span:
             try:
-                el.click()
-                clicked_ok = True
-            except Exception:
-                try:
-                    driver.execute_script("arguments[0].click();", el)
-                    clicked_ok = True
-                except Exception as e:
-                    print(f"⚠️ Kart tıklama hatası (idx={idx}): {e}")
-                    clicked_ok = False
-            if not clicked_ok:
-                time.sleep(0.2)  # tık başarısızsa bir sonraki karta geç
+                with _tracer.span("scroll"):
+                    try: driver.execute_script(_CARD_PREPARE_JS, el)
+                    except StaleElementReferenceException:
+                        # liste yeniden render edilmiş olabilir -> tek taramayla aynı anahtarlı kartı bul
+                        with _tracer.span("relocate"): fresh = next((c for c in _scan_cards(driver, current_url) if c["key"] == key), None)
+                        if not fresh:
+                            order_span.set(result="stale")
+                            continue
+                        el = fresh["el"]
+                        driver.execute_script(_CARD_PREPARE_JS, el)
+                    except Exception:  pass
+                clicked_ok = False  # normal click dene; işe yaramazsa JS click
+                with _tracer.span("click") as click_span:
+                    # görünmez/üstü kapalı kartta native click boşa round-trip olur -> doğrudan JS click
+                    use_js = not card.get("clickable")
+                    if not use_js:
+                        try:
+                            el.click()
+                            clicked_ok = True
+                        except WebDriverException: use_js = True  # üstü kapalı, etkileşilemez vb.
+                    if use_js:
+                        click_span.set(js_click=True)
+                        try:
+                            driver.execute_script("arguments[0].click();", el)
+                            clicked_ok = True
+                        except Exception as e:
+                            print(f"⚠️ Kart tıklama hatası (idx={idx}): {e}")
+                            clicked_ok = False
+                if not clicked_ok:
+                    order_span.set(result="click_failed")
+                    time.sleep(0.2)  # tık başarısızsa bir sonraki karta geç
+                    continue
+                clicked_at = time.perf_counter()
+                # detay panelin yüklenmesini bekle (async modda .order-details-info aynı çağrıda gelir)
+                with _tracer.span("panel_wait") as wait_span:
+                    detail = _wait_for_detail_panel_change(driver, prev_panel_html, timeout=8.0)
+                    if not detail:
+                        # fallback: kısa bekleme sonrası panelin outerHTML'ini al
+                        wait_span.set(fallback=True)
+                        time.sleep(0.6)
+                        with _tracer.span("info_fetch"): detail = _read_detail_html(driver)
+                CLICK_TO_PANEL_SECONDS.observe(time.perf_counter() - clicked_at)
+                new_html, info_html = detail
+                print(f"🔎 Önceki panel uzunluğu: {prev_panel_len}, yeni uzunluğu: {len(new_html or '')}")
+                if new_html and len(new_html.strip()) > 50:
+                    # Bazı sayfalarda müşteri bilgileri ayrı bir blokta (.order-details-info) olabilir.
+                    combined_html = (info_html or "") + new_html
+                    with _tracer.span("parse", bytes=len(combined_html)): parsed = _parse_detail_panel_html(combined_html)
+                    # çıktı ver
+                    print("\n===== DETAY (panel) =====")
+                    title_preview = (txt[:120] + "...") if len(txt) > 120 else txt
+                    print("Kart başlığı:", title_preview)
+                    # Yeni: Sipariş bilgileri (müşteri / adres / sipariş no vb.)
+                    if parsed.get("customer_info"):
+                        print("Sipariş Bilgileri:")
+                        for k, v in parsed["customer_info"].items():  print(f"  {k}: {v}")
+                    if parsed.get("delivery_type"):
+                        print("Teslimat Tipi:", parsed["delivery_type"])
+                    if parsed.get("payment_method"): print("Ödeme Yöntemi:", parsed["payment_method"])
+
+                    if parsed.get("note"):  print("Sipariş Notu:", parsed["note"])
+                    for it in parsed["items"]:  print(f"- {it['name']}  x{it['qty']}  {it['price']}")
+                    if parsed["totals"]:
+                        print("Toplamlar:")
+                        for k, v in parsed["totals"].items(): print(f"  {k}: {v}")
+                    print("=========================\n")
+                    # log to file and save snapshot
+                    with _tracer.span("log"):
+                        try:
+                            _log_processed_order(parsed, title_preview, store)
+                        except Exception as e:
+                            print(f"Logging hata: {e}")
+                    with _tracer.span("snapshot"): _save_html_snapshot(driver, prefix="detail")
+                    # İşlendikten sonra hash anahtarı ile işaretle
+                    clicked_cards.add(key)
+                    prev_panel_html, prev_panel_len, clicked = new_html, len(new_html), clicked+1
+                    order_span.set(result="ok")
+                else:
+                    print("⚠️ Detay paneli yüklenemedi veya anlamlı içerik yok.")
+                    order_span.set(result="empty_panel")
+                    time.sleep(0.4)  # kısa bekleme
+                with _tracer.span("settle"): time.sleep(0.35)
+            except (StaleElementReferenceException, NoSuchElementException):
+                order_span.set(result="stale")
+                continue
+            except Exception as e:
+                order_span.set(result="error", error=type(e).__name__)
+                print(f"click_new_order_cards genel hata: {e}")
                 continue
-            # detay panelin yüklenmesini bekle
-            new_html = _wait_for_detail_panel_change(driver, prev_panel_html, timeout=8.0)
-            if not new_html:
-                # fallback: kısa bekleme sonrası panelin outerHTML'ini al
-                time.sleep(0.6)
-                try:
-                    panel = driver.find_element(By.CSS_SELECTOR, DETAIL_PANEL_SELECTOR)
-                    new_html = panel.get_attribute("outerHTML") or ""
-                except Exception:  new_html = ""
-            print(f"🔎 Önceki panel uzunluğu: {len(prev_panel_html or '')}, yeni uzunluğu: {len(new_html or '')}")
-            if new_html and len(new_html.strip()) > 50:
-                # Bazı sayfalarda müşteri bilgileri ayrı bir blokta (.order-details-info) olabilir.
-                try:
-                    info_el = driver.find_element(By.CSS_SELECTOR, ".order-details-info")
-                    info_html = info_el.get_attribute("outerHTML") or ""
-                except Exception:
-                    info_html = ""
-                combined_html = (info_html or "") + new_html
-                parsed = _parse_detail_panel_html(combined_html)
-                # çıktı ver
-                print("\n===== DETAY (panel) =====")
-                title_preview = (txt[:120] + "...") if len(txt) > 120 else txt
-                print("Kart başlığı:", title_preview)
-                # Yeni: Sipariş bilgileri (müşteri / adres / sipariş no vb.)
-                if parsed.get("customer_info"):
-                    print("Sipariş Bilgileri:")
-                    for k, v in parsed["customer_info"].items():  print(f"  {k}: {v}")
-                if parsed.get("delivery_type"):
-                    print("Teslimat Tipi:", parsed["delivery_type"])
-                if parsed.get("payment_method"): print("Ödeme Yöntemi:", parsed["payment_method"])
-
-                if parsed.get("note"):  print("Sipariş Notu:", parsed["note"])
-                for it in parsed["items"]:  print(f"- {it['name']}  x{it['qty']}  {it['price']}")
-                if parsed["totals"]:
-                    print("Toplamlar:")
-                    for k, v in parsed["totals"].items(): print(f"  {k}: {v}")
-                print("=========================\n")
-                # log to file and save snapshot
-                try:
-                    _log_processed_order(parsed, title_preview)
-                except Exception as e:
-                    print(f"Logging hata: {e}")
-                _save_html_snapshot(driver, prefix="detail")
-                # İşlendikten sonra hash anahtarı ile işaretle
-                _clicked_cards.add(key)
-                prev_panel_html, clicked = new_html, clicked+1
-            else:
-                print("⚠️ Detay paneli yüklenemedi veya anlamlı içerik yok.")
-                time.sleep(0.4)  # kısa bekleme
-            time.sleep(0.35)
-        except (StaleElementReferenceException, NoSuchElementException):  continue
-        except Exception as e:
-            print(f"click_new_order_cards genel hata: {e}")
-            continue
     return clicked
 
 
 
 
-def _loop_step(driver) -> str | None:
-    """  Tek döngü adımı: yeni kartlara tıkla, detay panelini işle. """
-    if not driver: return "Driver yok"
-    current_url = driver.current_url or ""
-    clicks = 0
-    if DETAILS_KEYWORD in current_url:  clicks = _click_new_order_cards(driver)
-    msg_parts = []
-    if clicks: msg_parts.append(f"{clicks} kart işlendi (Toplam tıklanan: {len(_clicked_cards)})")
-    # Periyodik liste snapshot (örn. her 30 sn)
-    if int(time.time()) % 30 == 0 and DETAILS_KEYWORD not in current_url: _save_html_snapshot(driver, prefix="list")
-    return " | ".join(msg_parts) if msg_parts else None
+def _loop_step(driver, store: Optional[StoreMonitor] = None) -> tuple[str | None, int]:
+    """  Tek döngü adımı: yeni kartlara tıkla, detay panelini işle. (durum mesajı, işlenen sipariş sayısı) döner. """
+    if not driver: return "Driver yok", 0
+    store = store or _primary_store
+    with _tracer.span("loop_step", cat="loop", store=store.store_id) as step_span:
+        with _tracer.span("activate", cat="loop"): store.activate(driver)
+        with _tracer.span("current_url", cat="loop"): current_url = driver.current_url or ""
+        clicks = captured = 0
+        msg_parts = []
+        if settings.capture_mode == "network":
+            # XHR yanıtlarından oku; tıklama/scroll yok. Performance log tüm sekmeler için ortak -> birincil mağaza okur ve dağıtır
+            if store.primary:
+                with _tracer.span("network_step", cat="loop"): captured = _network_step()
+            if captured: msg_parts.append(f"{captured} sipariş ağdan yakalandı")
+        elif DETAILS_KEYWORD in current_url:  clicks = _click_new_order_cards(driver, current_url, store)
+        if clicks: msg_parts.append(f"{clicks} kart işlendi (Toplam tıklanan: {len(store.clicked_cards)})")
+        step_span.set(orders=clicks + captured)
+    return (" | ".join(msg_parts) if msg_parts else None), clicks + captured
+
+
+def _store_for_url(url: str) -> StoreMonitor:
+    """Mağaza kimliği URL yolunda tam bir segment ya da bir sorgu parametresi değeri olarak geçen mağaza (yoksa birincil)."""
+    parts = urlsplit(url)
+    tokens = set(parts.path.split("/")) | {v for _, v in parse_qsl(parts.query)}
+    return next((st for st in _stores if st.store_id in tokens), _primary_store)
+
+
+def _network_step() -> int:
+    """Yakalanan yanıtları URL'deki mağaza kimliğine göre ilgili mağazaya yönlendirir (eşleşmezse birincil)."""
+    captured = 0
+    for resp in browser_manager.drain_network_responses(settings.order_api_url_patterns):
+        target = _store_for_url(resp["url"])
+        captured += process_network_orders(
+            browser_manager, target.clicked_cards, lambda p, t, st=target: _log_processed_order(p, t, st), responses=[resp]
+        )
+    if captured: _report_first_card()
+    return captured
+
+
+def _list_snapshot_job(driver) -> None:
+    """Periyodik liste snapshot'ı (detay sayfasında değilken)."""
+    if driver and DETAILS_KEYWORD not in (driver.current_url or ""): _save_html_snapshot(driver, prefix="list")
+
+
+def _build_scheduler() -> Scheduler:
+    """Periyodik işler: aralıklar settings üzerinden ayarlanır."""
+    scheduler = Scheduler()
+    if settings.list_snapshot_interval > 0: scheduler.add_job("list_snapshot", settings.list_snapshot_interval, _list_snapshot_job)
+    return scheduler
+
+
+def _store_step(driver, store: StoreMonitor) -> tuple[str | None, int]:
+    """Mağaza sekmesinde döngü adımı + vakti gelen periyodik işler (tek executor komutu -> sekme karışmaz)."""
+    result = _loop_step(driver, store)
+    if store.scheduler: store.scheduler.run_due(driver)
+    return result
+
+
+def _open_store_tabs(driver) -> int:
+    """
+    Sekmesi oturumda olmayan mağazaları açar (önce sahipsiz sekmeleri kullanır); açılan sekme sayısını döner.
+    Oturum korunarak kurtarıldıysa yaşayan sekmeler (ve sayfa durumları) olduğu gibi kalır.
+    """
+    global _active_handle
+    handles = list(driver.window_handles)
+    spare = [h for h in handles if h not in {st.handle for st in _stores}]
+    _active_handle = None  # kurtarma sonrası odak bilinmiyor: ilk activate() sekmeye geçer
+    opened = 0
+    for store in _stores:
+        if store.handle in handles: continue
+        store.open(driver, spare.pop(0) if spare else None)
+        opened += 1
+    return opened
 
 
 
@@ -339,52 +674,203 @@ def _loop_step(driver) -> str | None:
 
 
 # ================== ASYNC ANA ==================
-async def async_main():
+class _RunState:
+    """Mağaza görevlerinin paylaştığı durum: tek driver, tek kurtarma."""
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.generation = 0
+        self.stopping = False
+
+
+async def _recover_browser(state: _RunState, seen_generation: int) -> bool:
+    """
+    Önce yaşayan oturuma/chromedriver'a yeniden bağlanmayı dener, son çare tam yeniden başlatma
+    (BrowserManager.recover). Kaybolan mağaza sekmeleri yeniden açılır; dedup indeksleri korunur.
+    Başka bir görev zaten kurtardıysa bir şey yapmaz. Kurtarma süreleri RECOVERY_LOG'a yazılır.
+    """
+    async with state.lock:
+        if state.generation != seen_generation: return True
+        print("🔄 Kurtarılıyor...")
+        start = time.perf_counter()
+        method = await browser_manager.recover()
+        ok, reopened = method is not None, 0
+        if ok and method in ("new_session", "relaunch") and settings.capture_mode == "network":
+            await browser_manager.executor.run(browser_manager.enable_network_capture, priority=PRIORITY_HEALTH)
+        if ok:
+            try: reopened = await browser_manager.executor.run(_open_store_tabs, browser_manager.driver)
+            except Exception as e:
+                print(f"❌ Sekmeler açılamadı: {e}")
+                ok = False
+        state.generation += 1
+        elapsed = time.perf_counter() - start
+        RESTARTS.inc(method=method if ok else "failed")
+        if not ok:
+            print(f"❌ Kurtarma başarısız ({elapsed:.2f} s).")
+            return False
+        _recovery_times.append(elapsed)
+        mttr = sum(_recovery_times) / len(_recovery_times)
+        print(f"✅ Kurtarıldı: {method}, {elapsed:.2f} s, {reopened} sekme yeniden açıldı (MTTR: {mttr:.2f} s / {len(_recovery_times)} kurtarma)")
+        record = {"ts": datetime.now().isoformat(timespec="seconds"), "method": method, "seconds": round(elapsed, 3), "reopened_tabs": reopened, "mttr": round(mttr, 3)}
+        output_writer.append(RECOVERY_LOG, json.dumps(record) + "\n")
+        return True
+
+
+async def _run_store(store: StoreMonitor, state: _RunState) -> None:
+    """Bir mağazanın döngüsü; diğer mağazalarla aynı driver yürütücüsünü paylaşır."""
+    from selenium.common.exceptions import WebDriverException
+    store.scheduler = _build_scheduler()
+    while not state.stopping:
+        generation = state.generation
+        try:
+            # WebDriver I/O driver'ın kendi thread'inde; event loop serbest kalır
+            with LOOP_ITERATION_SECONDS.time(store=store.store_id):
+                status, activity = await browser_manager.executor.run(_store_step, browser_manager.driver, store, priority=PRIORITY_BULK)
+            if activity: ORDERS_PROCESSED.inc(activity, store=store.store_id)
+            if status:  print(f"[{datetime.now().strftime('%H:%M:%S')}] {store.label}{status}")
+            # yoğunken kısa aralık, boştayken üstel geri çekilme; periyodik işler kaçırılmaz
+            await asyncio.sleep(min(store.poller.next_delay(activity), store.scheduler.time_until_next()))
+        except WebDriverException as e:
+            LOOP_ERRORS.inc(store=store.store_id, kind="webdriver")
+            print(f"💥 {store.label}WebDriverException: {e}")
+            if not await _recover_browser(state, generation):
+                state.stopping = True
+                break
+        except Exception as e:
+            LOOP_ERRORS.inc(store=store.store_id, kind="other")
+            print(f"{store.label}Genel hata: {e}")
+            await asyncio.sleep(5)
+
+
+async def _export_metrics(state: _RunState) -> None:
+    """metrics_interval saniyede bir metrikleri Prometheus metin dosyasına yazar."""
+    path = settings.metrics_file or os.path.join(SAVE_DIR, "metrics.prom")
+    while not state.stopping:
+        await asyncio.sleep(settings.metrics_interval)
+        try: await asyncio.to_thread(_metrics.write_file, path)
+        except Exception as e: print(f"⚠️ Metrik dosyası yazılamadı: {e}")
+
+
+async def _export_trace(state: _RunState) -> None:
+    """trace_interval saniyede bir span'leri Chrome trace JSON'una yazar (süreç çökse de iz kalır)."""
+    while not state.stopping:
+        await asyncio.sleep(settings.trace_interval)
+        try: await asyncio.to_thread(_tracer.write, settings.trace_file)
+        except Exception as e: print(f"⚠️ Trace dosyası yazılamadı: {e}")
+
+
+async def async_main(targets: Optional[List[str]] = None):
+    """targets (veya settings.store_targets) içindeki her mağaza ayrı sekmede, eşzamanlı izlenir."""
+    global _stores
+    _init_state()
+    targets = targets or settings.store_targets or [TARGET_URL]
+    _primary_store.url, _primary_store.store_id = targets[0], _store_id(targets[0])
+    _stores = [_primary_store] + [StoreMonitor(url) for url in targets[1:]]
+    _startup.clear()
+    _startup["t0"] = time.perf_counter()
+
     print("🎨 ScrapyBridge başlatılıyor...")
     print("🌐 Browser başlatılıyor...")
     if not await browser_manager.initialize_browser():
         print("❌ Browser başlatılamadı!")
         return
+    _mark_startup("browser")
     print("✅ Browser başarıyla başlatıldı!")
+    if settings.capture_mode == "network": await browser_manager.executor.run(browser_manager.enable_network_capture, priority=PRIORITY_HEALTH)
 
-    print(f"🔍 {TARGET_URL} sayfasına yönlendiriliyor...")
-    if not await browser_manager.navigate_to_url(TARGET_URL):
-        print(f"❌ {TARGET_URL} yüklenemedi!")
+    for store in _stores: print(f"🔍 {store.url} sayfasına yönlendiriliyor...")
+    try: await browser_manager.executor.run(_open_store_tabs, browser_manager.driver)
+    except Exception as e:
+        print(f"❌ Sayfa yüklenemedi: {e}")
+        await browser_manager.close_browser()
         return
-    print("✅ Sayfa yüklendi!")
+    _mark_startup("page")
+    print(f"✅ Sayfa yüklendi! ({len(_stores)} mağaza)")
 
     print("\n🔄 Döngü başlıyor. Çıkmak için Ctrl+C ...")
+    state = _RunState()
+    exporter = asyncio.create_task(_export_metrics(state)) if settings.metrics_interval > 0 else None
+    metrics_server = serve_metrics(settings.metrics_port) if settings.metrics_port else None
+    trace_exporter = asyncio.create_task(_export_trace(state)) if _tracer.enabled and settings.trace_interval > 0 else None
+    try:
+        await asyncio.gather(*(_run_store(store, state) for store in _stores))
+    except KeyboardInterrupt:
+        print("\n🛑 Kullanıcı durdurdu.")
+    finally:
+        # Ctrl+C / iptal durumunda da bekleyen yazımlar boşaltılır
+        state.stopping = True
+        if exporter: exporter.cancel()
+        if metrics_server: metrics_server.shutdown()
+        if settings.metrics_interval > 0:
+            try: _metrics.write_file(settings.metrics_file or os.path.join(SAVE_DIR, "metrics.prom"))
+            except Exception as e: print(f"⚠️ Metrik dosyası yazılamadı: {e}")
+        if trace_exporter: trace_exporter.cancel()
+        print("\n🔚 Browser kapatılıyor...")
+        await browser_manager.close_browser()
+        await asyncio.to_thread(get_browser_pool().close)
+        print("💾 Bekleyen yazımlar tamamlanıyor...")
+        await asyncio.get_event_loop().run_in_executor(None, output_writer.close)
+        # writer thread'i boşaldıktan sonra: bekleyen snapshot_write span'leri de dosyaya girer
+        if _tracer.enabled:
+            try: print(f"🧵 Trace yazıldı: {settings.trace_file} ({_tracer.write(settings.trace_file)} olay)")
+            except Exception as e: print(f"⚠️ Trace dosyası yazılamadı: {e}")
+        snapshot_store.close()
+        for store in _stores: store.close()
+        _clicked_cards.close()
+        _processed_detail_urls.close()
+        print("✅ Temizlik tamamlandı!")
+
+
+
+# ================== ÇOKLU MAĞAZA BENCHMARK ==================
+def _bench_cycle(driver, stores: List[StoreMonitor]) -> List[float]:
+    """Her mağaza için tek bir yoklama maliyeti: sekme değişimi + kart taraması (tıklama yok)."""
+    timings = []
+    for store in stores:
+        start = time.perf_counter()
+        store.activate(driver)
+        _scan_cards(driver, driver.current_url or "")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def benchmark_stores(urls: List[str], max_stores: int = 8, rounds: int = 20) -> None:
+    """1..max_stores sekmede, tek Chrome'un tüm mağazaları bir kez yoklama süresini (polling gecikmesi) ölçer."""
+    global _stores
+    _init_state()
+    if not await browser_manager.initialize_browser():
+        print("❌ Browser başlatılamadı!")
+        return
     driver = browser_manager.driver
-    while True:
-        try:
-            status = _loop_step(driver)
-            if status:  print(f"[{datetime.now().strftime('%H:%M:%S')}] {status}")
-            await asyncio.sleep(4)
-        except KeyboardInterrupt:
-            print("\n🛑 Kullanıcı durdurdu.")
-            break
-        except WebDriverException as e:
-            print(f"💥 WebDriverException: {e}")
-            print("🔄 Yeniden başlatılıyor...")
-            await browser_manager.close_browser()
-            await asyncio.sleep(2)
-            if await browser_manager.initialize_browser() and await browser_manager.navigate_to_url(TARGET_URL):
-                print("✅ Yeniden başlatıldı.")
-            else:
-                print("❌ Yeniden başlatma başarısız.")
-                break
-        except Exception as e:
-            print(f"Genel hata: {e}")
-            await asyncio.sleep(5)
+    try:
+        opened: List[StoreMonitor] = []
+        print(f"{'mağaza':>7} {'tur ort. ms':>12} {'tur p95 ms':>11} {'mağaza başı ms':>15}")
+        for n in range(1, max_stores + 1):
+            store = StoreMonitor(urls[(n - 1) % len(urls)], primary=(n == 1))
+            _stores = opened + [store]
+            await browser_manager.executor.run(store.open, driver, driver.current_window_handle if n == 1 else None)
+            opened.append(store)
+            cycles = []
+            for _ in range(rounds):
+                per_store = await browser_manager.executor.run(_bench_cycle, driver, opened)
+                cycles.append(sum(per_store))
+            cycles.sort()
+            mean = sum(cycles) / len(cycles)
+            p95 = cycles[min(len(cycles) - 1, int(len(cycles) * 0.95))]
+            print(f"{n:>7} {mean * 1000:>12.1f} {p95 * 1000:>11.1f} {mean * 1000 / n:>15.1f}")
+    finally:
+        for store in opened: store.close()
+        await browser_manager.close_browser()
 
-    print("\n🔚 Browser kapatılıyor...")
-    await browser_manager.close_browser()
-    print("✅ Temizlik tamamlandı!")
 
 def main():
     asyncio.run(async_main())
 
 if __name__ == "__main__":
+    import sys
     os.chdir(os.path.dirname(os.path.abspath(__file__)).replace("src", ""))
     print("Çalışma dizini:", os.getcwd(), "\n")
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench-stores":
+        # python -m src.main --bench-stores [N] [url ...]
+        n = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+        asyncio.run(benchmark_stores(sys.argv[3:] or settings.store_targets or [TARGET_URL], max_stores=n))
+    else: main()
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - METRICS REGISTRY
+===========================================================
+
+Description:
+    Sipariş hattı için bağımlılıksız sayaç / histogram kaydı ve
+    Prometheus metin formatında dışa aktarım:
+        - Dosya   : settings.metrics_file (boşsa SAVE_DIR/metrics.prom),
+                    metrics_interval saniyede bir atomik yazılır
+                    (node_exporter textfile collector ile okunabilir)
+        - Endpoint: settings.metrics_port > 0 ise
+                    http://127.0.0.1:<port>/metrics ; servis
+                    (python -m src.service) ayrıca /metrics sunar
+
+    Kullanım:
+        SCAN = get_metrics().histogram("scrap_card_scan_seconds", "Kart tarama süresi")
+        with SCAN.time(): ...
+        RESTARTS = get_metrics().counter("scrap_restarts_total", "Kurtarmalar", ["method"])
+        RESTARTS.inc(method="reattach")
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import bisect, contextlib, logging, os, threading, time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra: parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _le(bound: float) -> str: return 'le="' + _num(bound) + '"'
+
+def _num(value: float) -> str:
+    if value == float("inf"): return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames): raise ValueError(f"{self.name}: etiketler {self.labelnames} olmalı, gelen {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        # azalan sayaç Prometheus'ta sıfırlanma (restart) olarak yorumlanır
+        if amount < 0: raise ValueError(f"{self.name}: sayaç azaltılamaz (amount={amount})")
+        key = self._key(labels)
+        with self._lock: self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock: return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock: items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items)
+        return lines
+
+
+
+class Histogram(_Metric):
+    """Kümülatif kovalı süre / boyut histogramı (Prometheus semantiği)."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}  # key -> [kova sayıları..., toplam, adet]
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None: series = self._series[key] = [0] * (len(self.buckets) + 2)
+            if i < len(self.buckets): series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextlib.contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """with hist.time(): ... bloğun süresini (saniye) gözlemler; hata olsa da kaydedilir."""
+        start = time.perf_counter()
+        try: yield
+        finally: self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels: str) -> dict:
+        with self._lock: series = list(self._series.get(self._key(labels)) or [0] * (len(self.buckets) + 2))
+        return {"count": series[-1], "sum": series[-2]}
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock: items = sorted((k, list(v)) for k, v in self._series.items())
+        for key, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, _le(bound))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, _le(float('inf')))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {series[-1]}")
+        return lines
+
+
+
+class MetricsRegistry:
+    """Ada göre tekil metrikler; render() Prometheus metin formatı (0.0.4) üretir."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None: metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls): raise ValueError(f"{name} zaten {metric.kind} olarak kayıtlı")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets)
+
+    def render(self) -> str:
+        with self._lock: metrics = [self._metrics[n] for n in sorted(self._metrics)]
+        lines: List[str] = []
+        for metric in metrics: lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path: str) -> None:
+        """Atomik yazım (yarım dosya okunmasın): önce .tmp, sonra os.replace."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f: f.write(self.render())
+        os.replace(tmp, path)
+
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_metrics() -> MetricsRegistry:
+    """MetricsRegistry nesnesini döner, yoksa oluşturur."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None: _registry = MetricsRegistry()
+    return _registry
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def serve_metrics(port: int, host: str = "127.0.0.1"):
+    """GET /metrics sunan arka plan HTTP sunucusunu başlatır; sunucu nesnesini döner (shutdown() ile kapatılır)."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args): pass
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = get_metrics().render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Metrikler: http://{host}:{server.server_address[1]}/metrics")
+    return server
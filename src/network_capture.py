@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - NETWORK ORDER CAPTURE
+===========================================================
+
+Description:
+    Sipariş detaylarını panel DOM'undan değil, dashboard'un XHR
+    yanıtlarından okur. BrowserManager.drain_network_responses()
+    ile gelen JSON gövdeleri _parse_detail_panel_html() çıktısıyla
+    aynı şekle dönüştürülür ve aynı çıktı yoluna (_log_processed_order)
+    verilir. Tıklama, scroll veya DOM kazıma yoktur.
+
+    Yerel deneme (sahte sipariş listesi + detay JSON sunan sunucu):
+        python -m src.network_capture
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import json, logging, hashlib
+from typing import Any, Callable, Dict, Iterator, List, MutableSet, Optional
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Panel çıktısındaki başlık -> JSON'da aranacak alan yolları (ilk dolu olan kullanılır)
+_INFO_FIELDS = {
+    "Sipariş No": ("orderNumber", "orderNo", "orderId", "id"),
+    "Müşteri": ("customerName", "customer.name", "customer.fullName"),
+    "Telefon": ("customerPhone", "customer.phone", "phone"),
+    "Adres": ("address.fullAddress", "address.address", "deliveryAddress.address", "customer.address", "address"),
+    "İl/İlçe": ("address.district", "deliveryAddress.district"),
+}
+_ITEM_LISTS = ("items", "lines", "products", "orderItems", "orderLines")
+_ITEM_NAME = ("name", "productName", "title", "product.name")
+_ITEM_QTY = ("quantity", "count", "qty", "amount")
+_ITEM_PRICE = ("totalPrice", "price", "unitPrice", "total")
+_NOTE = ("note", "orderNote", "customerNote")
+_PAYMENT = ("paymentMethod", "paymentType", "payment.type", "payment.name")
+_DELIVERY = ("deliveryType", "deliveryMethod", "delivery.type")
+_TOTALS = {"Sipariş Tutarı": ("subTotal", "subtotal", "basketTotal"), "Toplam": ("totalPrice", "totalAmount", "total")}
+# Liste yanıtlarında siparişleri saran anahtarlar
+_WRAPPERS = ("orders", "content", "data", "items", "results")
+
+
+
+def _dig(obj: Any, path: str) -> Any:
+    for part in path.split("."):
+        if not isinstance(obj, dict): return None
+        obj = obj.get(part)
+    return obj
+
+def _first(obj: Any, paths) -> Any:
+    for p in paths:
+        v = _dig(obj, p)
+        if v not in (None, "", [], {}): return v
+    return None
+
+def _as_text(v: Any) -> str:
+    if v is None: return ""
+    if isinstance(v, dict): return " ".join(_as_text(x) for x in v.values() if x not in (None, ""))
+    return " ".join(str(v).split())
+
+def _looks_like_order(obj: Any) -> bool:
+    return isinstance(obj, dict) and _first(obj, _INFO_FIELDS["Sipariş No"]) is not None
+
+
+def iter_orders(payload: Any) -> Iterator[dict]:
+    """Liste veya tekil detay yanıtından sipariş nesnelerini çıkarır."""
+    if isinstance(payload, list):
+        for x in payload: yield from iter_orders(x)
+    elif isinstance(payload, dict):
+        if _looks_like_order(payload):
+            yield payload
+            return
+        for key in _WRAPPERS:
+            if key in payload: yield from iter_orders(payload[key])
+
+
+def order_from_payload(raw: dict) -> dict:
+    """Ham sipariş JSON'unu _parse_detail_panel_html() ile aynı şekle dönüştürür."""
+    result = {"items": [], "note": None, "totals": {}, "customer_info": {}, "delivery_type": None, "payment_method": None}
+    for title, paths in _INFO_FIELDS.items():
+        v = _first(raw, paths)
+        if v is not None: result["customer_info"][title] = _as_text(v)
+    items = _first(raw, _ITEM_LISTS) or []
+    for it in items if isinstance(items, list) else []:
+        name, qty, price = _as_text(_first(it, _ITEM_NAME)), _as_text(_first(it, _ITEM_QTY)), _as_text(_first(it, _ITEM_PRICE))
+        if not name and not price: continue
+        result["items"].append({"name": name, "qty": qty, "price": price})
+    for title, paths in _TOTALS.items():
+        v = _first(raw, paths)
+        if v is not None: result["totals"][title] = _as_text(v)
+    note = _first(raw, _NOTE)
+    if note: result["note"] = _as_text(note)
+    pay = _first(raw, _PAYMENT)
+    if pay: result["payment_method"] = _as_text(pay)
+    dlv = _first(raw, _DELIVERY)
+    if dlv: result["delivery_type"] = _as_text(dlv)
+    return result
+
+
+def order_key(parsed: dict) -> Optional[str]:
+    """Sipariş numarasından kalıcı dedup anahtarı (kart anahtarıyla aynı uzunlukta)."""
+    no = parsed.get("customer_info", {}).get("Sipariş No")
+    if not no: return None
+    return hashlib.sha256(f"order|{no}".encode("utf-8", "ignore")).hexdigest()[:16]
+
+def title_preview(parsed: dict) -> str:
+    info = parsed.get("customer_info", {})
+    return " ".join(x for x in (info.get("Sipariş No"), info.get("Müşteri")) if x) or "Sipariş"
+
+
+def process_network_orders(manager, seen: MutableSet[str], on_order: Callable[[dict, str], None], url_patterns: Optional[List[str]] = None, responses: Optional[List[dict]] = None) -> int:
+    """
+    Yakalanan yanıtlardaki yeni siparişleri on_order(parsed, title_preview) ile işler.
+    Ürün içermeyen özet kayıtlar (liste yanıtı) detay yanıtı gelene kadar bekletilir.
+    responses verilirse manager'dan okunmaz (önceden okunup dağıtılan yanıtlar).
+    """
+    processed = 0
+    if responses is None: responses = manager.drain_network_responses(url_patterns or settings.order_api_url_patterns)
+    for resp in responses:
+        try: payload = json.loads(resp["body"])
+        except Exception: continue
+        for raw in iter_orders(payload):
+            parsed = order_from_payload(raw)
+            key = order_key(parsed)
+            if not key or key in seen or not parsed["items"]: continue
+            try: on_order(parsed, title_preview(parsed))
+            except Exception as e: logger.error(f"Sipariş işlenemedi ({resp['url']}): {e}")
+            seen.add(key)
+            processed += 1
+    return processed
+
+
+
+# ================== YEREL DENEME SUNUCUSU ==================
+_FAKE_ORDERS = [
+    {"orderNumber": "1001", "customer": {"name": "Ali Veli", "phone": "5550000001"}, "address": {"fullAddress": "Moda Cd. 1", "district": "Kadıköy"},
+     "paymentMethod": "Kredi Kartı", "deliveryType": "Restoran Teslimat", "note": "Zili çalmayın",
+     "items": [{"name": "Lahmacun", "quantity": 2, "totalPrice": "120 TL"}, {"name": "Ayran", "quantity": 1, "totalPrice": "20 TL"}],
+     "subTotal": "140 TL", "totalPrice": "140 TL"},
+    {"orderNumber": "1002", "customer": {"name": "Ayşe Yılmaz"}, "address": {"fullAddress": "Bağdat Cd. 5"},
+     "paymentMethod": "Nakit", "items": [{"name": "Pide", "quantity": 1, "totalPrice": "90 TL"}], "totalPrice": "90 TL"},
+]
+
+_FAKE_PAGE = """<!doctype html><html><body><div id="list"></div><script>
+async function tick() {
+  const orders = await (await fetch('/api/orders')).json();
+  document.getElementById('list').textContent = orders.map(o => o.orderNumber).join(', ');
+  for (const o of orders) await fetch('/api/orders/' + o.orderNumber);
+}
+tick(); setInterval(tick, 2000);
+</script></body></html>"""
+
+
+def serve_fake_dashboard(port: int = 0):
+    """Sahte sipariş listesi (/api/orders) ve detay (/api/orders/<no>) sunan yerel sunucu. (server, url) döner."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args): pass
+
+        def _send(self, status: int, body: str, ctype: str) -> None:
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/": return self._send(200, _FAKE_PAGE, "text/html; charset=utf-8")
+            if self.path == "/api/orders":
+                summary = [{"orderNumber": o["orderNumber"], "customerName": o["customer"]["name"]} for o in _FAKE_ORDERS]
+                return self._send(200, json.dumps(summary), "application/json")
+            if self.path.startswith("/api/orders/"):
+                no = self.path.rsplit("/", 1)[-1]
+                order = next((o for o in _FAKE_ORDERS if o["orderNumber"] == no), None)
+                if order: return self._send(200, json.dumps(order), "application/json")
+            self._send(404, "{}", "application/json")
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+async def _demo(rounds: int = 3) -> None:
+    """Sahte dashboard'u Chrome ile açar; çıktılar geçici dizine yazılır (gerçek SAVE_DIR / indeks kirlenmez)."""
+    import asyncio, glob, os, tempfile
+    import src.main as app
+    from src.browser_manager import get_browser_manager
+    from src.driver_executor import PRIORITY_HEALTH
+
+    settings.capture_mode = "network"
+    with tempfile.TemporaryDirectory(prefix="scrap_demo_") as tmp:
+        app.SAVE_DIR, app._INDEX_PATH = tmp, os.path.join(tmp, "processed_orders.sqlite3")
+        app._init_state()
+        server, url = serve_fake_dashboard()
+        manager = get_browser_manager()
+        try:
+            # WebDriver I/O yalnızca yürütücü thread'inde (event loop bloklanmaz)
+            if not await manager.initialize_browser() or not await manager.executor.run(manager.enable_network_capture, priority=PRIORITY_HEALTH):
+                print("❌ Browser başlatılamadı!")
+                return
+            await manager.navigate_to_url(url)
+            seen: set = set()
+            for _ in range(rounds):
+                await asyncio.sleep(2.5)
+                n = await manager.executor.run(process_network_orders, manager, seen, app._log_processed_order)
+                print(f"🌐 {n} yeni sipariş yakalandı (toplam: {len(seen)})")
+        finally:
+            await manager.close_browser()
+            server.shutdown()
+            # geçici dizin silinmeden önce yazıcı boşaltılır ve dosyalar kapatılır
+            app.output_writer.close()
+            app.snapshot_store.close()
+            app._primary_store.close()
+            app._clicked_cards.close()
+            app._processed_detail_urls.close()
+            for path in glob.glob(os.path.join(tmp, "siparisler*.txt")):
+                with open(path, encoding="utf-8") as f: print(f.read())
+
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(_demo())
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - STRUCTURED ORDER EXPORT
+===========================================================
+
+Description:
+    İşlenen her sipariş için bir JSON nesnesi, günlük ve boyut
+    bazlı dönen JSONL dosyalarına yazılır (SAVE_DIR/orders/).
+    Alt araçlar siparisler.txt'yi yeniden ayrıştırmak zorunda kalmaz.
+
+    Ek araçlar:
+        python -m src.order_export import [siparisler.txt]   -> eski metin kayıtlarını JSONL'e aktar
+        python -m src.order_export columnar [çıktı]          -> tüm JSONL'leri sütunsal formata dönüştür
+
+    Sütunsal çıktı pyarrow kuruluysa Parquet, değilse sütun başına
+    liste tutan sıkıştırılmış JSON'dur (numpy/pandas ile doğrudan
+    DataFrame / dizi oluşturulabilir).
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import glob, gzip, json, logging, os, re
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+
+
+def order_record(parsed: dict, title_preview: str, ts: Optional[datetime] = None, source: str = "panel") -> dict:
+    """_parse_detail_panel_html çıktısını düz, şemalı bir kayda dönüştürür."""
+    ts = ts or datetime.now()
+    info = parsed.get("customer_info") or {}
+    return {
+        "v": SCHEMA_VERSION,
+        "ts": ts.isoformat(timespec="seconds"),
+        "source": source,
+        "title": title_preview,
+        "order_no": info.get("Sipariş No") or info.get("Sipariş Numarası"),
+        "customer_info": info,
+        "delivery_type": parsed.get("delivery_type"),
+        "payment_method": parsed.get("payment_method"),
+        "note": parsed.get("note"),
+        "items": parsed.get("items") or [],
+        "totals": parsed.get("totals") or {},
+    }
+
+
+
+class RotatingJsonlWriter:
+    """orders-YYYYMMDD[-N].jsonl dosyalarına yazar; gün değişince veya max_bytes aşılınca yeni dosyaya geçer."""
+
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024, prefix: str = "orders") -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.prefix = prefix
+        os.makedirs(directory, exist_ok=True)
+
+    def _path_for(self, day: str, size_hint: int) -> str:
+        n = 0
+        while True:
+            name = f"{self.prefix}-{day}.jsonl" if n == 0 else f"{self.prefix}-{day}-{n}.jsonl"
+            path = os.path.join(self.directory, name)
+            if not os.path.exists(path) or os.path.getsize(path) + size_hint <= self.max_bytes: return path
+            n += 1
+
+    def line(self, record: dict) -> str:
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    def path_for(self, record: dict) -> str:
+        """Kaydın yazılacağı dosya (kaydın gününe ve mevcut boyuta göre)."""
+        day = (record.get("ts") or datetime.now().isoformat())[:10].replace("-", "")
+        return self._path_for(day, len(self.line(record).encode("utf-8")))
+
+    def write(self, record: dict) -> str:
+        path = self.path_for(record)
+        with open(path, "a", encoding="utf-8") as f: f.write(self.line(record))
+        return path
+
+
+def iter_file_records(path: str) -> Iterator[dict]:
+    """Tek JSONL dosyasının kayıtları (bozuk satırlar atlanır)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for ln in f:
+            ln = ln.strip()
+            if not ln: continue
+            try: yield json.loads(ln)
+            except json.JSONDecodeError: logger.warning(f"Bozuk JSONL satırı atlandı: {path}")
+
+def _file_order(path: str) -> tuple:
+    # orders-YYYYMMDD.jsonl, orders-YYYYMMDD-1.jsonl, ...: düz ad sıralaması "-1"i ana dosyanın önüne koyar
+    parts = os.path.basename(path)[:-len(".jsonl")].split("-")
+    return parts[0], parts[1] if len(parts) > 1 else "", int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 0
+
+def iter_records(directory: str) -> Iterator[dict]:
+    """Dizindeki tüm JSONL kayıtlarını yazılma sırasıyla (gün, sonra dönüş numarası) dolaşır."""
+    for path in sorted(glob.glob(os.path.join(directory, "*.jsonl")), key=_file_order): yield from iter_file_records(path)
+
+
+
+# ================== siparisler.txt İÇE AKTARMA ==================
+_HEADER_RE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (.*)$")
+_ITEM_RE = re.compile(r"^- (.*?)  x(.*?)  (.*)$")
+_SEP = "-" * 80
+
+def parse_text_log(path: str) -> Iterator[dict]:
+    """_log_processed_order'ın yazdığı metin bloklarını kayıtlara dönüştürür."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f: text = f.read()
+    for block in text.split(_SEP):
+        lines = [ln for ln in block.splitlines() if ln.strip()]
+        if not lines: continue
+        m = _HEADER_RE.match(lines[0])
+        if not m: continue
+        parsed = {"items": [], "note": None, "totals": {}, "customer_info": {}, "delivery_type": None, "payment_method": None}
+        section = None
+        for ln in lines[1:]:
+            if ln.startswith("-- ") and ln.endswith(" --"):
+                section = ln.strip("- ").strip()
+                continue
+            if section == "Ürünler" and (im := _ITEM_RE.match(ln)):
+                parsed["items"].append({"name": im.group(1), "qty": im.group(2), "price": im.group(3)})
+                continue
+            key, _, value = ln.partition(": ")
+            if key == "Teslimat Tipi": parsed["delivery_type"] = value
+            elif key == "Ödeme Yöntemi": parsed["payment_method"] = value
+            elif key == "Sipariş Notu": parsed["note"] = value
+            elif section == "Toplamlar": parsed["totals"][key] = value
+            elif section == "Müşteri Bilgileri": parsed["customer_info"][key] = value
+        yield order_record(parsed, m.group(2), ts=datetime.strptime(m.group(1), "%Y-%m-%d %H:%M:%S"), source="import")
+
+
+def import_text_log(text_path: str, directory: str) -> int:
+    """siparisler.txt içeriğini JSONL dizinine aktarır; daha önce aktarılan (ts+başlık) kayıtlar atlanır."""
+    seen = {(r.get("ts"), r.get("title")) for r in iter_records(directory)}
+    writer = RotatingJsonlWriter(directory)
+    count = 0
+    for rec in parse_text_log(text_path):
+        if (rec["ts"], rec["title"]) in seen: continue
+        writer.write(rec)
+        seen.add((rec["ts"], rec["title"]))
+        count += 1
+    return count
+
+
+
+# ================== SÜTUNSAL DIŞA AKTARMA ==================
+def _flat_columns(records: Iterable[dict]) -> dict:
+    cols: dict = {k: [] for k in ("ts", "source", "title", "order_no", "delivery_type", "payment_method", "note", "item_count", "total", "items_json", "customer_json")}
+    for r in records:
+        totals = r.get("totals") or {}
+        cols["ts"].append(r.get("ts"))
+        cols["source"].append(r.get("source"))
+        cols["title"].append(r.get("title"))
+        cols["order_no"].append(r.get("order_no"))
+        cols["delivery_type"].append(r.get("delivery_type"))
+        cols["payment_method"].append(r.get("payment_method"))
+        cols["note"].append(r.get("note"))
+        cols["item_count"].append(len(r.get("items") or []))
+        cols["total"].append(totals.get("Toplam") or next(iter(totals.values()), None))
+        cols["items_json"].append(json.dumps(r.get("items") or [], ensure_ascii=False))
+        cols["customer_json"].append(json.dumps(r.get("customer_info") or {}, ensure_ascii=False))
+    return cols
+
+def export_columnar(directory: str, out_path: Optional[str] = None) -> str:
+    """Tüm JSONL kayıtlarını Parquet (pyarrow varsa) ya da sütunsal .json.gz olarak yazar."""
+    cols = _flat_columns(iter_records(directory))
+    try:
+        import pyarrow, pyarrow.parquet as pq
+        out_path = out_path or os.path.join(directory, "orders.parquet")
+        pq.write_table(pyarrow.table(cols), out_path, compression="zstd")
+    except ImportError:
+        out_path = out_path or os.path.join(directory, "orders.columns.json.gz")
+        with gzip.open(out_path, "wt", encoding="utf-8") as f: json.dump({"schema": SCHEMA_VERSION, "columns": cols}, f, ensure_ascii=False)
+    logger.info(f"Sütunsal dışa aktarım: {out_path} ({len(cols['ts'])} kayıt)")
+    return out_path
+
+
+
+def _cli(argv: List[str]) -> None:
+    save_dir = os.path.join(os.path.expanduser("~"), "Desktop", "saveAl")
+    orders_dir = os.path.join(save_dir, "orders")
+    if not argv or argv[0] not in ("import", "columnar"):
+        print("Kullanım: python -m src.order_export import [siparisler.txt] | columnar [çıktı]")
+        return
+    if argv[0] == "import":
+        src_path = argv[1] if len(argv) > 1 else os.path.join(save_dir, "siparisler.txt")
+        print(f"📥 {import_text_log(src_path, orders_dir)} kayıt aktarıldı -> {orders_dir}")
+    else:
+        print(f"📦 Yazıldı: {export_columnar(orders_dir, argv[1] if len(argv) > 1 else None)}")
+
+
+if __name__ == "__main__":
+    import sys
+    _cli(sys.argv[1:])
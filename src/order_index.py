@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - PROCESSED ORDER INDEX
+===========================================================
+
+Description:
+    İşlenmiş kart / sipariş anahtarlarını diskte (SQLite) tutan,
+    bellekte sınırlı bir "sıcak" LRU kümesi barındıran set benzeri
+    indeks. Yeniden başlatmadan sonra daha önce işlenen siparişler
+    tekrar tıklanmaz / loglanmaz; çok günlük çalışmada bellek büyümez.
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import logging, os, sqlite3, threading, time
+from collections import OrderedDict
+from collections.abc import MutableSet
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+
+class ProcessedIndex(MutableSet):
+    """SQLite destekli, sıcak kümesi sınırlı, thread-safe set."""
+
+    def __init__(self, path: str, namespace: str = "cards", hot_size: int = 5000) -> None:
+        self.path = path
+        self.namespace = namespace
+        self.hot_size = max(1, hot_size)
+        self._hot: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed (namespace TEXT NOT NULL, key TEXT NOT NULL, ts REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+        )
+        self._count = self._conn.execute("SELECT COUNT(*) FROM processed WHERE namespace=?", (namespace,)).fetchone()[0]
+        # En son işlenenleri sıcak kümeye yükle (yeniden başlatmada ilk taramalar diske gitmesin)
+        rows = self._conn.execute(
+            "SELECT key FROM processed WHERE namespace=? ORDER BY ts DESC LIMIT ?", (namespace, self.hot_size)
+        ).fetchall()
+        for (key,) in reversed(rows): self._hot[key] = None
+        logger.info(f"Processed index yüklendi: {path} [{namespace}] ({self._count} kayıt)")
+
+    def _touch(self, key: str) -> None:
+        self._hot[key] = None
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_size: self._hot.popitem(last=False)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str): return False
+        with self._lock:
+            if key in self._hot:
+                self._hot.move_to_end(key)
+                return True
+            row = self._conn.execute("SELECT 1 FROM processed WHERE namespace=? AND key=?", (self.namespace, key)).fetchone()
+            if row: self._touch(key)
+            return row is not None
+
+    def add(self, key: str) -> None:
+        with self._lock:
+            cur = self._conn.execute("INSERT OR IGNORE INTO processed (namespace, key, ts) VALUES (?, ?, ?)", (self.namespace, key, time.time()))
+            if cur.rowcount: self._count += 1
+            self._touch(key)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM processed WHERE namespace=? AND key=?", (self.namespace, key))
+            if cur.rowcount: self._count -= 1
+            self._hot.pop(key, None)
+
+    def __len__(self) -> int: return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key FROM processed WHERE namespace=? ORDER BY ts", (self.namespace,)).fetchall()
+        return (key for (key,) in rows)
+
+    def close(self) -> None:
+        with self._lock:
+            try: self._conn.close()
+            except Exception as e: logger.debug(f"Processed index kapatma hatası: {e}")
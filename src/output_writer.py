@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - WRITE-BEHIND OUTPUT WRITER
+===========================================================
+
+Description:
+    Sipariş logları ve HTML snapshot'ları için arka plan yazıcı.
+    Çağıran taraf sadece sınırlı bir kuyruğa iş bırakır; disk
+    yazımı (ve istenirse içerik üretimi, örn. HTML temizleme) ayrı
+    bir thread'de, aynı dosyaya giden append'ler gruplanarak yapılır.
+    Yavaş disk / antivirüs taraması sipariş işlemeyi durdurmaz.
+
+    Toplama (settings.writer_flush_interval): ilk işten sonra en fazla
+    flush_interval saniye (veya batch_size işe ulaşınca) beklenir, sonra
+    toplu yazılır. flush() / close() beklemeyi keser.
+
+    fsync politikası (settings.writer_fsync):
+        "never" : işletim sistemine bırakılır (varsayılan)
+        "batch" : her toplu yazımın sonunda, dokunulan dosya başına bir fsync
+        "always": her işten sonra fsync
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import logging, os, queue, threading, time
+from typing import Callable, Dict, List, Optional, Union
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+Content = Union[str, bytes, Callable[[], Union[str, bytes]]]
+
+_STOP = object()
+_FLUSH = "flush"
+_PUT_WARN_AFTER = 1.0  # kuyruk bu kadar süre dolu kalırsa uyarıp bloklayarak beklenir
+
+
+
+class OutputWriter:
+    """Sınırlı kuyruklu, toplu yazan arka plan dosya yazıcısı."""
+
+    def __init__(self, max_queue: int = 1000, flush_interval: float = 1.0, fsync: str = "never", batch_size: int = 64) -> None:
+        self.flush_interval = max(0.01, flush_interval)
+        self.fsync = fsync
+        self.batch_size = max(1, batch_size)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue))
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._dirty: set = set()  # "batch" fsync: bu toplu yazımda dokunulan dosyalar
+        self.written_jobs = 0
+        self.failed_jobs = 0
+        self.batches = 0
+
+    # ---------- dışa açık API ----------
+    def start(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive(): return
+            self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+            self._thread.start()
+
+    def append(self, path: str, content: Content) -> None:
+        """Dosyanın sonuna ekle (aynı dosyaya giden append'ler tek open/write ile yazılır)."""
+        self._put(("a", path, content))
+
+    def write(self, path: str, content: Content, on_done: Optional[Callable[[str], None]] = None) -> None:
+        """Dosyayı (yeniden) yaz. content callable ise writer thread'inde üretilir."""
+        self._put(("w", path, content, on_done))
+
+    def call(self, func: Callable[[], None]) -> None:
+        """Yazım sırasını koruyarak writer thread'inde keyfi bir iş çalıştır."""
+        self._put(("c", func))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Kuyruktaki her şey yazılana kadar bekle."""
+        if not self._thread or not self._thread.is_alive(): return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Kuyruğu boşalt ve thread'i durdur."""
+        thread = self._thread
+        if not thread or not thread.is_alive(): return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive(): logger.warning(f"Output writer {timeout}s içinde boşalmadı ({self._queue.qsize()} iş kaldı).")
+        else: logger.info(f"Output writer kapatıldı ({self.written_jobs} iş yazıldı, {self.failed_jobs} hata).")
+
+    @property
+    def pending(self) -> int: return self._queue.qsize()
+
+    # ---------- iç işleyiş ----------
+    def _put(self, job) -> None:
+        if not self._thread or not self._thread.is_alive(): self.start()
+        try: self._queue.put(job, timeout=_PUT_WARN_AFTER)
+        except queue.Full:
+            # Kuyruk dolu: veri kaybetmek yerine bloklayarak bekle (geri basınç)
+            logger.warning("Output writer kuyruğu dolu, yazıcı bekleniyor...")
+            self._queue.put(job)
+
+    def _collect(self) -> list:
+        """İlk işi bekler; sonra flush_interval dolana, batch_size'a ulaşana veya flush / stop gelene kadar toplar."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            last = batch[-1]
+            if last is _STOP or last[0] == _FLUSH: break
+            remaining = deadline - time.monotonic()
+            try: batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty: break
+        return batch
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = self._collect()
+            waiters: List[threading.Event] = []
+            jobs = []
+            for job in batch:
+                if job is _STOP: stop = True
+                elif job[0] == _FLUSH: waiters.append(job[1])
+                else: jobs.append(job)
+            self._process(jobs)
+            for w in waiters: w.set()
+        # STOP sonrası kuyrukta kalanlar
+        rest = []
+        while True:
+            try: job = self._queue.get_nowait()
+            except queue.Empty: break
+            if job is _STOP: continue
+            if job[0] == _FLUSH: job[1].set()
+            else: rest.append(job)
+        self._process(rest)
+
+    def _process(self, jobs: list) -> None:
+        appends: Dict[str, List[str]] = {}
+        for job in jobs:
+            kind = job[0]
+            try:
+                if kind == "a":
+                    # append'ler sırayı koruyarak dosya başına gruplanır; araya giren w/c işlerinden önce boşaltılır
+                    appends.setdefault(job[1], []).append(self._render(job[2]))
+                    if self.fsync == "always": self._flush_appends(appends)
+                    continue
+                self._flush_appends(appends)
+                if kind == "w":
+                    _, path, content, on_done = job
+                    self._write_file(path, self._render(content), "w")
+                    if on_done: on_done(path)
+                elif kind == "c": job[1]()
+                self.written_jobs += 1
+            except Exception as e:
+                self.failed_jobs += 1
+                logger.error(f"Output writer işi başarısız ({kind}): {e}")
+        self._flush_appends(appends)
+        if jobs: self.batches += 1
+        self._sync_dirty()
+
+    def _sync_dirty(self) -> None:
+        for path in self._dirty:
+            try:
+                with open(path, "ab") as f: os.fsync(f.fileno())
+            except OSError as e: logger.error(f"fsync başarısız ({path}): {e}")
+        self._dirty.clear()
+
+    def _flush_appends(self, appends: Dict[str, List[str]]) -> None:
+        for path, parts in appends.items():
+            try:
+                self._write_file(path, "".join(parts), "a")
+                self.written_jobs += len(parts)
+            except Exception as e:
+                self.failed_jobs += len(parts)
+                logger.error(f"Dosyaya yazılamadı ({path}): {e}")
+        appends.clear()
+
+    @staticmethod
+    def _render(content: Content):
+        return content() if callable(content) else content
+
+    def _write_file(self, path: str, data, mode: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        binary = isinstance(data, bytes)
+        with open(path, mode + ("b" if binary else ""), **({} if binary else {"encoding": "utf-8"})) as f:
+            f.write(data)
+            if self.fsync == "always":
+                f.flush()
+                os.fsync(f.fileno())
+        if self.fsync == "batch": self._dirty.add(path)
+
+
+
+# Global writer referansı
+output_writer: Optional[OutputWriter] = None
+
+def get_output_writer() -> OutputWriter:
+    """OutputWriter nesnesini döner, yoksa settings ile oluşturur."""
+    global output_writer
+    if output_writer is None:
+        output_writer = OutputWriter(
+            max_queue=settings.writer_queue_size,
+            flush_interval=settings.writer_flush_interval,
+            fsync=settings.writer_fsync,
+        )
+    return output_writer
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - PER-DOMAIN RATE LIMITER
+===========================================================
+
+Description:
+    Host başına token bucket: settings.max_requests_per_minute
+    sürekli hız, settings.rate_limit_burst ani patlama kapasitesi.
+    requests yolu (http_client), aiohttp toplu kazıma (batch_scrape)
+    ve tarayıcı gezintileri (BrowserManager.navigate_to_url,
+    BrowserPool.navigate, mağaza sekmeleri) aynı kovaları paylaşır;
+    bir toplu iş tek bir host'u boğamaz.
+
+        - İzin listesi : settings.allowed_domains boş değilse yalnızca
+                         bu alan adları (ve alt alan adları) çekilebilir,
+                         diğerleri DomainNotAllowed fırlatır
+        - Thread/async : token önceden rezerve edilir, bekleme kilit
+                         dışında yapılır (time.sleep / asyncio.sleep);
+                         iptal edilen async bekleyişin token'ı iade edilir
+        - Metrikler    : host başına istek, bekleyen istek, toplam /
+                         en uzun bekleme (stats())
+
+    max_requests_per_minute <= 0 ise hız sınırı kapalıdır (izin
+    listesi yine uygulanır). Önbellekten dönen yanıtlar ve loopback
+    host'lar (localhost, 127.0.0.0/8, ::1 — yerel test sunucuları,
+    benchmark'lar) sayılmaz.
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import asyncio, ipaddress, logging, threading, time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+
+class DomainNotAllowed(PermissionError):
+    """URL'nin host'u settings.allowed_domains içinde değil."""
+
+
+
+class TokenBucket:
+    """Thread-safe token bucket; reserve() beklenmesi gereken süreyi döner (negatif bakiye = sıradaki rezervasyonlar)."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate  # token / saniye
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.requests += 1
+            if wait > 0:
+                self.waited += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def refund(self) -> None:
+        with self._lock: self.tokens = min(self.capacity, self.tokens + 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "waited": self.waited, "total_wait_s": round(self.total_wait, 3),
+                    "max_wait_s": round(self.max_wait, 3), "avg_wait_s": round(self.total_wait / self.requests, 4) if self.requests else 0.0}
+
+
+
+def host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost" or host.endswith(".localhost"): return True
+    try: return ipaddress.ip_address(host).is_loopback
+    except ValueError: return False
+
+
+def domain_allowed(host: str, allowed: Optional[Iterable[str]] = None) -> bool:
+    allowed = [d.lower().lstrip(".") for d in (settings.allowed_domains if allowed is None else allowed) if d]
+    return not allowed or any(host == d or host.endswith("." + d) for d in allowed)
+
+
+
+class RateLimiter:
+    """Host başına TokenBucket'ları tutan, sync (acquire) ve async (aacquire) kullanılabilen sınırlayıcı."""
+
+    def __init__(self, per_minute: Optional[int] = None, burst: Optional[int] = None, allowed_domains: Optional[Iterable[str]] = None) -> None:
+        self.per_minute = settings.max_requests_per_minute if per_minute is None else per_minute
+        self.burst = settings.rate_limit_burst if burst is None else burst
+        self.allowed_domains = None if allowed_domains is None else list(allowed_domains)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def check(self, url: str) -> str:
+        """URL izinliyse host'unu döner, değilse DomainNotAllowed."""
+        host = host_of(url)
+        if not domain_allowed(host, self.allowed_domains):
+            self.rejected += 1
+            raise DomainNotAllowed(f"İzin verilmeyen alan adı: {host or url} (allowed_domains)")
+        return host
+
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        if self.per_minute <= 0 or is_loopback(host): return None
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock: bucket = self._buckets.setdefault(host, TokenBucket(self.per_minute / 60.0, self.burst))
+        return bucket
+
+    def acquire(self, url: str) -> float:
+        """İzin listesini denetler, host'un kovasından token alır (gerekirse bekler); beklenen saniyeyi döner."""
+        host = self.check(url)
+        bucket = self._bucket(host)
+        wait = bucket.reserve() if bucket else 0.0
+        if wait > 0:
+            logger.debug(f"Hız sınırı: {host} için {wait:.2f} s bekleniyor")
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, url: str) -> float:
+        """acquire()'ın event loop'u bloklamayan karşılığı."""
+        host = self.check(url)
+        bucket = self._bucket(host)
+        wait = bucket.reserve() if bucket else 0.0
+        if wait > 0:
+            logger.debug(f"Hız sınırı: {host} için {wait:.2f} s bekleniyor")
+            try: await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                bucket.refund()  # type: ignore[union-attr]
+                raise
+        return wait
+
+    def stats(self) -> dict:
+        with self._lock: buckets = dict(self._buckets)
+        return {"per_minute": self.per_minute, "burst": self.burst, "rejected": self.rejected,
+                "domains": {host: b.stats() for host, b in sorted(buckets.items())}}
+
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """RateLimiter nesnesini döner, yoksa oluşturur."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None: _limiter = RateLimiter()
+    return _limiter
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - REQUEST BLOCKING POLICY
+===========================================================
+
+Description:
+    Sayfa yüklenirken okumadığımız istekleri (görsel, font, medya,
+    analitik / sohbet widget'ları) CDP Network.setBlockedURLs ile
+    tarayıcıda engeller. Politika settings.browser_config'ten gelir,
+    hedef host'a göre settings.request_policy_overrides ile ezilir:
+
+        request_policy_overrides = {
+            "partner.tgoyemek.com": {"disable_images": True, "block_third_party": True},
+            "example.com": {"disable_javascript": True},
+        }
+
+    Engelleme sekme (CDP hedefi) bazındadır; her gezintiden önce
+    apply_request_policy() çağrılır, politika değişmediyse CDP'ye
+    tekrar gidilmez. JavaScript kapatma Emulation ile yapılır.
+
+    Kazanç raporu (politikasız / politikalı yükleme karşılaştırması):
+        python -m src.request_policy <url> [tekrar]
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Kaynak tipi -> URL deseni (setBlockedURLs yalnızca URL deseni kabul eder; uzantısız kaynaklar yakalanmaz)
+RESOURCE_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*", "*.bmp*"),
+    "font": ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"),
+    "media": ("*.mp4*", "*.webm*", "*.mp3*", "*.ogg*", "*.wav*", "*.m4a*"),
+}
+
+# Okumadığımız üçüncü taraf alan adları: analitik, reklam, oturum kaydı, sohbet / bildirim widget'ları
+THIRD_PARTY_HOSTS: Tuple[str, ...] = (
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com", "doubleclick.net", "googlesyndication.com",
+    "connect.facebook.net", "facebook.com/tr", "hotjar.com", "clarity.ms", "mc.yandex.ru", "newrelic.com", "nr-data.net",
+    "segment.com", "segment.io", "mixpanel.com", "amplitude.com", "adjust.com", "appsflyer.com", "criteo.com",
+    "intercom.io", "intercomcdn.com", "zendesk.com", "zdassets.com", "tawk.to", "crisp.chat", "livechatinc.com",
+    "onesignal.com", "useinsider.com", "sentry.io", "fullstory.com", "smartlook.com",
+)
+
+# Network capture ile aynı tampon ayarları (Network.enable tekrar çağrılınca sıfırlanmasın)
+NETWORK_ENABLE_PARAMS = {"maxResourceBufferSize": 16 * 1024 * 1024, "maxTotalBufferSize": 64 * 1024 * 1024}
+
+_POLICY_FIELDS = ("disable_images", "disable_fonts", "disable_media", "disable_javascript", "block_third_party", "blocked_url_patterns", "allowed_hosts")
+
+
+
+class RequestPolicy:
+    """Bir hedef için geçerli engelleme politikası (değiştirilemez, karşılaştırılabilir)."""
+    __slots__ = ("resource_types", "blocked_url_patterns", "block_third_party", "allowed_hosts", "disable_javascript")
+
+    def __init__(self, resource_types: FrozenSet[str] = frozenset(), blocked_url_patterns: Tuple[str, ...] = (),
+                 block_third_party: bool = False, allowed_hosts: Tuple[str, ...] = (), disable_javascript: bool = False) -> None:
+        self.resource_types = frozenset(resource_types)
+        self.blocked_url_patterns = tuple(blocked_url_patterns)
+        self.block_third_party = block_third_party
+        self.allowed_hosts = tuple(allowed_hosts)
+        self.disable_javascript = disable_javascript
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]) -> "RequestPolicy":
+        types = {t for flag, t in (("disable_images", "image"), ("disable_fonts", "font"), ("disable_media", "media")) if values.get(flag)}
+        return cls(frozenset(types), tuple(values.get("blocked_url_patterns") or ()), bool(values.get("block_third_party")),
+                   tuple(values.get("allowed_hosts") or ()), bool(values.get("disable_javascript")))
+
+    def url_patterns(self) -> List[str]:
+        """Network.setBlockedURLs'e verilecek desenler."""
+        patterns: List[str] = []
+        for t in sorted(self.resource_types): patterns.extend(RESOURCE_PATTERNS.get(t, ()))
+        if self.block_third_party:
+            patterns.extend(f"*{h}*" for h in THIRD_PARTY_HOSTS if not self._allowed(h.split("/", 1)[0]))
+        patterns.extend(self.blocked_url_patterns)
+        return patterns
+
+    def _allowed(self, host: str) -> bool:
+        """allowed_hosts alan adı (ve alt alan adları) olarak eşleşir; "jar.com" gibi parça hotjar.com'u muaf tutmaz."""
+        return any(host == a or host.endswith("." + a) for a in (x.lower().lstrip(".") for x in self.allowed_hosts) if a)
+
+    @property
+    def key(self) -> tuple:
+        return (tuple(self.url_patterns()), self.disable_javascript)
+
+    @property
+    def is_empty(self) -> bool: return not self.url_patterns() and not self.disable_javascript
+
+    def __eq__(self, other: object) -> bool: return isinstance(other, RequestPolicy) and self.key == other.key
+    def __hash__(self) -> int: return hash(self.key)
+    def __repr__(self) -> str: return f"RequestPolicy(types={sorted(self.resource_types)}, third_party={self.block_third_party}, patterns={len(self.url_patterns())}, js_off={self.disable_javascript})"
+
+
+
+def _base_values() -> Dict[str, Any]:
+    cfg = settings.browser_config
+    return {f: getattr(cfg, f, None) for f in _POLICY_FIELDS}
+
+def policy_for(url: str) -> RequestPolicy:
+    """URL'nin host'una göre (en uzun eşleşen) override uygulanmış politika."""
+    values = _base_values()
+    host = (urlsplit(url).hostname or "").lower()
+    matches = [h for h in settings.request_policy_overrides if host == h or host.endswith("." + h)]
+    if matches: values.update(settings.request_policy_overrides[max(matches, key=len)])
+    return RequestPolicy.from_values(values)
+
+
+def apply_request_policy(driver, url: str) -> RequestPolicy:
+    """
+    Driver'ın o anki sekmesine url için geçerli politikayı uygular (driver thread'inde çağrılmalı).
+    Sekmede aynı politika zaten uygulanmışsa CDP çağrısı yapılmaz.
+    """
+    policy = policy_for(url)
+    applied: Optional[Dict[str, tuple]] = getattr(driver, "_scrap_request_policy", None)
+    if applied is None: applied = driver._scrap_request_policy = {}
+    try: handle = driver.current_window_handle
+    except Exception: handle = ""
+    previous = applied.get(handle)
+    if previous == policy.key or (previous is None and policy.is_empty): return policy
+    try:
+        driver.execute_cdp_cmd("Network.enable", NETWORK_ENABLE_PARAMS)
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": policy.url_patterns()})
+        if previous is None or previous[1] != policy.disable_javascript:
+            driver.execute_cdp_cmd("Emulation.setScriptExecutionDisabled", {"value": policy.disable_javascript})
+        applied[handle] = policy.key
+        logger.info(f"İstek politikası uygulandı ({urlsplit(url).hostname}): {policy!r}")
+    except Exception as e: logger.warning(f"İstek politikası uygulanamadı: {e}")
+    return policy
+
+
+
+# ================== KAZANÇ ÖLÇÜMÜ ==================
+_LOAD_STATS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const res = performance.getEntriesByType('resource');
+let bytes = nav ? (nav.transferSize || nav.encodedBodySize || 0) : 0;
+for (const r of res) bytes += r.transferSize || r.encodedBodySize || 0;
+return {requests: res.length + (nav ? 1 : 0), bytes: bytes};
+"""
+
+def page_load_stats(driver) -> Dict[str, int]:
+    """
+    Son yüklemenin istek sayısı ve aktarılan bayt (Resource Timing). Timing-Allow-Origin
+    göndermeyen üçüncü taraf kaynakların boyutu 0 sayılır; bayt değeri alt sınırdır.
+    """
+    try: return driver.execute_script(_LOAD_STATS_JS) or {"requests": 0, "bytes": 0}
+    except Exception: return {"requests": 0, "bytes": 0}
+
+
+def measure_savings(driver, url: str, repeats: int = 1) -> Dict[str, Any]:
+    """Aynı sayfayı önbelleksiz, önce politikasız sonra politikalı yükler; tasarrufu döner."""
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    def load(policy_on: bool) -> Dict[str, int]:
+        totals = {"requests": 0, "bytes": 0}
+        for _ in range(max(1, repeats)):
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": policy.url_patterns() if policy_on else []})
+            driver.execute_cdp_cmd("Emulation.setScriptExecutionDisabled", {"value": policy_on and policy.disable_javascript})
+            driver.get(url)
+            WebDriverWait(driver, settings.browser_timeout).until(lambda d: d.execute_script("return document.readyState") == "complete")
+            stats = page_load_stats(driver)
+            for k in totals: totals[k] += stats[k]
+        return {k: v // max(1, repeats) for k, v in totals.items()}
+
+    policy = policy_for(url)
+    driver.execute_cdp_cmd("Network.enable", NETWORK_ENABLE_PARAMS)
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    try:
+        baseline, blocked = load(False), load(True)
+    finally:
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+        driver._scrap_request_policy = {}  # sonraki gezintide politika yeniden uygulanır
+    return {
+        "url": url, "policy": repr(policy), "baseline": baseline, "with_policy": blocked,
+        "saved_requests": baseline["requests"] - blocked["requests"], "saved_bytes": baseline["bytes"] - blocked["bytes"],
+    }
+
+
+async def _report(url: str, repeats: int) -> None:
+    from src.browser_manager import get_browser_manager
+    manager = get_browser_manager()
+    if not await manager.initialize_browser():
+        print("❌ Browser başlatılamadı!")
+        return
+    try:
+        r = await manager.executor.run(measure_savings, manager.driver, url, repeats)
+        print(f"🧱 {r['policy']}")
+        print(f"   politikasız : {r['baseline']['requests']:>5} istek  {r['baseline']['bytes'] / 1024:>10.1f} KB")
+        print(f"   politikalı  : {r['with_policy']['requests']:>5} istek  {r['with_policy']['bytes'] / 1024:>10.1f} KB")
+        print(f"   tasarruf    : {r['saved_requests']:>5} istek  {r['saved_bytes'] / 1024:>10.1f} KB / sayfa yüklemesi")
+    finally:
+        await manager.close_browser()
+
+
+if __name__ == "__main__":
+    import asyncio, sys
+    if len(sys.argv) < 2: print("Kullanım: python -m src.request_policy <url> [tekrar]")
+    else: asyncio.run(_report(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 1))
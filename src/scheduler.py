@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - ADAPTIVE LOOP SCHEDULER
+===========================================================
+
+Description:
+    Ana döngü için uyarlanabilir bekleme ve periyodik işler.
+        - AdaptivePoller : aktivite varken kısa aralık, boştayken
+                           üstel geri çekilme (max aralığa kadar)
+        - Scheduler      : gerçek saat (monotonic) tabanlı periyodik
+                           işler; "time % 30 == 0" gibi şans eseri
+                           tetiklenen kontrollerin yerine geçer
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import logging, time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+
+class AdaptivePoller:
+    """Aktiviteye göre bir sonraki döngü gecikmesini hesaplar."""
+
+    def __init__(self, min_interval: float = 1.0, max_interval: float = 15.0, backoff: float = 1.5) -> None:
+        self.min_interval = max(0.05, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.backoff = max(1.0, backoff)
+        self.interval = self.min_interval
+
+    def next_delay(self, activity: int) -> float:
+        """activity > 0 ise min aralığa dön, değilse aralığı backoff ile büyüt."""
+        if activity > 0: self.interval = self.min_interval
+        else: self.interval = min(self.max_interval, self.interval * self.backoff)
+        return self.interval
+
+    def reset(self) -> None: self.interval = self.min_interval
+
+
+
+class PeriodicJob:
+    """Belirli aralıkla çalışan iş."""
+    __slots__ = ("name", "interval", "func", "next_run", "runs", "last_error")
+
+    def __init__(self, name: str, interval: float, func: Callable[..., Any], run_immediately: bool = False) -> None:
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.next_run = time.monotonic() + (0 if run_immediately else interval)
+        self.runs = 0
+        self.last_error: Optional[str] = None
+
+
+class Scheduler:
+    """Gerçek saat tabanlı periyodik iş zamanlayıcısı (döngü içinden sürülür)."""
+
+    def __init__(self) -> None:
+        self.jobs: Dict[str, PeriodicJob] = {}
+
+    def add_job(self, name: str, interval: float, func: Callable[..., Any], run_immediately: bool = False) -> PeriodicJob:
+        job = PeriodicJob(name, interval, func, run_immediately)
+        self.jobs[name] = job
+        return job
+
+    def remove_job(self, name: str) -> None: self.jobs.pop(name, None)
+
+    def run_due(self, *args: Any, **kwargs: Any) -> int:
+        """Vakti gelen işleri çalıştırır; çalışan iş sayısını döner.
+        Bir sonraki vakit önceki vakitten sayılır (döngü gecikmesi birikip kaymaz); kaçırılan periyotlar biriktirilmez."""
+        now = time.monotonic()
+        ran = 0
+        for job in list(self.jobs.values()):
+            if now < job.next_run: continue
+            job.next_run += job.interval
+            if job.next_run <= now and job.interval > 0: job.next_run += ((now - job.next_run) // job.interval + 1) * job.interval
+            try:
+                job.func(*args, **kwargs)
+                job.runs += 1
+                job.last_error = None
+            except Exception as e:
+                job.last_error = str(e)
+                logger.error(f"Periyodik iş hatası ({job.name}): {e}")
+            ran += 1
+        return ran
+
+    def time_until_next(self) -> float:
+        """En yakın işe kalan süre (iş yoksa sonsuz)."""
+        if not self.jobs: return float("inf")
+        return max(0.0, min(j.next_run for j in self.jobs.values()) - time.monotonic())
@@ -1,96 +1,107 @@
-import logging
-from typing import Optional
-import requests
-from bs4 import BeautifulSoup
+import logging, sys
+from typing import Iterator, Optional
 
+# requests / selenium / bs4 ilk kullanımda yüklenir: import süresi "python -m src.import_budget" ile denetlenir
 from src.settings import settings
-from src.browser_manager import browser_manager  # DÜZELTİLDİ (eskiden: from src import get_browser_manager)
+from src.html_parser import iter_text_lines, parse_html
 
 logger = logging.getLogger("scrap.scrap_page")
 
+STREAM_CHUNK_SIZE = 64 * 1024  # akış halinde metin çıkarırken tokenizer'a verilen parça (karakter)
 
 
-def _fetch_with_browser(driver, url: str, timeout: int, headers: dict) -> Optional[str]:
-    try:
-        if not driver:
-            return None
-        driver.set_page_load_timeout(timeout)
-        driver.get(url)
-        return getattr(driver, "page_source", "")
-    except Exception as e:
-        logger.warning("Selenium fetch hatası, fallback requests: %s", e)
-        return None
 
-def ensure_browser(use_browser: bool = True):
+def ensure_browser(use_browser: bool = True) -> bool:
     """
-    Browser kullanımı isteniyorsa hazır (initialize edilmiş) Selenium driver döner.
-    Sync bağlamda async initialize_browser çağrılamaz; hazır değilse None.
+    Tarayıcı ile çekim yapılabilir mi? Uygulama tarayıcıyı başlatmışsa (veya havuzda açık sürücü varsa)
+    sayfalar havuzdaki ayrı sürücülerle açılır; sipariş paneli sürücüsüne dokunulmaz.
     """
-    if not use_browser:  return None
-    if not getattr(browser_manager, "is_initialized", False):
-        logger.debug("Browser henüz initialize edilmemiş; driver None dönecek.")
-        return None
-    drv = getattr(browser_manager, "driver", None)
-    if drv is None: logger.debug("Browser manager var fakat driver nesnesi yok.")
-    return drv
+    if not use_browser:  return False
+    # Tarayıcı modülleri hiç yüklenmediyse açık bir tarayıcı da yoktur: selenium'u boşuna import etme
+    pool_module, manager_module = sys.modules.get("src.browser_pool"), sys.modules.get("src.browser_manager")
+    if pool_module and pool_module.get_browser_pool().active: return True
+    if not getattr(getattr(manager_module, "browser_manager", None), "is_initialized", False):
+        logger.debug("Browser henüz initialize edilmemiş; requests kullanılacak.")
+        return False
+    return True
 
 def open_page(url: str, *, timeout: int, headers: dict) -> Optional[str]:
     """
-    Mevcut driver ile sayfayı açıp HTML döner; driver yoksa None.
+    Havuzdan bir sürücü alıp sayfayı açar ve HTML döner; tarayıcı kullanılamıyorsa None.
     """
-    driver = ensure_browser(use_browser=True)
-    if not driver:
+    if not ensure_browser(use_browser=True):
+        return None
+    from src.browser_pool import get_browser_pool
+    try:
+        return get_browser_pool().navigate(url, timeout=timeout, checkout_timeout=timeout)
+    except Exception as e:
+        logger.warning("Selenium fetch hatası, fallback requests: %s", e)
         return None
-    return _fetch_with_browser(driver, url, timeout, headers)
 
 
-def scrap_all_pages( url: str, *, timeout: int = 20, encoding: Optional[str] = None, use_browser: bool = True ) -> str:
+def _load_html(url: str, *, timeout: int, encoding: Optional[str], use_browser: bool) -> str:
     """
-    Sayfadaki görünür metni çıkarır.
-    use_browser=True ve aktif Selenium driver varsa önce onu dener, aksi halde requests.
+    Tarayıcı (varsa) veya requests ile HTML. Aynı URL + seçenekler için eşzamanlı çağrılar tek çekimi paylaşır
+    (src.single_flight); çekim settings.enable_cache açıksa önbellekten geçer (bkz. src.http_cache).
     """
-    ua = settings.browser_config.user_agent or "Mozilla/5.0"
-    headers = {"User-Agent": ua}
-
-    html = None
-    if use_browser:
-        # ensure_browser + open_page ile dene
+    from src.single_flight import fetch_key, get_single_flight
+    return get_single_flight().do(fetch_key(url, encoding=encoding, use_browser=use_browser), _fetch_html,
+                                  url, timeout=timeout, encoding=encoding, use_browser=use_browser)
+
+def _fetch_html(url: str, *, timeout: int, encoding: Optional[str], use_browser: bool) -> str:
+    """Tarayıcı ve requests kayıtları önbellekte ayrı anahtarlıdır."""
+    from src.rate_limiter import get_rate_limiter
+    get_rate_limiter().check(url)  # allowed_domains önbellekten dönen sayfalar için de geçerli
+    headers = {"User-Agent": settings.browser_config.user_agent or "Mozilla/5.0"}
+    if ensure_browser(use_browser):
+        cache, key = None, None
+        if settings.enable_cache:
+            from src.http_cache import cache_key, get_http_cache
+            cache, key = get_http_cache(), cache_key(url, "browser")
+            entry = cache.get(key)
+            if entry is not None and entry.fresh: return entry.body
         html = open_page(url, timeout=timeout, headers=headers)
+        if html is not None:
+            if cache is not None: cache.put(key, url, html)
+            return html
+    # havuzlu, yeniden denemeli oturum (keep-alive) + koşullu yeniden doğrulama
+    from src.http_cache import cached_get
+    return cached_get(url, timeout=timeout, headers=headers, encoding=encoding)
 
-    if html is None:
-        resp = requests.get(url, timeout=timeout, headers=headers)
-        resp.raise_for_status()
-        if encoding:  resp.encoding = encoding
-        html = resp.text
 
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript", "template"]): tag.decompose()
-
-    text = soup.get_text(separator="\n")
-    lines = [ln.strip() for ln in text.splitlines()]
-    lines = [ln for ln in lines if ln and not all(ch in "-_=*" for ch in ln)]
-
-    cleaned = []
-    for ln in lines:
-        collapsed = " ".join(ln.split())
-        if collapsed:
-            cleaned.append(collapsed)
+def _iter_html(url: str, *, timeout: int, encoding: Optional[str], use_browser: bool) -> Iterator[str]:
+    """
+    HTML'i parça parça verir. Yalnızca önbellek kapalı ve tarayıcı yokken gövde ağdan indirildikçe akar.
+    Varsayılan yolda (enable_cache açık veya tarayıcı) HTML önbelleğe / single-flight bekleyenlerine tam
+    metin olarak verilmesi gerektiğinden önce bütünüyle yüklenir, sonra dilimlenir: ağaç kurulmaz ama
+    bellek tepe noktası sayfa boyutuyla (önbellek kopyası dahil ~2x) orantılıdır.
+    """
+    if not settings.enable_cache and not ensure_browser(use_browser):
+        from src import http_client
+        headers = {"User-Agent": settings.browser_config.user_agent or "Mozilla/5.0"}
+        yield from http_client.iter_text(url, timeout=timeout, headers=headers, encoding=encoding, chunk_size=STREAM_CHUNK_SIZE)
+        return
+    html = _load_html(url, timeout=timeout, encoding=encoding, use_browser=use_browser)
+    for i in range(0, len(html), STREAM_CHUNK_SIZE): yield html[i:i + STREAM_CHUNK_SIZE]
+
+def iter_page_lines(url: str, *, timeout: int = 20, encoding: Optional[str] = None, use_browser: bool = True) -> Iterator[str]:
+    """
+    Sayfadaki görünür metni temizlenmiş satırlar halinde üretir (generator).
+    script/style/noscript/template içerikleri tokenize edilirken atlanır; ağaç kurulmaz.
+    Sabit bellekli akış yalnızca enable_cache=False ve use_browser=False iken (bkz. _iter_html).
+    """
+    yield from iter_text_lines(_iter_html(url, timeout=timeout, encoding=encoding, use_browser=use_browser))
 
-    return "\n".join(cleaned)
+def scrap_all_pages( url: str, *, timeout: int = 20, encoding: Optional[str] = None, use_browser: bool = True ) -> str:
+    """
+    Sayfadaki görünür metni çıkarır (iter_page_lines satırlarının birleşimi).
+    use_browser=True ve tarayıcı havuzu kullanılabiliyorsa önce onu dener, aksi halde requests.
+    """
+    return "\n".join(iter_page_lines(url, timeout=timeout, encoding=encoding, use_browser=use_browser))
 
 def fetch_raw_html(url: str, *, timeout: int = 20, encoding: Optional[str] = None, use_browser: bool = True) -> str:
     """Ham HTML döner (temizleme yapmaz)."""
-    ua = settings.browser_config.user_agent or "Mozilla/5.0"
-    headers = {"User-Agent": ua}
-    html = None
-    if use_browser:
-        html = open_page(url, timeout=timeout, headers=headers)
-    if html is None:
-        resp = requests.get(url, timeout=timeout, headers=headers)
-        resp.raise_for_status()
-        if encoding: resp.encoding = encoding
-        html = resp.text
-    return html
+    return _load_html(url, timeout=timeout, encoding=encoding, use_browser=use_browser)
 
 def scrape_info_items(
     url: str,
@@ -113,7 +124,11 @@ def scrape_info_items(
         logger.error("HTML alınamadı: %s", e)
         return []
 
-    soup = BeautifulSoup(html, "html.parser")
+    return extract_info_items(html, selector=selector, include_html=include_html)
+
+def extract_info_items(html: str, *, selector: str = ".info-content-column__item", include_html: bool = False) -> list[dict]:
+    """Hazır HTML'den seçiciye uyan öğeleri çıkarır (scrape_info_items ile aynı format)."""
+    soup = parse_html(html)
     elements = soup.select(selector)
     results = []
     for i, el in enumerate(elements):
@@ -127,6 +142,8 @@ def scrape_info_items(
 __all__ = [
     # mevcut dışa aktarılabilir fonksiyonlar
     "scrap_all_pages",
+    "iter_page_lines",
     "fetch_raw_html",
     "scrape_info_items",
+    "extract_info_items",
 ]
\ No newline at end of file
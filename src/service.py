@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - LOCAL HTTP SERVICE
+===========================================================
+
+Description:
+    scrap_page fonksiyonlarını ve işlenmiş sipariş sorgularını
+    yerel HTTP üzerinden sunan ASGI uygulaması (uvicorn ile,
+    settings.host / settings.port / settings.auto_reload).
+
+        GET  /health                 kuyruk / işçi durumu (işçi düşmüşse 503;
+                                     dolu kuyruk yalnızca queue_full: true)
+        GET  /metrics                Prometheus metin formatı (src.metrics)
+        GET  /scrape/text   ?url=    scrap_all_pages
+        GET  /scrape/html   ?url=    fetch_raw_html
+        GET  /scrape/items  ?url=&selector=&include_html=
+                                     scrape_info_items
+        GET  /orders        ?since=&order_no=&limit=   (tüm mağazalar)
+        GET  /orders/<order_no>
+        GET  /processed     ?key=&namespace=
+    /scrape/* POST ile JSON gövde de kabul eder (aynı alanlar).
+    Ortak parametreler: timeout, encoding, use_browser.
+
+    Kazıma istekleri sınırlı bir iş kuyruğuna girer
+    (service_queue_size); settings.max_concurrent_requests işçi
+    işleri sırayla thread'de çalıştırır. Kuyruk doluysa istek
+    beklemez: 429 + Retry-After döner.
+
+    Çalıştırma:
+        python -m src.service
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import asyncio, json, logging, os, time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from src.settings import settings
+from src.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, get_metrics
+
+logger = logging.getLogger(__name__)
+
+Send = Callable[[dict], Awaitable[None]]
+Receive = Callable[[], Awaitable[dict]]
+
+
+
+class HTTPError(Exception):
+    """İstemciye status kodu ile dönecek hata."""
+
+    def __init__(self, status: int, message: str, headers: Tuple[Tuple[str, str], ...] = ()) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers
+
+
+
+class JobQueue:
+    """Sınırlı iş kuyruğu + sabit sayıda işçi; dolu kuyrukta submit() beklemeden QueueFull fırlatır."""
+
+    def __init__(self, workers: Optional[int] = None, maxsize: Optional[int] = None) -> None:
+        self.workers = max(1, workers or settings.max_concurrent_requests)
+        self.maxsize = max(1, maxsize or settings.service_queue_size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self.busy = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.started_at = time.time()
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue(self.maxsize)
+        self._tasks = [asyncio.create_task(self._work(), name=f"service-worker-{i}") for i in range(self.workers)]
+        logger.info(f"İş kuyruğu başladı ({self.workers} işçi, kapasite {self.maxsize})")
+
+    async def stop(self) -> None:
+        for t in self._tasks: t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        while True:
+            fn, kwargs, fut = await self._queue.get()
+            if fut.cancelled(): continue  # istemci vazgeçti
+            self.busy += 1
+            try:
+                result = await asyncio.to_thread(fn, **kwargs)
+                if not fut.done(): fut.set_result(result)
+                self.completed += 1
+            except Exception as e:
+                if not fut.done(): fut.set_exception(e)
+                self.failed += 1
+            finally: self.busy -= 1
+
+    def submit(self, fn: Callable[..., Any], **kwargs: Any) -> asyncio.Future:
+        if self._queue is None: raise RuntimeError("İş kuyruğu başlatılmadı.")
+        fut = asyncio.get_running_loop().create_future()
+        try: self._queue.put_nowait((fn, kwargs, fut))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise
+        return fut
+
+    @property
+    def depth(self) -> int: return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def alive_workers(self) -> int: return sum(1 for t in self._tasks if not t.done())
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "alive_workers": self.alive_workers, "busy": self.busy, "queue_depth": self.depth,
+                "queue_capacity": self.maxsize, "completed": self.completed, "failed": self.failed, "rejected": self.rejected}
+
+
+jobs = JobQueue()
+JOB_SECONDS = get_metrics().histogram("scrap_service_job_seconds", "Servis kazıma işi süresi (kuyruk beklemesi dahil)", ["kind", "status"])
+JOBS_REJECTED = get_metrics().counter("scrap_service_jobs_rejected_total", "Kuyruk dolu olduğu için reddedilen işler")
+
+
+
+# ================== YARDIMCI ==================
+async def _send(send: Send, status: int, body: Any, headers: Tuple[Tuple[str, str], ...] = (), content_type: str = "application/json; charset=utf-8") -> None:
+    payload = body.encode("utf-8") if isinstance(body, str) and not content_type.startswith("application/json") else json.dumps(body, ensure_ascii=False).encode("utf-8")
+    raw_headers = [(b"content-type", content_type.encode()), (b"content-length", str(len(payload)).encode())]
+    raw_headers += [(k.lower().encode(), v.encode()) for k, v in headers]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def _read_json(receive: Receive) -> dict:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"): break
+    raw = b"".join(chunks)
+    if not raw.strip(): return {}
+    try: data = json.loads(raw)
+    except json.JSONDecodeError as e: raise HTTPError(400, f"Geçersiz JSON: {e}")
+    if not isinstance(data, dict): raise HTTPError(400, "JSON gövdesi nesne olmalı.")
+    return data
+
+
+def _bool(value: Any) -> bool:
+    return value if isinstance(value, bool) else str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _fetch_kwargs(params: dict) -> dict:
+    url = params.get("url")
+    if not url or not str(url).startswith(("http://", "https://")): raise HTTPError(400, "'url' parametresi (http/https) gerekli.")
+    try: timeout = int(params.get("timeout", 20))
+    except (TypeError, ValueError): raise HTTPError(400, "'timeout' tam sayı olmalı.")
+    kwargs = {"url": url, "timeout": timeout, "use_browser": _bool(params.get("use_browser", False))}
+    if params.get("encoding"): kwargs["encoding"] = str(params["encoding"])
+    return kwargs
+
+
+def _error_status(exc: Exception) -> int:
+    from src.rate_limiter import DomainNotAllowed
+    if isinstance(exc, DomainNotAllowed): return 403
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError)): return 504
+    if isinstance(exc, ValueError): return 400
+    return 502  # hedef site / ağ hatası
+
+
+
+# ================== KAZIMA UÇLARI ==================
+def _scrape_target(kind: str) -> Tuple[Callable[..., Any], str]:
+    from src import scrap_page
+    return {"text": (scrap_page.scrap_all_pages, "text"), "html": (scrap_page.fetch_raw_html, "html"),
+            "items": (scrap_page.scrape_info_items, "items")}[kind]
+
+
+async def _scrape(kind: str, params: dict) -> Tuple[int, dict]:
+    fn, field = _scrape_target(kind)
+    kwargs = _fetch_kwargs(params)
+    if kind == "items":
+        if params.get("selector"): kwargs["selector"] = str(params["selector"])
+        kwargs["include_html"] = _bool(params.get("include_html", False))
+    try: fut = jobs.submit(fn, **kwargs)
+    except asyncio.QueueFull:
+        JOBS_REJECTED.inc()
+        raise HTTPError(429, f"İş kuyruğu dolu ({jobs.maxsize}).", (("Retry-After", "1"),))
+    start = time.perf_counter()
+    try: result = await asyncio.wait_for(fut, settings.service_job_timeout)
+    except asyncio.TimeoutError:
+        JOB_SECONDS.observe(time.perf_counter() - start, kind=kind, status="timeout")
+        raise HTTPError(504, f"İş {settings.service_job_timeout} s içinde tamamlanmadı.")
+    except Exception as e:
+        JOB_SECONDS.observe(time.perf_counter() - start, kind=kind, status="error")
+        logger.warning(f"Servis kazıma hatası ({kwargs['url']}): {e}")
+        raise HTTPError(_error_status(e), f"{type(e).__name__}: {e}")
+    JOB_SECONDS.observe(time.perf_counter() - start, kind=kind, status="ok")
+    return 200, {"url": kwargs["url"], field: result, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+
+# ================== SİPARİŞ SORGULARI ==================
+def _query_orders(since: Optional[str], order_no: Optional[str], limit: int) -> List[dict]:
+    """
+    SAVE_DIR/orders (birincil mağaza) ve SAVE_DIR/orders/<store_id> JSONL kayıtlarından zamana
+    göre en yeni 'limit' tanesi; since (ISO) öncesindeki günlerin dosyaları açılmaz.
+    """
+    import glob, heapq
+    from src.main import SAVE_DIR
+    from src.order_export import iter_file_records
+    root = os.path.join(SAVE_DIR, "orders")
+    since_day = since[:10].replace("-", "") if since else None
+    newest: List[tuple] = []  # (ts, sıra, kayıt) min-heap: bellekte en fazla limit kayıt
+    seq = 0
+    for path in sorted(glob.glob(os.path.join(root, "*.jsonl")) + glob.glob(os.path.join(root, "*", "*.jsonl"))):
+        name = os.path.basename(path)
+        day = name.split("-")[1][:8] if "-" in name else ""  # orders-YYYYMMDD[-N].jsonl
+        if since_day and day and day < since_day: continue
+        store = os.path.basename(os.path.dirname(path))
+        for rec in iter_file_records(path):
+            if since and (rec.get("ts") or "") < since: continue
+            if order_no and str(rec.get("order_no") or "") != order_no: continue
+            if store != "orders": rec.setdefault("store", store)
+            seq += 1
+            item = (rec.get("ts") or "", seq, rec)
+            if len(newest) < limit: heapq.heappush(newest, item)
+            elif limit: heapq.heappushpop(newest, item)
+    return [rec for _, _, rec in sorted(newest)]
+
+
+def _processed(key: Optional[str], namespace: str) -> dict:
+    """Her istekte salt okunur bağlantı: main.py başka süreçte anahtar ekledikçe sayı güncel kalır."""
+    import contextlib, pathlib, sqlite3
+    from src.main import _INDEX_PATH
+    if namespace not in ("cards", "detail_urls"): raise HTTPError(400, "namespace: cards | detail_urls")
+    result: dict = {"namespace": namespace, "count": 0, **({"key": key, "processed": False} if key else {})}
+    if not os.path.exists(_INDEX_PATH): return result
+    uri = pathlib.Path(_INDEX_PATH).resolve().as_uri() + "?mode=ro"
+    with contextlib.closing(sqlite3.connect(uri, uri=True, timeout=5)) as conn:
+        result["count"] = conn.execute("SELECT COUNT(*) FROM processed WHERE namespace=?", (namespace,)).fetchone()[0]
+        if key: result["processed"] = conn.execute("SELECT 1 FROM processed WHERE namespace=? AND key=?", (namespace, key)).fetchone() is not None
+    return result
+
+
+
+# ================== SAĞLIK ==================
+def _health() -> Tuple[int, dict]:
+    stats = jobs.stats()
+    problems = []
+    if stats["alive_workers"] < stats["workers"]: problems.append("workers_down")
+    # dolu kuyruk normal geri basınçtır (submit zaten 429 döner): servis sağlıklı sayılır
+    queue_full = stats["queue_depth"] >= stats["queue_capacity"]
+    body: dict = {"status": "degraded" if problems else "ok", "problems": problems, "queue_full": queue_full,
+                  "uptime_s": round(time.time() - jobs.started_at, 1), "jobs": stats}
+    import sys
+    if "src.http_cache" in sys.modules and settings.enable_cache: body["cache"] = sys.modules["src.http_cache"].get_http_cache().stats()
+    if "src.single_flight" in sys.modules: body["single_flight"] = sys.modules["src.single_flight"].get_single_flight().stats()
+    if "src.browser_pool" in sys.modules: body["browser_pool"] = sys.modules["src.browser_pool"].get_browser_pool().stats()
+    return (503 if problems else 200), body
+
+
+
+# ================== ASGI ==================
+async def _route(method: str, path: str, params: dict, receive: Receive) -> Tuple[int, Any]:
+    path = path.rstrip("/") or "/"
+    if path == "/":
+        return 200, {"app": settings.app_name, "version": settings.app_version,
+                     "endpoints": ["/health", "/metrics", "/scrape/text", "/scrape/html", "/scrape/items", "/orders", "/orders/<order_no>", "/processed"]}
+    if path == "/health": return _health()
+    if path.startswith("/scrape/"):
+        kind = path[len("/scrape/"):]
+        if kind not in ("text", "html", "items"): raise HTTPError(404, f"Bilinmeyen uç: {path}")
+        if method == "POST": params = {**params, **await _read_json(receive)}
+        elif method != "GET": raise HTTPError(405, "GET veya POST kullanın.")
+        return await _scrape(kind, params)
+    if method != "GET": raise HTTPError(405, "Yalnızca GET.")
+    if path == "/orders" or path.startswith("/orders/"):
+        order_no = path[len("/orders/"):] if path.startswith("/orders/") else params.get("order_no")
+        try: limit = max(1, min(1000, int(params.get("limit", 100))))
+        except ValueError: raise HTTPError(400, "'limit' tam sayı olmalı.")
+        orders = await asyncio.to_thread(_query_orders, params.get("since"), order_no, limit)
+        if path.startswith("/orders/"):
+            if not orders: raise HTTPError(404, f"Sipariş bulunamadı: {order_no}")
+            return 200, orders[-1]
+        return 200, {"count": len(orders), "orders": orders}
+    if path == "/processed": return 200, await asyncio.to_thread(_processed, params.get("key"), params.get("namespace", "cards"))
+    raise HTTPError(404, f"Bilinmeyen uç: {path}")
+
+
+async def _lifespan(receive: Receive, send: Send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            jobs.start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await jobs.stop()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope: dict, receive: Receive, send: Send) -> None:
+    """ASGI giriş noktası (uvicorn src.service:app)."""
+    if scope["type"] == "lifespan": return await _lifespan(receive, send)
+    if scope["type"] != "http": return
+    params = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode("latin-1")).items()}
+    if scope["path"] == "/metrics": return await _send(send, 200, get_metrics().render(), content_type=METRICS_CONTENT_TYPE)
+    try: status, body = await _route(scope["method"], scope["path"], params, receive)
+    except HTTPError as e: return await _send(send, e.status, {"error": e.message}, e.headers)
+    except Exception as e:
+        logger.exception(f"Servis hatası: {scope['path']}")
+        return await _send(send, 500, {"error": f"{type(e).__name__}: {e}"})
+    await _send(send, status, body)
+
+
+def run() -> None:
+    import uvicorn
+    uvicorn.run("src.service:app", host=settings.host, port=settings.port, reload=settings.auto_reload,
+                log_level=settings.log_level.lower(), lifespan="on")
+
+
+if __name__ == "__main__":
+    run()
@@ -15,9 +15,10 @@ Author:
 
 from pathlib import Path
 from pydantic_settings import BaseSettings
-from typing import Optional, List
-import os, sys, subprocess, re, platform, shutil
+from typing import Dict, Optional, List
+import os, sys, subprocess, re, platform, shutil, json, threading
 from shutil import which
+from concurrent.futures import ThreadPoolExecutor
 
 
 
@@ -30,15 +31,30 @@ class Settings(BaseSettings):
     class BROWSER_CONFIG:
         headless: bool = False
         window_size: tuple = (1066, 600)
-        user_agent: str = ""
+        _user_agent: str = ""  # "" / "auto": ilk kullanımda sistem Chrome sürümünden algılanır
         user_agent_2: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        # İstek engelleme (src/request_policy.py; host bazlı override: request_policy_overrides)
         disable_images: bool = False
         disable_javascript: bool = False
+        disable_fonts: bool = False
+        disable_media: bool = False
+        block_third_party: bool = False  # bilinen analitik / reklam / sohbet widget alan adları
+        blocked_url_patterns: List[str] = []  # ek CDP desenleri, ör. "*/tracking/*"
+        allowed_hosts: List[str] = []  # üçüncü taraf engelinden muaf alan adları
         chrome_options: List[str] = []
         proxy: Optional[str] = None
         remote_debugging: bool = False
         remote_debugging_port: int = 9222
 
+        @property
+        def user_agent(self) -> str:
+            # Algılama (chrome --version) import anında değil, ilk ihtiyaçta yapılır
+            if self._user_agent in (None, "", "auto"): self._user_agent = _detect_system_chrome_user_agent(settings.chrome_binary_path)
+            return self._user_agent
+
+        @user_agent.setter
+        def user_agent(self, value: str) -> None: self._user_agent = value
+
     # Config Ayarları
     class Config:
         env_file = ".env"
@@ -48,26 +64,39 @@ class Settings(BaseSettings):
     app_name: str = "ScrapyBridge Microservice"
     app_version: str = "1.0.0"
     app_base_dir: str = str(Path(__file__).resolve().parent.parent)
-    print(app_base_dir)
     debug: bool = False
     
-    # Server Ayarları
+    # Server Ayarları (python -m src.service; işçi sayısı = max_concurrent_requests)
     host: str = "127.0.0.1"
     port: int = 8080
     auto_reload: bool = False
+    service_queue_size: int = 100  # dolunca yeni kazıma istekleri 429 alır
+    service_job_timeout: float = 120.0
     
     # Browser Ayarları
     browser_config: BROWSER_CONFIG = BROWSER_CONFIG()
     browser_timeout: int = 60
-    max_concurrent_requests: int = 5
+    max_concurrent_requests: int = 5  # scrap_page tarayıcı havuzu boyutu
+    # Havuz sürücüleri bu kadar gezinti / dakika sonra yenilenir; boştakiler bu aralıkla kontrol edilir (0 = kapalı)
+    pool_recycle_navigations: int = 50
+    pool_recycle_minutes: float = 30.0
+    pool_health_interval: float = 60.0
     
+    # HTTP (requests yolu): host başına bağlantı, havuzu tutulan host sayısı, 5xx/zaman aşımı yeniden denemesi
+    http_pool_maxsize: int = 10
+    http_pool_hosts: int = 20
+    http_retries: int = 3
+    http_backoff: float = 0.5  # saniye; her denemede 2 katı
+    http_backoff_jitter: float = 0.5  # her beklemeye eklenen rastgele 0..jitter saniye
+
     # Chrome/ChromeDriver Ayarları
     chrome_binary_path: Optional[str] = None
     chromedriver_path: str = str(Path(app_base_dir) / "src" / "chromedriver.exe")
 
-    # Güvenlik
+    # Güvenlik (boş allowed_domains = her alan adı; hız sınırı host başına, 0 = kapalı)
     allowed_domains: List[str] = []
     max_requests_per_minute: int = 600
+    rate_limit_burst: int = 10  # host başına beklemeden geçebilecek ani istek sayısı
     
     # Logging
     log_level: str = "INFO"
@@ -76,15 +105,69 @@ class Settings(BaseSettings):
     # Cache
     enable_cache: bool = True
     cache_ttl: int = 300  # 5 dakika
+    # Bellek katmanı bayt bütçesi; disk katmanı (boşsa user_cache_dir()/http) süresi geçen kayıtları
+    # yeniden doğrulama (ETag / Last-Modified) için cache_stale_keep saniye daha tutar
+    cache_memory_bytes: int = 32 * 1024 * 1024
+    cache_dir: Optional[str] = None
+    cache_stale_keep: int = 24 * 3600
+
+    # Hedef host'a göre istek politikası override'ları, ör. {"partner.tgoyemek.com": {"disable_images": True}}
+    request_policy_overrides: Dict[str, dict] = {}
+
+    # HTML Ayrıştırma ("auto" | "selectolax" | "lxml" | "html.parser")
+    html_parser: str = "auto"
+
+    # İzlenecek mağaza sipariş listeleri (boşsa main.TARGET_URL); her biri ayrı sekmede izlenir
+    store_targets: List[str] = []
+
+    # Sipariş yakalama ("click": kartlara tıklayıp paneli oku | "network": XHR yanıtlarını CDP ile oku)
+    capture_mode: str = "click"
+    # Yalnızca sipariş API uçları: /orders, /orders/<no>, /order/<no> (+ sorgu); dashboard sayfası (/order/list...) eşleşmez
+    order_api_url_patterns: List[str] = [r"/orders?(/[\w-]*\d[\w-]*|/details?/[\w-]+)?/?(\?|$)"]
+
+    # İşlenmiş sipariş indeksi (bellekte tutulacak en fazla anahtar; gerisi SQLite'tan okunur)
+    processed_index_hot_size: int = 5000
+
+    # Arka plan çıktı yazıcısı (sipariş logları / snapshot'lar)
+    writer_queue_size: int = 1000
+    writer_flush_interval: float = 1.0  # ilk işten sonra toplu yazıma kadar en fazla bekleme (saniye)
+    writer_fsync: str = "never"  # "never" | "batch" | "always"
+
+    # Snapshot deposu ("auto": zstandard kuruluysa zstd, değilse gzip)
+    snapshot_compression: str = "auto"
+    snapshot_archive_after_days: float = 2.0
+    snapshot_compact_interval: int = 3600  # saniye
+
+    # Yapısal sipariş çıktısı (JSONL, gün + boyut bazlı dönen dosyalar)
+    order_export_max_bytes: int = 50 * 1024 * 1024
+
+    # Ana döngü zamanlaması (saniye): aktivitede min aralık, boştayken backoff ile max aralığa kadar
+    poll_min_interval: float = 1.0
+    poll_max_interval: float = 15.0
+    poll_backoff: float = 1.5
+    list_snapshot_interval: float = 30.0  # 0 = kapalı
+
+    # Metrikler (Prometheus metin formatı): dosya boşsa SAVE_DIR/metrics.prom; interval 0 = dosya yok, port 0 = endpoint yok
+    metrics_file: Optional[str] = None
+    metrics_interval: float = 15.0
+    metrics_port: int = 0
+
+    # Sipariş aşamaları için Chrome trace-event JSON (chrome://tracing / Perfetto); dosya boşsa izleme kapalı
+    trace_file: Optional[str] = None
+    trace_interval: float = 60.0  # dosyanın periyodik yazımı; 0 = yalnızca kapanışta
+    trace_max_events: int = 200_000
     
     
 @staticmethod
 def _get_chrome_driver_path() -> str:
     """ChromeDriver'ın yolunu kontrol et veya indir."""
     chromedriver_path = Path(settings.chromedriver_path)
-    # Tarayıcı sürümünü erken al (mismatch kontrolü için)
+    # Tarayıcı ve driver sürümleri (mismatch kontrolü için) birbirinden bağımsız: paralel ölçülür
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        browser_future = pool.submit(_get_chrome_version, settings.chrome_binary_path)
+        driver_future = pool.submit(_get_chromedriver_version, chromedriver_path)
     try:
-        detected_browser_version = _get_chrome_version(settings.chrome_binary_path)
+        detected_browser_version = browser_future.result()
     except Exception:
         detected_browser_version = None
     need_download = True
@@ -94,7 +177,7 @@ def _get_chrome_driver_path() -> str:
             print(f"✅ Mevcut ChromeDriver bulundu: {chromedriver_path}")
         else:
             print(f"❌ Beklenmeyen konumda ChromeDriver bulundu: {chromedriver_path}")
-        drv_ver = _get_chromedriver_version(chromedriver_path)
+        drv_ver = driver_future.result()
         if drv_ver:
             print(f"Mevcut ChromeDriver sürümü: {drv_ver}")
         if detected_browser_version and drv_ver:
@@ -170,37 +253,63 @@ def _extract_version(text: str) -> Optional[str]:
     m = re.search(r"(\d+\.\d+\.\d+\.\d+)", text)
     return m.group(1) if m else None
 
+def user_cache_dir() -> Path:
+    """Kullanıcı önbellek dizini (kaynak ağacının dışında): Windows %LOCALAPPDATA%, diğerleri $XDG_CACHE_HOME veya ~/.cache."""
+    if platform.system() == "Windows" and os.environ.get("LOCALAPPDATA"): return Path(os.environ["LOCALAPPDATA"]) / "ScrapyBridge" / "cache"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "scrapybridge"
+
+# Sürüm probları diskte önbelleklenir: anahtar = ikili dosya yolu + mtime + boyut (güncellenince yeniden ölçülür)
+_VERSION_CACHE_PATH = user_cache_dir() / "version_probes.json"
+_version_cache: Optional[dict] = None
+_version_cache_lock = threading.Lock()
+
+def _probe_version(binary: Path) -> Optional[str]:
+    """'<binary> --version' çıktısındaki sürümü döner; sonuç (yol, mtime, boyut) anahtarıyla önbelleklenir."""
+    global _version_cache
+    try:
+        st = binary.stat()
+        key = f"{binary.resolve()}|{st.st_mtime_ns}|{st.st_size}"
+    except OSError: return None
+    with _version_cache_lock:
+        if _version_cache is None:
+            try: _version_cache = json.loads(_VERSION_CACHE_PATH.read_text(encoding="utf-8"))
+            except Exception: _version_cache = {}
+        if key in _version_cache: return _version_cache[key]
+    try:
+        proc = subprocess.run([str(binary), "--version"], capture_output=True, text=True, timeout=5)
+        ver = _extract_version((proc.stdout or proc.stderr or "").strip())
+    except Exception: return None
+    if ver is None: return None
+    with _version_cache_lock:
+        # aynı yolun eski (mtime'ı değişmiş) kayıtları atılır
+        prefix = key.rsplit("|", 2)[0] + "|"
+        _version_cache = {k: v for k, v in _version_cache.items() if not k.startswith(prefix)}
+        _version_cache[key] = ver
+        try:
+            _VERSION_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp = _VERSION_CACHE_PATH.with_suffix(".tmp")
+            tmp.write_text(json.dumps(_version_cache, indent=1), encoding="utf-8")
+            os.replace(tmp, _VERSION_CACHE_PATH)
+        except OSError: pass
+    return ver
+
 def _get_chrome_version(explicit_path: Optional[str]) -> Optional[str]:
     """Chrome sürümünü dizinden veya komutla algılar."""
     paths = []
     if explicit_path: paths.append(Path(explicit_path))
     candidates = list(_candidate_chrome_paths())
-    print(f"Algılanan Chrome yolları: {candidates}")
     paths.extend(candidates)
     for p in paths:
         if not p or not p.exists(): continue
-        try:
-            # Doğrudan chrome --version komutu ile dene
-            proc = subprocess.run([str(p), "--version"], capture_output=True, text=True, timeout=5)
-            out = (proc.stdout or proc.stderr or "").strip()
-            ver = _extract_version(out)
-            if ver: return ver
-        except Exception:
-            continue
+        ver = _probe_version(p)
+        if ver: return ver
     return None
 
 def _get_chromedriver_version(driver_path: Path) -> Optional[str]:
-    """chromedriver --version çıktısından sürümü al."""
+    """chromedriver --version çıktısından sürümü al. Ör: 'ChromeDriver 137.0.7151.119 ...'"""
     if not driver_path or not driver_path.exists():
         return None
-    try:
-        proc = subprocess.run([str(driver_path), "--version"], capture_output=True, text=True, timeout=5)
-        out = (proc.stdout or proc.stderr or "").strip()
-        # Ör: 'ChromeDriver 137.0.7151.119 ...'
-        m = re.search(r"(\d+\.\d+\.\d+\.\d+)", out)
-        return m.group(1) if m else None
-    except Exception:
-        return None
+    return _probe_version(driver_path)
 
 def _build_user_agent(version: str) -> str:
     # Windows NT kısmını platforma göre uyarlayabilirsin; şimdilik sabit Windows UA formatı.
@@ -209,20 +318,13 @@ def _build_user_agent(version: str) -> str:
 def _detect_system_chrome_user_agent(chrome_path: Optional[str]) -> str:
     version = _get_chrome_version(chrome_path)
     print("Algılanan Chrome sürümü:", version)
-    if version: return _build_user_agent(version)
-    print("Chrome sürümü algılanamadı, varsayılan User-Agent kullanılacak.")
-    return settings.browser_config.user_agent_2
+    ua = _build_user_agent(version) if version else settings.browser_config.user_agent_2
+    if not version: print("Chrome sürümü algılanamadı, varsayılan User-Agent kullanılacak.")
+    print("Aktif User-Agent:", ua)
+    return ua
 
 
 
 
-# Global settings instance
+# Global settings instance (import yan etkisizdir: alt süreç, print veya dizin oluşturma yok)
 settings = Settings()
-
-
-
-# Otomatik user-agent doldurma
-if settings.browser_config.user_agent in (None, "", "auto"):  settings.browser_config.user_agent = _detect_system_chrome_user_agent(settings.chrome_binary_path)
-
-# İstersen log seviyesine göre bildir
-print("Aktif User-Agent:", settings.browser_config.user_agent)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - SINGLE-FLIGHT FETCH COALESCING
+===========================================================
+
+Description:
+    Aynı anahtar (URL + sonucu değiştiren fetch seçenekleri) için
+    eşzamanlı gelen istekler tek bir çekimi paylaşır: ilk gelen
+    ("lider") çekimi yapar, çekim sürerken gelen diğerleri onun
+    sonucunu (veya hatasını) alır. Çekim bitince anahtar serbest
+    kalır; sonraki istekler önbelleğe / ağa yeniden gider.
+
+        - Thread'ler : do()  -> concurrent.futures.Future üzerinden bekler
+        - Async      : ado() -> aynı Future'ı event loop'u bloklamadan
+                       bekler; sync ve async çağıranlar aynı çekimi paylaşır
+        - İptal      : bekleyen bir async çağıranın iptali çekimi ve
+                       diğer bekleyenleri etkilemez
+
+    scrap_page (fetch_raw_html / scrape_info_items / scrap_all_pages),
+    batch_scrape ve service bu katmandan geçer; sayaçlar stats() ile.
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import asyncio, inspect, logging, threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+
+class SingleFlight:
+    """Anahtar başına en fazla bir uçuşta çekim; thread-safe, sync ve async çağıranları birlikte destekler."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._tasks: Set[asyncio.Task] = set()  # async liderlerin task'ları (loop yalnızca zayıf referans tutar)
+        self.issued = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            fut = self._calls.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                return fut, False
+            fut = self._calls[key] = Future()
+            self.issued += 1
+            return fut, True
+
+    def _finish(self, key: Hashable, fut: Future, result: Any = None, exc: Optional[BaseException] = None, cancelled: bool = False) -> None:
+        with self._lock: self._calls.pop(key, None)
+        if cancelled: fut.cancel()
+        elif exc is not None: fut.set_exception(exc)
+        else: fut.set_result(result)
+
+    def _lead(self, key: Hashable, fut: Future, fn: Callable[..., Any], args: tuple, kwargs: dict, reraise: bool = True) -> Any:
+        try: result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, fut, exc=e)
+            if reraise: raise
+            return None  # hata paylaşılan Future üzerinden iletilir
+        self._finish(key, fut, result)
+        return result
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """fn(*args, **kwargs) sonucunu döner; aynı key zaten uçuştaysa onun sonucunu bekler."""
+        fut, leader = self._join(key)
+        if leader: return self._lead(key, fut, fn, args, kwargs)
+        return fut.result()
+
+    async def ado(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """do()'nun async karşılığı; fn coroutine fonksiyonu ise task olarak, değilse thread'de çalışır."""
+        fut, leader = self._join(key)
+        if leader:
+            if inspect.iscoroutinefunction(fn):
+                def done(task: asyncio.Task) -> None:
+                    if task.cancelled(): self._finish(key, fut, cancelled=True)
+                    else: self._finish(key, fut, task.result() if task.exception() is None else None, task.exception())
+                task = asyncio.ensure_future(fn(*args, **kwargs))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                task.add_done_callback(done)
+            else:
+                asyncio.get_running_loop().run_in_executor(None, lambda: self._lead(key, fut, fn, args, kwargs, reraise=False))
+        # shield: bu çağıranın iptali paylaşılan Future'ı iptal etmesin
+        return await asyncio.shield(asyncio.wrap_future(fut))
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock: return len(self._calls)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.issued + self.coalesced
+            return {"issued": self.issued, "coalesced": self.coalesced, "in_flight": len(self._calls),
+                    "coalesce_ratio": round(self.coalesced / total, 3) if total else 0.0}
+
+
+
+def fetch_key(url: str, *, encoding: Optional[str] = None, use_browser: bool = True) -> tuple:
+    """Çekim anahtarı: yalnızca dönen HTML'i değiştiren seçenekler (timeout dahil değil; bekleyen lideri kabul eder)."""
+    return ("html", url, encoding or "", bool(use_browser))
+
+
+_flight: Optional[SingleFlight] = None
+_flight_lock = threading.Lock()
+
+def get_single_flight() -> SingleFlight:
+    """SingleFlight nesnesini döner, yoksa oluşturur."""
+    global _flight
+    if _flight is None:
+        with _flight_lock:
+            if _flight is None: _flight = SingleFlight()
+    return _flight
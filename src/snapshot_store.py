@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - SNAPSHOT STORE
+===========================================================
+
+Description:
+    HTML snapshot'ları için içerik adresli (sha256), sıkıştırılmış
+    depo. Aynı içerik bir kez saklanır; her kayıt küçük bir SQLite
+    indeksinde (zaman / prefix / başlık -> hash) tutulur.
+
+    Dizin yapısı (SAVE_DIR/snapshots):
+        index.sqlite3               indeks
+        objects/ab/abcdef....zst    gevşek nesneler (zstd yoksa .gz)
+        archives/202601.zip         compact() ile toplanmış eski nesneler
+
+    compact() belirli günden eski gevşek nesneleri aylık zip
+    arşivlerine taşır; böylece dizin listeleme maliyeti ve disk
+    kullanımı haftalarca çalışmada sabit kalır.
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import gzip, hashlib, logging, os, sqlite3, threading, time, zipfile
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+
+def _zstd():
+    try:
+        import zstandard
+        return zstandard
+    except Exception: return None
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zst": return _zstd().ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zst": return _zstd().ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+
+class SnapshotStore:
+    """İçerik adresli, sıkıştırılmış, arşivlenebilir snapshot deposu (thread-safe)."""
+
+    def __init__(self, root: str, compression: str = "auto", archive_after_days: float = 2.0, compact_interval: float = 3600.0) -> None:
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.archives_dir = os.path.join(root, "archives")
+        if compression == "auto": compression = "zst" if _zstd() else "gz"
+        if compression == "zst" and not _zstd():
+            logger.warning("zstandard kurulu değil, gzip kullanılacak.")
+            compression = "gz"
+        self.codec = compression
+        self.archive_after_days = archive_after_days
+        self.compact_interval = compact_interval
+        self._last_compact = 0.0
+        self._lock = threading.RLock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.archives_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS objects (
+                hash TEXT PRIMARY KEY, codec TEXT NOT NULL, size INTEGER NOT NULL, raw_size INTEGER NOT NULL,
+                created REAL NOT NULL, last_seen REAL NOT NULL, archive TEXT
+            );
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY, ts TEXT NOT NULL, prefix TEXT NOT NULL, title TEXT NOT NULL,
+                hash TEXT NOT NULL REFERENCES objects(hash)
+            );
+            CREATE INDEX IF NOT EXISTS snapshots_ts ON snapshots(ts);
+            CREATE INDEX IF NOT EXISTS snapshots_prefix_ts ON snapshots(prefix, ts);
+        """)
+
+    def _object_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.{codec}")
+
+    # ---------- yazma ----------
+    def put(self, html: str, prefix: str, title: str, ts: Optional[str] = None) -> str:
+        """Snapshot'ı sakla; içerik hash'ini döner. Aynı içerik tekrar yazılmaz."""
+        data = (html or "").encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        ts = ts or datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM objects WHERE hash=?", (digest,)).fetchone()
+            if row: self._conn.execute("UPDATE objects SET last_seen=? WHERE hash=?", (now, digest))
+            else:
+                blob = _compress(data, self.codec)
+                path = self._object_path(digest, self.codec)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f: f.write(blob)
+                os.replace(tmp, path)
+                self._conn.execute(
+                    "INSERT INTO objects (hash, codec, size, raw_size, created, last_seen, archive) VALUES (?, ?, ?, ?, ?, ?, NULL)",
+                    (digest, self.codec, len(blob), len(data), now, now),
+                )
+            self._conn.execute("INSERT INTO snapshots (ts, prefix, title, hash) VALUES (?, ?, ?, ?)", (ts, prefix, title, digest))
+        self.maybe_compact()
+        return digest
+
+    # ---------- okuma ----------
+    def get(self, digest: str) -> Optional[str]:
+        """Hash'e karşılık gelen HTML'i (gevşek nesneden veya arşivden) döner."""
+        with self._lock:
+            row = self._conn.execute("SELECT codec, archive FROM objects WHERE hash=?", (digest,)).fetchone()
+        if not row: return None
+        codec, archive = row
+        if archive:
+            with zipfile.ZipFile(os.path.join(self.archives_dir, archive)) as zf: blob = zf.read(f"{digest}.{codec}")
+        else:
+            with open(self._object_path(digest, codec), "rb") as f: blob = f.read()
+        return _decompress(blob, codec).decode("utf-8")
+
+    def find(self, prefix: Optional[str] = None, since: Optional[str] = None, title: Optional[str] = None, limit: int = 100) -> list:
+        """İndeksten kayıt ara: [(ts, prefix, title, hash)] (en yeni önce)."""
+        sql, args = "SELECT ts, prefix, title, hash FROM snapshots WHERE 1=1", []
+        if prefix: sql, args = sql + " AND prefix=?", args + [prefix]
+        if since: sql, args = sql + " AND ts>=?", args + [since]
+        if title: sql, args = sql + " AND title LIKE ?", args + [f"%{title}%"]
+        sql += " ORDER BY ts DESC LIMIT ?"
+        with self._lock: return self._conn.execute(sql, args + [limit]).fetchall()
+
+    def iter_html(self, prefix: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """Benzersiz nesneleri (hash, html) olarak dolaşır."""
+        sql = "SELECT DISTINCT hash FROM snapshots" + (" WHERE prefix=?" if prefix else "")
+        with self._lock: hashes = [h for (h,) in self._conn.execute(sql, (prefix,) if prefix else ()).fetchall()]
+        for h in hashes:
+            html = self.get(h)
+            if html is not None: yield h, html
+
+    def stats(self) -> dict:
+        with self._lock:
+            snaps = self._conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+            objs, size, raw, loose = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size),0), COALESCE(SUM(raw_size),0), COALESCE(SUM(archive IS NULL),0) FROM objects"
+            ).fetchone()
+        return {"snapshots": snaps, "objects": objs, "loose_objects": loose, "stored_bytes": size, "raw_bytes": raw}
+
+    # ---------- arşivleme ----------
+    def maybe_compact(self) -> int:
+        """compact_interval dolduysa compact() çalıştırır."""
+        if time.time() - self._last_compact < self.compact_interval: return 0
+        return self.compact()
+
+    def compact(self, older_than_days: Optional[float] = None) -> int:
+        """Son görülmesi verilen günden eski gevşek nesneleri aylık zip arşivlerine taşır."""
+        days = self.archive_after_days if older_than_days is None else older_than_days
+        cutoff = time.time() - days * 86400
+        moved = 0
+        with self._lock:
+            self._last_compact = time.time()
+            rows = self._conn.execute("SELECT hash, codec, last_seen FROM objects WHERE archive IS NULL AND last_seen < ?", (cutoff,)).fetchall()
+            by_archive: dict = {}
+            for digest, codec, last_seen in rows:
+                by_archive.setdefault(datetime.fromtimestamp(last_seen).strftime("%Y%m") + ".zip", []).append((digest, codec))
+            for archive, items in by_archive.items():
+                archive_path = os.path.join(self.archives_dir, archive)
+                with zipfile.ZipFile(archive_path, "a", compression=zipfile.ZIP_STORED) as zf:
+                    existing = set(zf.namelist())
+                    for digest, codec in items:
+                        name = f"{digest}.{codec}"
+                        if name not in existing: zf.write(self._object_path(digest, codec), name)
+                for digest, codec in items:
+                    self._conn.execute("UPDATE objects SET archive=? WHERE hash=?", (archive, digest))
+                    try: os.remove(self._object_path(digest, codec))
+                    except OSError: pass
+                    moved += 1
+            # boş kalan alt dizinleri temizle
+            for sub in os.listdir(self.objects_dir):
+                p = os.path.join(self.objects_dir, sub)
+                if os.path.isdir(p) and not os.listdir(p): os.rmdir(p)
+        if moved: logger.info(f"Snapshot compaction: {moved} nesne arşive taşındı.")
+        return moved
+
+    def close(self) -> None:
+        with self._lock:
+            try: self._conn.close()
+            except Exception as e: logger.debug(f"Snapshot store kapatma hatası: {e}")
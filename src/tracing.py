@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+===========================================================
+        SCRAPY BRIDGE - ORDER TRACE TIMELINE
+===========================================================
+
+Description:
+    Sipariş hattının aşamaları için hafif span ölçümü ve Chrome
+    trace-event JSON dışa aktarımı (chrome://tracing, ui.perfetto.dev).
+        - Kapalıyken  : span() paylaşılan boş bağlam döner; zaman
+                        ölçülmez, olay tutulmaz
+        - Açmak için  : settings.trace_file (boşsa kapalı)
+        - Bellek      : en fazla settings.trace_max_events olay (eskiler
+                        düşer); dosya trace_interval saniyede bir ve
+                        kapanışta atomik yazılır
+        - Görünüm     : her thread ayrı iz (WebDriver yürütücüsü, writer
+                        thread'i...); iç içe span'ler hiyerarşi olarak
+                        görünür, "order" span'i bir siparişin kritik yolunu
+                        (kaydırma, tıklama, panel bekleme, ayrıştırma, log,
+                        snapshot) tek satırda toplar
+
+    Kullanım:
+        tracer = get_tracer()
+        with tracer.span("order", key=key) as sp:
+            with tracer.span("click"): ...
+            sp.set(clicked=True)
+
+Author:
+    mefamex (info@mefamex.com)
+
+===========================================================
+"""
+
+from __future__ import annotations
+import collections, json, logging, os, threading, time
+from typing import Any, Deque, Dict, Optional
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+
+class _NullSpan:
+    """Tracer kapalıyken dönen tekil bağlam: hiçbir şey yapmaz."""
+    __slots__ = ()
+    def __enter__(self) -> "_NullSpan": return self
+    def __exit__(self, *exc) -> bool: return False
+    def set(self, **args: Any) -> None: pass
+
+_NULL_SPAN = _NullSpan()
+
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        end = time.perf_counter_ns()
+        if exc_type is not None: self.args["error"] = exc_type.__name__
+        self.tracer._complete(self.name, self.cat, self.start, end, self.args)
+        return False
+
+    def set(self, **args: Any) -> None:
+        """Span sürerken öğrenilen bilgileri (sipariş anahtarı, boyut...) ekler."""
+        self.args.update(args)
+
+
+
+class Tracer:
+    """Thread-safe Chrome trace-event toplayıcı; enabled=False iken span() maliyeti bir öznitelik kontrolüdür."""
+
+    def __init__(self, enabled: bool = False, max_events: int = 200_000) -> None:
+        self.enabled = enabled
+        self._events: Deque[dict] = collections.deque(maxlen=max(1, max_events))
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self.dropped = 0
+
+    def span(self, name: str, cat: str = "order", **args: Any):
+        """with tracer.span("click", key=...): ... ; kapalıysa boş bağlam."""
+        if not self.enabled: return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def instant(self, name: str, cat: str = "order", **args: Any) -> None:
+        """Süresiz olay (ör. tıklama başarısız); zaman çizgisinde dikey çizgi olarak görünür."""
+        if not self.enabled: return
+        self._add({"name": name, "cat": cat, "ph": "i", "s": "t", "ts": self._us(time.perf_counter_ns()), "args": args})
+
+    def _us(self, ns: int) -> float: return (ns - self._t0) / 1000.0
+
+    def _complete(self, name: str, cat: str, start: int, end: int, args: Dict[str, Any]) -> None:
+        self._add({"name": name, "cat": cat, "ph": "X", "ts": self._us(start), "dur": (end - start) / 1000.0, "args": args})
+
+    def _add(self, event: dict) -> None:
+        thread = threading.current_thread()
+        event["pid"], event["tid"] = self._pid, thread.ident
+        with self._lock:
+            if thread.ident not in self._threads: self._threads[thread.ident] = thread.name
+            if len(self._events) == self._events.maxlen: self.dropped += 1
+            self._events.append(event)
+
+    def events(self) -> list:
+        """Thread adı meta olayları + toplanan olaylar (Chrome trace-event formatı)."""
+        with self._lock:
+            events, threads = list(self._events), dict(self._threads)
+        meta = [{"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": "ScrapyBridge"}}]
+        meta.extend({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}} for tid, name in threads.items())
+        return meta + events
+
+    def write(self, path: str) -> int:
+        """Atomik JSON yazımı (önce .tmp, sonra os.replace); yazılan olay sayısını döner."""
+        events = self.events()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped_events": self.dropped}}, f, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+        return len(events)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self.dropped = 0
+
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+def get_tracer() -> Tracer:
+    """Tracer nesnesini döner, yoksa oluşturur (settings.trace_file doluysa açık)."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None: _tracer = Tracer(enabled=bool(settings.trace_file), max_events=settings.trace_max_events)
+    return _tracer
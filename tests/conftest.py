@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Testler depo kökünden çalıştırılır: python -m pytest -q"""
+
+import os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path: sys.path.insert(0, ROOT)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import asyncio, json, socket, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+import src.batch_scrape as batch_scrape
+import src.rate_limiter as rate_limiter
+from src.settings import settings
+
+
+@pytest.fixture
+def server():
+    """/page/<n>?delay=s: metin sayfası; /flaky: ilk istek 503; bilinmeyen yol 404. Eşzamanlı istek sayısını ölçer."""
+    state = {"hits": [], "active": 0, "max_active": 0, "lock": threading.Lock()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        def log_message(self, *args): pass
+
+        def _send(self, status: int, body: str = "") -> None:
+            raw = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            with state["lock"]:
+                state["hits"].append(parts.path)
+                state["active"] += 1
+                state["max_active"] = max(state["max_active"], state["active"])
+            try:
+                time.sleep(float(parse_qs(parts.query).get("delay", ["0"])[0]))
+                if parts.path.startswith("/page/"): self._send(200, f"<html><body><p>sayfa {parts.path[6:]}</p></body></html>")
+                elif parts.path == "/flaky": self._send(503 if state["hits"].count("/flaky") == 1 else 200, "<p>toparlandı</p>")
+                else: self._send(404, "yok")
+            finally:
+                with state["lock"]: state["active"] -= 1
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(settings, "enable_cache", False)
+    monkeypatch.setattr(settings, "http_retries", 2)
+    monkeypatch.setattr(settings, "http_backoff", 0.01)
+    monkeypatch.setattr(settings, "http_backoff_jitter", 0.0)
+    monkeypatch.setattr(rate_limiter, "_limiter", rate_limiter.RateLimiter(allowed_domains=[]))
+
+
+def _refused_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}/"
+
+
+async def _collect(urls, **kw) -> list:
+    return [r async for r in batch_scrape.scrape_many(urls, mode="text", **kw)]
+
+
+def test_failures_are_isolated_per_url(server):
+    base, state = server
+    urls = [base + "/page/1", base + "/missing", _refused_url(), base + "/flaky", base + "/page/2"]
+    results = sorted(asyncio.run(_collect(urls, concurrency=3)), key=lambda r: r["index"])
+    assert [r["ok"] for r in results] == [True, False, False, True, True]
+    assert results[0]["text"] == "sayfa 1" and results[3]["text"] == "toparlandı"
+    assert "404" in results[1]["error"] and "ClientConnector" in results[2]["error"]
+    assert state["hits"].count("/flaky") == 2 and state["hits"].count("/missing") == 1  # 5xx yeniden denenir, 4xx denenmez
+    assert all(r["url"] == urls[r["index"]] for r in results)
+
+
+def test_concurrency_is_bounded_and_results_stream(server):
+    base, state = server
+    urls = [base + "/page/0?delay=0.4"] + [base + f"/page/{i}?delay=0.05" for i in range(1, 12)]
+    results = asyncio.run(_collect(urls, concurrency=3))
+    assert len(results) == 12 and all(r["ok"] for r in results)
+    assert state["max_active"] == 3
+    assert results[0]["index"] != 0  # yavaş ilk URL, arkasındakilerin teslimini bekletmez
+
+
+def test_early_exit_cancels_remaining_work(server):
+    base, state = server
+    urls = [base + f"/page/{i}?delay=0.1" for i in range(50)]
+
+    async def first_only():
+        async for result in batch_scrape.scrape_many(urls, mode="text", concurrency=2): return result
+
+    assert asyncio.run(first_only())["ok"]
+    time.sleep(0.3)
+    assert len(state["hits"]) <= 4
+
+
+def test_cli_reads_url_file_and_writes_jsonl(server, tmp_path, capsys):
+    base, _ = server
+    url_file, out_file = tmp_path / "urls.txt", tmp_path / "out.jsonl"
+    url_file.write_text(f"# yorum\n{base}/page/7\n\n{base}/missing\n", encoding="utf-8")
+    assert asyncio.run(batch_scrape._run_cli([str(url_file), "-o", str(out_file), "--mode", "text"])) == 1
+    rows = sorted((json.loads(line) for line in out_file.read_text(encoding="utf-8").splitlines()), key=lambda r: r["index"])
+    assert [(r["index"], r["ok"]) for r in rows] == [(0, True), (1, False)] and rows[0]["text"] == "sayfa 7"
+    assert "1 başarılı" in capsys.readouterr().err
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import asyncio, threading, time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import src.browser_pool as bp
+from src.browser_pool import BrowserPool, PooledDriver, PoolTimeout
+
+
+class FakeDriver:
+    """Chrome yerine: gezintileri ve kapanışı kaydeder."""
+    def __init__(self) -> None:
+        self.visited, self.quit_called, self.healthy = [], False, True
+    def set_page_load_timeout(self, seconds): pass
+    def execute_cdp_cmd(self, cmd, params): return {}
+    def get(self, url): self.visited.append(url)
+    @property
+    def page_source(self): return f"<html>{self.visited[-1]}</html>"
+    @property
+    def title(self):
+        if not self.healthy: raise WebDriverException("oturum yanıt vermiyor")
+        return "ok"
+    def quit(self): self.quit_called = True
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    """PooledDriver._start yerine sahte sürücü üreten fabrika; açılan sürücüleri listeler."""
+    made = []
+    def fake_start(self):
+        self.driver = FakeDriver()
+        made.append(self.driver)
+    monkeypatch.setattr(PooledDriver, "_start", fake_start)
+    monkeypatch.setattr(bp, "get_rate_limiter", lambda: type("L", (), {"acquire": lambda self, url: 0.0})())
+    return made
+
+
+def _pool(**kw):
+    kw = {"size": 1, "recycle_navigations": 0, "recycle_minutes": 0, "health_interval": 0, **kw}
+    return BrowserPool(**kw)
+
+
+def test_exhausted_pool_blocks_until_release(drivers):
+    pool = _pool()
+    first = pool.acquire()
+    with pytest.raises(PoolTimeout): pool.acquire(timeout=0.05)
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=2)))
+    waiter.start()
+    time.sleep(0.05)
+    assert got == []  # hâlâ bekliyor
+    pool.release(first)
+    waiter.join(2)
+    assert got == [first] and pool.created == 1 and len(drivers) == 1
+    pool.release(first)
+    pool.close()
+
+
+def test_recycle_after_n_navigations(drivers):
+    pool = _pool(recycle_navigations=2)
+    assert [pool.navigate(f"https://a.example/{i}") for i in range(3)] == [f"<html>https://a.example/{i}</html>" for i in range(3)]
+    assert len(drivers) == 2 and drivers[0].quit_called and not drivers[1].quit_called
+    assert drivers[0].visited == ["https://a.example/0", "https://a.example/1"] and drivers[1].visited == ["https://a.example/2"]
+    assert pool.stats()["recycled"] == 1 and pool.stats()["created"] == 2
+    pool.close()
+    assert drivers[1].quit_called
+
+
+def test_recycle_after_minutes(drivers):
+    pool = _pool(recycle_minutes=1)
+    pd = pool.acquire()
+    pool.release(pd)
+    pd.created_at -= 61
+    assert pool.acquire() is not pd and drivers[0].quit_called and pool.recycled == 1
+    pool.close()
+
+
+def test_webdriver_error_in_checkout_retires_driver(drivers):
+    pool = _pool()
+    with pytest.raises(WebDriverException):
+        with pool.checkout() as pd: raise WebDriverException("sekme çöktü")
+    assert pd.broken and drivers[0].quit_called and pool.recycled == 0
+    with pool.checkout() as pd2: assert pd2 is not pd
+    pool.close()
+
+
+def test_health_thread_replaces_unhealthy_idle_driver(drivers):
+    pool = _pool(size=2, health_interval=0.05)
+    healthy, sick = pool.acquire(), pool.acquire()
+    sick.driver.healthy = False
+    sick_driver = sick.driver
+    pool.release(healthy)
+    pool.release(sick)
+    deadline = time.monotonic() + 3
+    while pool.active == 2 and time.monotonic() < deadline: time.sleep(0.02)
+    assert pool.health_failures == 1 and sick_driver.quit_called
+    assert pool.stats()["idle"] == 1 and pool.active == 1
+    fresh = pool.acquire(timeout=1)
+    other = pool.acquire(timeout=1)
+    assert {fresh, other} & {healthy} and len(drivers) == 3 and all(p.driver.healthy for p in (fresh, other))
+    pool.release(fresh), pool.release(other)
+    pool.close()
+
+
+def test_async_checkout(drivers):
+    pool = _pool()
+
+    async def scenario():
+        async with pool.acheckout() as pd: return await asyncio.to_thread(pd.call, lambda driver: driver.title)
+
+    assert asyncio.run(scenario()) == "ok" and pool.stats()["idle"] == 1
+    pool.close()
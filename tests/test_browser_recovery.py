@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import asyncio, json, threading
+
+import pytest
+
+import src.main as app
+from src.browser_manager import BrowserManager
+from src.settings import settings
+
+
+def _manager(monkeypatch, probe=False, reattach=False, new_session="ok", chromedriver_alive=True, relaunch=True):
+    """Tekil sınıfı atlayan, kademe yöntemleri sahte BrowserManager; çağrılan kademeleri kaydeder."""
+    bm = object.__new__(BrowserManager)
+    bm._initialized = False
+    bm.__init__()
+    bm.driver, bm.calls = object(), []
+
+    def step(name, outcome):
+        def run(*args):
+            bm.calls.append(name)
+            if isinstance(outcome, Exception): raise outcome
+            return outcome
+        return run
+
+    async def close_browser():
+        bm.calls.append("close")
+        bm.driver = None
+
+    async def initialize_browser():
+        bm.calls.append("initialize")
+        return relaunch
+
+    bm._probe_session = step("probe", probe)
+    bm._reattach = step("reattach", reattach)
+    bm._new_session = step("new_session", new_session)
+    bm._chromedriver_alive = lambda: chromedriver_alive
+    bm.close_browser, bm.initialize_browser = close_browser, initialize_browser
+    return bm
+
+
+@pytest.mark.parametrize("kw, method, calls", [
+    ({"probe": True}, "alive", ["probe"]),
+    ({"probe": RuntimeError("bağlantı koptu"), "reattach": True}, "reattach", ["probe", "reattach"]),
+    ({}, "new_session", ["probe", "reattach", "new_session"]),
+    ({"new_session": RuntimeError("Chrome açılmadı")}, "relaunch", ["probe", "reattach", "new_session", "close", "initialize"]),
+    ({"chromedriver_alive": False}, "relaunch", ["probe", "close", "initialize"]),
+    ({"chromedriver_alive": False, "relaunch": False}, None, ["probe", "close", "initialize"]),
+])
+def test_recover_escalates_from_cheapest_tier(monkeypatch, kw, method, calls):
+    bm = _manager(monkeypatch, **kw)
+    try:
+        assert asyncio.run(bm.recover(timeout=2)) == method
+        assert bm.calls == calls
+        assert bm.session_count == (1 if method == "new_session" else 0)
+    finally: bm.executor.shutdown()
+
+
+class _Writer:
+    def __init__(self): self.appended = []
+    def append(self, path, content): self.appended.append((path, content))
+
+
+@pytest.mark.parametrize("method", ["reattach", "new_session"])
+def test_recover_browser_logs_method_and_mttr(monkeypatch, tmp_path, method):
+    bm = _manager(monkeypatch)
+    threads = []
+
+    async def recover(): return method
+    bm.recover = recover
+    bm.enable_network_capture = lambda: threads.append(threading.current_thread().name) or True
+    writer = _Writer()
+    monkeypatch.setattr(app, "browser_manager", bm)
+    monkeypatch.setattr(app, "output_writer", writer)
+    monkeypatch.setattr(app, "RECOVERY_LOG", str(tmp_path / "recoveries.jsonl"))
+    monkeypatch.setattr(app, "_recovery_times", [])
+    monkeypatch.setattr(app, "_open_store_tabs", lambda driver: 2)
+    monkeypatch.setattr(settings, "capture_mode", "network")
+
+    async def scenario():
+        state = app._RunState()
+        ok = await app._recover_browser(state, 0)
+        again = await app._recover_browser(state, 0)  # başka görev zaten kurtardı: tekrar denenmez
+        return ok, again, state.generation
+
+    try: assert asyncio.run(scenario()) == (True, True, 1)
+    finally: bm.executor.shutdown()
+    (path, line), = writer.appended
+    record = json.loads(line)
+    assert path == str(tmp_path / "recoveries.jsonl")
+    assert (record["method"], record["reopened_tabs"]) == (method, 2) and record["mttr"] == record["seconds"]
+    # yeni oturumda network capture yeniden açılır, driver yürütücüsünün thread'inde
+    assert threads == (["driver-exec-main"] if method == "new_session" else [])
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import asyncio, threading, time
+
+import pytest
+
+from src.driver_executor import PRIORITY_BULK, PRIORITY_HEALTH, PRIORITY_NORMAL, CommandDeadlineExceeded, DriverCommandExecutor
+
+
+@pytest.fixture
+def executor():
+    ex = DriverCommandExecutor("test")
+    yield ex
+    ex.shutdown(timeout=2)
+
+
+def _block(ex):
+    """Worker'ı meşgul eden komut; sonraki gönderimler kuyrukta bekler."""
+    started, release = threading.Event(), threading.Event()
+    def blocker():
+        started.set()
+        release.wait(2)
+    fut = ex.submit(blocker)
+    assert started.wait(2)
+    return fut, release
+
+
+def test_priority_then_fifo_order(executor):
+    blocked, release = _block(executor)
+    order = []
+    futs = [executor.submit(order.append, name, priority=p) for name, p in
+            [("bulk1", PRIORITY_BULK), ("normal1", PRIORITY_NORMAL), ("health", PRIORITY_HEALTH), ("normal2", PRIORITY_NORMAL), ("bulk2", PRIORITY_BULK)]]
+    assert executor.pending == 5
+    release.set()
+    for f in futs: f.result(2)
+    assert order == ["health", "normal1", "normal2", "bulk1", "bulk2"]
+    assert executor.executed == 6
+
+
+def test_deadline_expires_before_start(executor):
+    blocked, release = _block(executor)
+    ran = []
+    late = executor.submit(ran.append, "geç", deadline=0.05)
+    on_time = executor.submit(ran.append, "zamanında", deadline=5)
+    time.sleep(0.1)
+    release.set()
+    with pytest.raises(CommandDeadlineExceeded): late.result(2)
+    on_time.result(2)
+    assert ran == ["zamanında"] and executor.expired == 1
+
+
+def test_cancelled_queued_command_is_skipped(executor):
+    blocked, release = _block(executor)
+    ran = []
+    queued = executor.submit(ran.append, "iptal")
+    assert queued.cancel()
+    after = executor.submit(ran.append, "sonra")
+    release.set()
+    after.result(2)
+    assert ran == ["sonra"] and executor.cancelled == 1
+
+
+def test_async_run_timeout_cancels_queued_command(executor):
+    blocked, release = _block(executor)
+    ran = []
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError): await executor.run(ran.append, "x", timeout=0.05)
+        release.set()
+        return await executor.run(lambda: threading.current_thread().name)
+
+    assert asyncio.run(scenario()) == "driver-exec-test"
+    assert ran == []
+
+
+def test_call_runs_inline_on_worker_thread(executor):
+    # worker içinden call() kuyruğa girerse kendini bekleyip kilitlenirdi
+    def outer(): return executor.call(lambda: threading.current_thread().name)
+    assert executor.call(outer, timeout=2) == "driver-exec-test"
+
+
+def test_errors_propagate(executor):
+    with pytest.raises(ZeroDivisionError): executor.call(lambda: 1 / 0, timeout=2)
+    assert executor.call(lambda: "ok", timeout=2) == "ok"
+
+
+def test_shutdown_drains_queue_then_rejects(executor):
+    blocked, release = _block(executor)
+    ran = []
+    futs = [executor.submit(ran.append, i, priority=PRIORITY_BULK) for i in range(3)]
+    thread = executor._thread
+    executor.shutdown(wait=False)
+    release.set()
+    thread.join(2)
+    assert not thread.is_alive() and ran == [0, 1, 2] and all(f.done() for f in futs)
+    with pytest.raises(RuntimeError): executor.submit(ran.append, 99)
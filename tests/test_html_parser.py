@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from src.html_parser import available_backends, iter_text_lines, parse_html, strip_tags
+
+DOC = ("<!DOCTYPE html><html><head><style>p{}</style><script>var x;</script></head><body>"
+       "<div class='a'><div class='a'>iç <b>kalın</b></div></div><!-- yorum --><p>son</p></body></html>")
+
+BACKENDS = available_backends()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_select_does_not_match_the_node_itself(backend):
+    root = parse_html(DOC, backend)
+    outer = root.select_one("div.a")
+    assert len(root.select("div.a")) == 2
+    assert len(outer.select("div.a")) == 1 and len(outer.find_all("div")) == 1
+    assert outer.select_one("div.a").get_text() == "iç kalın"
+    assert len(root.select("html")) == 1
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_get_text_skips_comments_and_script_style(backend):
+    assert parse_html(DOC, backend).get_text("|", strip=True) == "iç|kalın|son"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_strip_tags_keeps_doctype(backend):
+    out = strip_tags(DOC, ["script", "style"], backend)
+    assert out.startswith("<!DOCTYPE html>") and "<script" not in out and "<style" not in out and "kalın" in out
+
+
+def _soup_lines(html: str) -> list:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "template"]): tag.decompose()
+    lines = (ln.strip() for ln in soup.get_text(separator="\n").splitlines())
+    return [" ".join(ln.split()) for ln in lines if ln and not all(ch in "-_=*" for ch in ln)]
+
+
+TEXT_DOC = ("<html><body><p>a<![CDATA[x<y]]>b</p><svg><![CDATA[ cd ]]></svg>"
+            "<p>&amp;x &foo; &#65; &#x42;&notit; &amp &lt3 &#99999999; &#147; &#x80;</p>"
+            "<p>a&nbsp;b &AMP;&copy---</p><script>var s = '<p>gizli</p>';</script><noscript>n</noscript>"
+            "<div>---</div><p>çok   boşluklu\n satır</p></body></html>")
+
+
+@pytest.mark.parametrize("size", [len(TEXT_DOC), 7, 3, 1])
+def test_iter_text_lines_matches_get_text_for_any_chunking(size):
+    chunks = [TEXT_DOC[i:i + size] for i in range(0, len(TEXT_DOC), size)]
+    assert list(iter_text_lines(chunks)) == _soup_lines(TEXT_DOC)
+
+
+def test_iter_text_lines_keeps_cdata_and_malformed_refs():
+    lines = list(iter_text_lines([TEXT_DOC]))
+    assert lines[:4] == ["a", "x<y", "b", "cd"]
+    assert lines[4] == "&x &foo A B&notit & &lt3 \N{REPLACEMENT CHARACTER} “ €"
+
+
+PANEL = "".join(f"<div class='row'><span class='k'>Alan {i}</span><span class='v'>Değer {i} &amp; ek</span></div>" for i in range(2000))
+
+
+def test_select_parity_across_backends():
+    results = {b: [(n.select_one("span.k").get_text(), n.select("span.v")[0].get_text()) for n in parse_html(PANEL, b).select("div.row")]
+               for b in BACKENDS}
+    assert len(results["html.parser"]) == 2000
+    assert all(r == results["html.parser"] for r in results.values())
+
+
+@pytest.mark.skipif("selectolax" not in BACKENDS, reason="selectolax kurulu değil")
+def test_selectolax_select_overhead_stays_small():
+    import time
+    root = parse_html(PANEL, "selectolax")  # ~190 KB
+    raw = root._node
+
+    def best(fn):
+        times = []
+        for _ in range(3):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+        return min(times)
+
+    # düğüm karşılaştırması serileştirme yaparsa (Node.__eq__) fark yüzlerce kat olur
+    assert best(lambda: root.select("span")) < 10 * best(lambda: [n for n in raw.css("span")]) + 0.005
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import src.http_cache as http_cache
+import src.rate_limiter as rate_limiter
+from src.http_cache import ResponseCache, cache_key, cached_get, store_response, ttl_from_headers
+from src.settings import settings
+
+
+@pytest.fixture
+def server():
+    """ETag'li tek sayfa sunan yerel sunucu; gelen koşullu istekleri kaydeder."""
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            body = "<html>sipariş listesi</html>".encode("utf-8")
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Cache-Control", "max-age=0")
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args): pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/orders", seen
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_etag_revalidation_reuses_body(server, tmp_path, monkeypatch):
+    url, seen = server
+    cache = ResponseCache(directory=str(tmp_path), memory_bytes=1 << 20)
+    monkeypatch.setattr(settings, "enable_cache", True)
+    monkeypatch.setattr(http_cache, "_cache", cache)
+    monkeypatch.setattr(rate_limiter, "_limiter", rate_limiter.RateLimiter(allowed_domains=[]))
+
+    assert cached_get(url) == "<html>sipariş listesi</html>"
+    assert cached_get(url) == "<html>sipariş listesi</html>"  # max-age=0: koşullu istek, 304
+    assert seen == [None, '"v1"']
+    stats = cache.stats()
+    assert stats["stores"] == 1 and stats["revalidated"] == 1 and stats["misses"] == 1
+
+    cache._memory.clear()  # disk katmanı da doğrulayıcıları saklar
+    cache._memory_used = 0
+    entry = cache.get(cache_key(url))
+    assert entry.etag == '"v1"' and entry.body == "<html>sipariş listesi</html>"
+    cache.close()
+
+
+def test_304_without_entry_refetches_unconditionally(server, tmp_path, monkeypatch):
+    url, seen = server
+    cache = ResponseCache(directory=str(tmp_path), memory_bytes=1 << 20)
+    monkeypatch.setattr(settings, "enable_cache", True)
+    monkeypatch.setattr(http_cache, "_cache", cache)
+    monkeypatch.setattr(rate_limiter, "_limiter", rate_limiter.RateLimiter(allowed_domains=[]))
+    # çağıranın kendi If-None-Match'i 304 getirir ama önbellekte gövde yok
+    assert cached_get(url, headers={"If-None-Match": '"v1"', "Accept": "text/html"}) == "<html>sipariş listesi</html>"
+    assert seen == ['"v1"', None]
+    assert cache.get(cache_key(url)).body == "<html>sipariş listesi</html>"
+    assert store_response(cache, "k", url, None, 304, {}, "") == "" and cache.get("k") is None  # boş gövde saklanmaz
+    cache.close()
+
+
+def test_lru_evicts_by_bytes_and_keeps_disk_copy(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), memory_bytes=250, stale_keep=3600)
+    for name in "abc": cache.put(name, f"https://x/{name}", name * 100, ttl=60)
+    assert list(cache._memory) == ["b", "c"] and cache.counters["evictions"] == 1
+    assert cache.get("b") is not None  # b en son kullanılan olur
+    cache.put("d", "https://x/d", "d" * 100, ttl=60)
+    assert list(cache._memory) == ["b", "d"] and cache._memory_used == 200
+    assert cache.get("a").body == "a" * 100 and cache.counters["disk_hits"] == 1
+    cache.put("big", "https://x/big", "x" * 1000, ttl=60)  # bütçeden büyük: yalnızca disk
+    assert "big" not in cache._memory and cache.get("big").size == 1000
+    cache.close()
+
+
+def test_stale_entries_survive_until_stale_keep(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), memory_bytes=0, stale_keep=60)
+    cache.put("old", "https://x/old", "eski", ttl=0, etag='"e"')
+    cache.put("gone", "https://x/gone", "silinecek", ttl=0)
+    cache._conn.execute("UPDATE responses SET expires_at=? WHERE key='gone'", (time.time() - 120,))
+    assert cache.purge() == 1
+    entry = cache.get("old")
+    assert not entry.fresh and entry.revalidatable and cache.get("gone") is None
+    cache.close()
+
+
+def test_ttl_from_headers():
+    assert ttl_from_headers({"Cache-Control": "no-store"}, 300) is None
+    assert ttl_from_headers({"Cache-Control": "no-cache, max-age=60"}, 300) == 0
+    # tek kullanıcılı istemci önbelleği: s-maxage (paylaşılan önbellekler için) yok sayılır, private saklanır
+    assert ttl_from_headers({"Cache-Control": "public, s-maxage=30, max-age=60"}, 300) == 60
+    assert ttl_from_headers({"Cache-Control": "s-maxage=30"}, 300) == 300
+    assert ttl_from_headers({"Cache-Control": "private, max-age=120"}, 300) == 120
+    assert ttl_from_headers({}, 300) == 300
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import threading, time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import src.http_client as http_client
+from src.settings import settings
+
+BODY = "<html>çğüşöı sipariş €</html>"
+
+
+@pytest.fixture
+def server():
+    """/flaky: ilk N istekte 503, sonra 200; /down: hep 503; /slow: eşzamanlı istek sayısını ölçer; /text: parça parça gövde."""
+    state = {"hits": {}, "fail_first": 1, "active": 0, "max_active": 0, "lock": threading.Lock()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        def log_message(self, *args): pass
+
+        def _send(self, status: int, body: bytes = b"") -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            with state["lock"]: n = state["hits"][self.path] = state["hits"].get(self.path, 0) + 1
+            if self.path == "/flaky": return self._send(503 if n <= state["fail_first"] else 200, BODY.encode())
+            if self.path == "/down": return self._send(503)
+            if self.path == "/slow":
+                with state["lock"]:
+                    state["active"] += 1
+                    state["max_active"] = max(state["max_active"], state["active"])
+                time.sleep(0.05)
+                with state["lock"]: state["active"] -= 1
+                return self._send(200, b"ok")
+            if self.path == "/text": return self._send(200, (BODY * 50).encode())
+            self._send(404)
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_session(monkeypatch):
+    monkeypatch.setattr(settings, "http_retries", 3)
+    monkeypatch.setattr(settings, "http_backoff", 0.01)
+    monkeypatch.setattr(settings, "http_backoff_jitter", 0.0)
+    http_client.close_session()
+    yield
+    http_client.close_session()
+
+
+def test_retries_5xx_then_returns_body(server):
+    base, state = server
+    state["fail_first"] = 2
+    resp = http_client.get(base + "/flaky")
+    assert resp.status_code == 200 and resp.text == BODY
+    assert state["hits"]["/flaky"] == 3  # 2 x 503 + 200
+
+
+def test_gives_up_after_retries(server):
+    base, state = server
+    with pytest.raises(requests.HTTPError) as info: http_client.get(base + "/down")
+    assert info.value.response.status_code == 503 and state["hits"]["/down"] == settings.http_retries + 1
+
+
+def test_backoff_grows_with_jitter(monkeypatch):
+    from urllib3.util.retry import RequestHistory
+    monkeypatch.setattr(settings, "http_backoff", 1.0)
+    monkeypatch.setattr(settings, "http_backoff_jitter", 0.5)
+    retry = http_client._build_session().get_adapter("https://x").max_retries
+    def wait_after(failures: int) -> float:
+        return retry.new(history=tuple(RequestHistory("GET", "/", None, 503, None) for _ in range(failures))).get_backoff_time()
+    # urllib3: ilk yeniden deneme hemen, sonra backoff * 2^(n-1) + [0, jitter)
+    samples = [wait_after(3) for _ in range(20)]
+    assert wait_after(1) == 0 and 2.0 <= wait_after(2) <= 2.5
+    assert all(4.0 <= w <= 4.5 for w in samples) and len(set(samples)) > 1
+    assert wait_after(10) <= 30 + 0.5  # backoff_max
+
+
+def test_per_host_pool_limit_blocks(server, monkeypatch):
+    base, state = server
+    monkeypatch.setattr(settings, "http_pool_maxsize", 2)
+    with ThreadPoolExecutor(6) as ex: assert set(ex.map(lambda _: http_client.get(base + "/slow").text, range(6))) == {"ok"}
+    assert state["max_active"] <= 2 and state["hits"]["/slow"] == 6
+
+
+def test_iter_text_streams_and_decodes_split_chars(server):
+    base, _ = server
+    chunks = list(http_client.iter_text(base + "/text", chunk_size=7))
+    assert len(chunks) > 10 and "".join(chunks) == BODY * 50
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import urllib.request
+
+import pytest
+
+from src.metrics import CONTENT_TYPE, MetricsRegistry, get_metrics, serve_metrics
+
+
+def test_histogram_buckets_are_cumulative_with_inclusive_le_and_inf():
+    reg = MetricsRegistry()
+    hist = reg.histogram("t_seconds", "test", ["stage"], buckets=(0.1, 0.5, 1))
+    for v in (0.05, 0.1, 0.3, 1.0, 7.5): hist.observe(v, stage="parse")
+    lines = reg.render().splitlines()
+    assert lines[:2] == ["# HELP t_seconds test", "# TYPE t_seconds histogram"]
+    assert lines[2:] == [
+        't_seconds_bucket{stage="parse",le="0.1"} 2',  # le sınırı dahil: 0.1 bu kovada
+        't_seconds_bucket{stage="parse",le="0.5"} 3',
+        't_seconds_bucket{stage="parse",le="1"} 4',
+        't_seconds_bucket{stage="parse",le="+Inf"} 5',
+        't_seconds_sum{stage="parse"} 8.95',
+        't_seconds_count{stage="parse"} 5',
+    ]
+    assert hist.snapshot(stage="parse") == {"count": 5, "sum": pytest.approx(8.95)}
+
+
+def test_counter_labels_escaping_and_no_decrease():
+    reg = MetricsRegistry()
+    c = reg.counter("t_total", "test", ["store"])
+    c.inc(store='a"b\\c')
+    c.inc(2, store='a"b\\c')
+    assert reg.render().splitlines()[-1] == 't_total{store="a\\"b\\\\c"} 3'
+    with pytest.raises(ValueError): c.inc(-1, store="x")
+    with pytest.raises(ValueError): c.inc(store="x", kind="y")  # tanımsız etiket
+    assert reg.counter("t_total", "test", ["store"]) is c
+    with pytest.raises(ValueError): reg.histogram("t_total", "test")
+
+
+def test_time_context_records_even_on_error():
+    reg = MetricsRegistry()
+    hist = reg.histogram("t_seconds", "test")
+    with pytest.raises(RuntimeError):
+        with hist.time(): raise RuntimeError("x")
+    assert hist.snapshot()["count"] == 1
+
+
+def test_write_file_and_http_endpoint(tmp_path):
+    get_metrics().counter("t_endpoint_total", "test").inc()
+    path = tmp_path / "m" / "metrics.prom"
+    get_metrics().write_file(str(path))
+    assert "t_endpoint_total 1" in path.read_text(encoding="utf-8")
+    server = serve_metrics(0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as resp:
+            assert resp.headers["Content-Type"] == CONTENT_TYPE and b"t_endpoint_total 1" in resp.read()
+    finally: server.shutdown()
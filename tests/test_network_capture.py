@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import json, re, urllib.request
+
+import pytest
+
+from src.network_capture import order_from_payload, process_network_orders, serve_fake_dashboard
+from src.settings import settings
+
+
+class StubManager:
+    """drain_network_responses() ile yakalanmış yanıtları veren BrowserManager yerine geçen nesne."""
+    def __init__(self, responses): self.responses = responses
+    def drain_network_responses(self, url_patterns):
+        regexes = [re.compile(p) for p in url_patterns]
+        out = [r for r in self.responses if any(x.search(r["url"]) for x in regexes)]
+        self.responses = []
+        return out
+
+
+@pytest.fixture
+def dashboard():
+    server, url = serve_fake_dashboard()
+    yield url
+    server.shutdown()
+
+
+def _fetch(url: str) -> dict:
+    with urllib.request.urlopen(url, timeout=5) as resp: return {"url": url, "status": resp.status, "body": resp.read().decode("utf-8")}
+
+
+def _capture(url: str) -> list:
+    # tarayıcının yapacağı istekler: sayfa, liste, her siparişin detayı
+    responses = [_fetch(url), _fetch(url + "api/orders")]
+    responses += [_fetch(url + f"api/orders/{o['orderNumber']}") for o in json.loads(responses[1]["body"])]
+    return responses
+
+
+def test_order_from_payload_matches_panel_shape(dashboard):
+    detail = json.loads(_fetch(dashboard + "api/orders/1001")["body"])
+    parsed = order_from_payload(detail)
+    assert parsed["customer_info"] == {"Sipariş No": "1001", "Müşteri": "Ali Veli", "Telefon": "5550000001",
+                                       "Adres": "Moda Cd. 1", "İl/İlçe": "Kadıköy"}
+    assert parsed["items"] == [{"name": "Lahmacun", "qty": "2", "price": "120 TL"}, {"name": "Ayran", "qty": "1", "price": "20 TL"}]
+    assert parsed["totals"] == {"Sipariş Tutarı": "140 TL", "Toplam": "140 TL"}
+    assert (parsed["payment_method"], parsed["delivery_type"], parsed["note"]) == ("Kredi Kartı", "Restoran Teslimat", "Zili çalmayın")
+
+
+def test_process_network_orders_dedupes_and_skips_summaries(dashboard):
+    manager, seen, logged = StubManager(_capture(dashboard)), set(), []
+    n = process_network_orders(manager, seen, lambda parsed, title: logged.append(title), settings.order_api_url_patterns)
+    # liste yanıtındaki özetler (ürünsüz) atlanır, her sipariş detaydan bir kez işlenir
+    assert n == 2 and logged == ["1001 Ali Veli", "1002 Ayşe Yılmaz"] and len(seen) == 2
+    manager.responses = _capture(dashboard)
+    assert process_network_orders(manager, seen, lambda p, t: logged.append(t), settings.order_api_url_patterns) == 0
+
+
+def test_order_api_patterns_skip_dashboard_pages():
+    patterns = [re.compile(p) for p in settings.order_api_url_patterns]
+    matches = lambda url: any(p.search(url) for p in patterns)
+    assert not matches("https://partner.tgoyemek.com/meal/245018/order/list")
+    assert not matches("https://partner.tgoyemek.com/meal/245018/order/list/details/55")
+    assert matches("https://api.example.com/meal/245018/orders?page=1")
+    assert matches("https://api.example.com/orders/1001")
+
+
+def test_store_routing_uses_whole_path_segments(monkeypatch):
+    import src.main as app
+    a, b = app.StoreMonitor.__new__(app.StoreMonitor), app.StoreMonitor.__new__(app.StoreMonitor)
+    a.store_id, b.store_id = "245", "245018"
+    monkeypatch.setattr(app, "_stores", [a, b])
+    monkeypatch.setattr(app, "_primary_store", a)
+    assert app._store_for_url("https://api.example.com/meal/245018/orders/1") is b
+    assert app._store_for_url("https://api.example.com/orders?storeId=245018") is b
+    assert app._store_for_url("https://api.example.com/orders/2450189") is a  # eşleşme yok -> birincil
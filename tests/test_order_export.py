@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import gzip, json, os
+from datetime import datetime
+from types import SimpleNamespace
+
+import src.main as app
+from src.order_export import RotatingJsonlWriter, export_columnar, import_text_log, iter_records, order_record, parse_text_log
+
+PARSED = {
+    "customer_info": {"Sipariş No": "5001", "Müşteri": "Ali Veli", "Adres": "Moda Cd. 1"},
+    "delivery_type": "Restoran Teslimat", "payment_method": "Kredi Kartı", "note": "Zili çalmayın",
+    "items": [{"name": "Lahmacun", "qty": "2", "price": "120 TL"}, {"name": "Ayran", "qty": "1", "price": "20 TL"}],
+    "totals": {"Sipariş Tutarı": "140 TL", "Toplam": "140 TL"},
+}
+
+
+class _InlineWriter:
+    """output_writer yerine: işleri hemen çalıştırır."""
+    def append(self, path, content):
+        with open(path, "a", encoding="utf-8") as f: f.write(content)
+    def call(self, func): func()
+
+
+def test_text_log_to_jsonl_to_columnar_round_trip(tmp_path, monkeypatch, capsys):
+    # siparisler.txt, ana döngünün yazdığı biçimle üretilir
+    text_log, orders_dir = str(tmp_path / "siparisler.txt"), str(tmp_path / "orders")
+    store = SimpleNamespace(orders_txt=text_log, order_jsonl=RotatingJsonlWriter(str(tmp_path / "live")))
+    monkeypatch.setattr(app, "output_writer", _InlineWriter())
+    app._log_processed_order(PARSED, "5001 Ali Veli", store)
+    app._log_processed_order({**PARSED, "customer_info": {"Sipariş No": "5002"}, "note": None}, "5002", store)
+
+    (imported,) = list(parse_text_log(text_log))[:1]
+    assert {k: imported[k] for k in ("title", "order_no", "delivery_type", "payment_method", "note", "items", "totals")} == {
+        "title": "5001 Ali Veli", "order_no": "5001", "delivery_type": "Restoran Teslimat", "payment_method": "Kredi Kartı",
+        "note": "Zili çalmayın", "items": PARSED["items"], "totals": PARSED["totals"]}
+    assert imported["customer_info"] == PARSED["customer_info"] and imported["source"] == "import"
+
+    assert import_text_log(text_log, orders_dir) == 2
+    assert import_text_log(text_log, orders_dir) == 0  # tekrar aktarım kopya üretmez
+    records = list(iter_records(orders_dir))
+    live = list(iter_records(str(tmp_path / "live")))
+    assert [r["order_no"] for r in records] == [r["order_no"] for r in live] == ["5001", "5002"]
+    assert records[0]["items"] == live[0]["items"] and records[0]["customer_info"] == live[0]["customer_info"]
+
+    out = export_columnar(orders_dir, str(tmp_path / "orders.columns.json.gz"))
+    with gzip.open(out, "rt", encoding="utf-8") as f: cols = json.load(f)["columns"]
+    assert cols["order_no"] == ["5001", "5002"] and cols["item_count"] == [2, 2] and cols["total"] == ["140 TL", "140 TL"]
+    assert json.loads(cols["items_json"][0]) == PARSED["items"]
+
+
+def test_rotation_by_size_keeps_write_order(tmp_path):
+    writer = RotatingJsonlWriter(str(tmp_path), max_bytes=600)
+    paths = [writer.write(order_record(PARSED, f"#{i}", ts=datetime(2026, 3, 1, 12, 0, i))) for i in range(6)]
+    writer.write(order_record(PARSED, "ertesi gün", ts=datetime(2026, 3, 2)))
+    assert len(set(paths)) > 1 and all(os.path.getsize(p) <= 600 for p in set(paths))
+    assert [r["title"] for r in iter_records(str(tmp_path))] == [f"#{i}" for i in range(6)] + ["ertesi gün"]
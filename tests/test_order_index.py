@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from src.order_index import ProcessedIndex
+
+
+def test_hot_set_is_bounded_and_cold_keys_come_from_sqlite(tmp_path):
+    index = ProcessedIndex(str(tmp_path / "idx.sqlite3"), hot_size=3)
+    try:
+        for k in "abcde": index.add(k)
+        assert list(index._hot) == ["c", "d", "e"] and len(index) == 5
+        assert "a" in index  # sıcak kümede yok, SQLite'tan bulunur ve sıcağa alınır
+        assert list(index._hot) == ["d", "e", "a"]
+        assert "zz" not in index and 42 not in index
+    finally: index.close()
+
+
+def test_duplicates_are_ignored_and_discard_updates_count(tmp_path):
+    index = ProcessedIndex(str(tmp_path / "idx.sqlite3"))
+    try:
+        index.add("x")
+        index.add("x")
+        assert len(index) == 1 and list(index) == ["x"]
+        index.discard("x")
+        index.discard("x")
+        assert len(index) == 0 and "x" not in index
+    finally: index.close()
+
+
+def test_keys_survive_restart_and_namespaces_are_separate(tmp_path):
+    path = str(tmp_path / "idx.sqlite3")
+    cards, urls = ProcessedIndex(path, "cards", hot_size=2), ProcessedIndex(path, "detail_urls")
+    for k in ("k1", "k2", "k3"): cards.add(k)
+    urls.add("k1")
+    cards.close()
+    urls.close()
+    reopened = ProcessedIndex(path, "cards", hot_size=2)
+    try:
+        assert len(reopened) == 3 and len(reopened._hot) == 2  # yalnızca en yeniler sıcak kümeye yüklenir
+        assert all(k in reopened for k in ("k1", "k2", "k3"))
+    finally: reopened.close()
+    urls = ProcessedIndex(path, "detail_urls")
+    try: assert set(urls) == {"k1"}
+    finally: urls.close()
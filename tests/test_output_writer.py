@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import os, threading, time
+
+from src import output_writer as ow
+from src.output_writer import OutputWriter
+
+
+def test_appends_writes_and_calls_keep_submission_order(tmp_path):
+    log, seen = str(tmp_path / "log.txt"), []
+    writer = OutputWriter(flush_interval=0.05)
+    writer.append(log, "1\n")
+    writer.append(log, lambda: "2\n")  # writer thread'inde üretilir
+    writer.call(lambda: seen.append(open(log, encoding="utf-8").read()))
+    writer.write(str(tmp_path / "snap.html"), b"<html/>")
+    writer.append(log, "3\n")
+    writer.close()
+    assert seen == ["1\n2\n"]  # call() önceki append'ler yazıldıktan sonra çalışır
+    assert open(log, encoding="utf-8").read() == "1\n2\n3\n"
+    assert (tmp_path / "snap.html").read_bytes() == b"<html/>"
+    assert writer.written_jobs == 5 and writer.failed_jobs == 0
+
+
+def test_close_drains_everything_without_waiting_for_the_timer(tmp_path):
+    path = str(tmp_path / "out.txt")
+    writer = OutputWriter(flush_interval=30)
+    for i in range(200): writer.append(path, f"{i}\n")
+    start = time.monotonic()
+    writer.close()
+    assert time.monotonic() - start < 5
+    assert open(path, encoding="utf-8").read().splitlines() == [str(i) for i in range(200)]
+
+
+def test_jobs_are_batched_until_flush_interval(tmp_path):
+    path = str(tmp_path / "out.txt")
+    writer = OutputWriter(flush_interval=0.3, batch_size=1000)
+    writer.append(path, "a")
+    time.sleep(0.05)
+    writer.append(path, "b")
+    assert not os.path.exists(path)  # zamanlayıcı dolmadan yazılmaz
+    time.sleep(0.6)
+    assert open(path, encoding="utf-8").read() == "ab" and writer.batches == 1
+    writer.append(path, "c")
+    assert writer.flush(5) and open(path, encoding="utf-8").read() == "abc"
+    writer.close()
+
+
+def test_batch_fsync_once_per_file_per_batch(tmp_path, monkeypatch):
+    synced, lock = [], threading.Lock()
+    real_fsync = os.fsync
+    def counting_fsync(fd):
+        with lock: synced.append(fd)
+        real_fsync(fd)
+    monkeypatch.setattr(ow.os, "fsync", counting_fsync)
+    writer = OutputWriter(flush_interval=0.2, fsync="batch", batch_size=1000)
+    for i in range(50):
+        writer.append(str(tmp_path / "a.txt"), f"{i}\n")
+        writer.write(str(tmp_path / f"s{i % 2}.html"), "x")
+    writer.close()
+    assert len(synced) == 3 * writer.batches  # a.txt, s0.html, s1.html
+
+
+def test_always_fsync_per_job(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(ow.os, "fsync", lambda fd: synced.append(fd))
+    writer = OutputWriter(flush_interval=0.2, fsync="always")
+    for i in range(10): writer.append(str(tmp_path / "a.txt"), f"{i}\n")
+    writer.close()
+    assert len(synced) == 10
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from selenium.common.exceptions import WebDriverException
+
+import src.main as app
+
+OLD = "<div class='order-detail-panel'>" + "eski sipariş " * 10 + "</div>"
+NEW = "<div class='order-detail-panel'>" + "yeni sipariş " * 10 + "</div>"
+
+
+class _Panel:
+    def __init__(self, driver): self.driver = driver
+    def get_attribute(self, name):
+        self.driver.polls += 1
+        return NEW if self.driver.polls > self.driver.change_after else OLD
+
+
+class StubDriver:
+    """Tıklamadan sonra panel birkaç okuma boyunca eski kalır, sonra değişir."""
+    def __init__(self, async_ok: bool = True, change_after: int = 3) -> None:
+        self.async_ok, self.change_after, self.polls = async_ok, change_after, 0
+        self.script_timeouts = []
+
+    def set_script_timeout(self, seconds): self.script_timeouts.append(seconds)
+
+    def execute_async_script(self, script, *args):
+        if not self.async_ok: raise WebDriverException("execute_async_script desteklenmiyor")
+        return [NEW, "<div class='order-details-info'></div>"]
+
+    def execute_script(self, script, *args):
+        if script == app._PANEL_MARK_JS: return len(OLD)
+        if script == app._PANEL_MARKED_JS: return OLD  # tarayıcıda tıklama öncesi işaretlenen panel
+        if script == app._PANEL_READ_JS: return [_Panel(self).get_attribute("outerHTML"), ""]
+        raise AssertionError(script)
+
+    def find_element(self, by, value): return _Panel(self)
+
+
+def test_async_failure_polls_against_marked_panel(monkeypatch):
+    monkeypatch.setattr(app, "_async_panel_wait", True)
+    driver = StubDriver(async_ok=False)
+    # çağıran async modda HTML çekmedi (previous_html=None): eski panel yeni sanılmamalı
+    panel_html, _ = app._wait_for_detail_panel_change(driver, None, timeout=3.0)
+    assert panel_html == NEW and driver.polls > driver.change_after
+    assert app._async_panel_wait is False
+
+
+def test_script_timeout_is_set_once_per_driver(monkeypatch):
+    monkeypatch.setattr(app, "_async_panel_wait", True)
+    monkeypatch.setattr(app, "_script_timeouts", {})
+    driver, other = StubDriver(), StubDriver()
+    for _ in range(3): assert app._wait_for_detail_panel_change(driver, None, timeout=8.0)[0] == NEW
+    app._wait_for_detail_panel_change(other, None, timeout=8.0)
+    assert driver.script_timeouts == [10.0] and other.script_timeouts == [10.0]
+    assert not hasattr(driver, "_scrap_script_timeout")
+
+
+class _Card:
+    def __init__(self, error=None): self.error, self.native_clicks = error, 0
+    def click(self):
+        self.native_clicks += 1
+        if self.error: raise self.error
+
+
+class ClickDriver:
+    """Kart tarama / hazırlama / JS click çağrılarını kaydeder."""
+    def __init__(self, cards): self.cards, self.js_clicks = cards, []
+    def execute_script(self, script, *args):
+        if script == app._CARD_SCAN_JS:
+            return [{"index": i, "text": f"Sipariş {i}", "clickable": clickable, "el": el} for i, (el, clickable) in enumerate(self.cards)]
+        if script == "arguments[0].click();": self.js_clicks.append(args[0])
+        return 0
+
+
+def test_click_uses_js_only_for_unclickable_or_failed_native_click(monkeypatch):
+    from types import SimpleNamespace
+    from selenium.common.exceptions import ElementClickInterceptedException
+    monkeypatch.setattr(app, "_async_panel_wait", True)
+    monkeypatch.setattr(app, "_wait_for_detail_panel_change", lambda *a, **kw: ("", ""))  # boş panel: kayıt yazılmaz
+    monkeypatch.setattr(app, "_read_detail_html", lambda driver: ("", ""))
+    monkeypatch.setattr(app.time, "sleep", lambda s: None)
+    ok, hidden, covered = _Card(), _Card(), _Card(ElementClickInterceptedException("üstte modal var"))
+    driver = ClickDriver([(ok, True), (hidden, False), (covered, True)])
+    store = SimpleNamespace(clicked_cards=set(), label="", last_print=None, store_id="s1")
+    app._click_new_order_cards(driver, "https://panel/order/details", store)
+    assert (ok.native_clicks, hidden.native_clicks, covered.native_clicks) == (1, 0, 1)
+    assert driver.js_clicks == [hidden, covered]
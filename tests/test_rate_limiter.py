@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+import src.rate_limiter as rl
+from src.rate_limiter import DomainNotAllowed, RateLimiter, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Sahte monotonic saat; time.sleep saati ilerletir."""
+    state = {"now": 100.0, "slept": []}
+    def sleep(s):
+        state["slept"].append(s)
+        state["now"] += s
+    monkeypatch.setattr(rl.time, "monotonic", lambda: state["now"])
+    monkeypatch.setattr(rl.time, "sleep", sleep)
+    return state
+
+
+def test_burst_then_steady_rate(clock):
+    bucket = TokenBucket(rate=1.0, capacity=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert [bucket.reserve() for _ in range(2)] == [1.0, 2.0]  # sıraya giren rezervasyonlar
+    assert bucket.stats()["waited"] == 2 and bucket.stats()["max_wait_s"] == 2.0
+
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    bucket.reserve(), bucket.reserve()
+    clock["now"] += 0.5
+    assert bucket.reserve() == 0.0 and bucket.reserve() == 0.5
+    clock["now"] += 3600
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_limiter_sleeps_per_host(clock):
+    limiter = RateLimiter(per_minute=60, burst=1, allowed_domains=[])
+    assert limiter.acquire("https://a.example/1") == 0.0
+    assert limiter.acquire("https://a.example/2") == 1.0
+    assert limiter.acquire("https://b.example/") == 0.0  # ayrı kova
+    assert clock["slept"] == [1.0]
+    assert limiter.stats()["domains"]["a.example"]["requests"] == 2
+
+
+def test_loopback_and_disabled_limit_skip_buckets(clock):
+    limiter = RateLimiter(per_minute=60, burst=1, allowed_domains=[])
+    for url in ("http://127.0.0.1:8000/", "http://localhost/", "http://[::1]/", "http://app.localhost/"):
+        assert [limiter.acquire(url) for _ in range(3)] == [0.0] * 3
+    assert limiter.stats()["domains"] == {} and clock["slept"] == []
+    off = RateLimiter(per_minute=0, burst=1, allowed_domains=[])
+    assert [off.acquire("https://a.example/") for _ in range(5)] == [0.0] * 5
+
+
+def test_allowed_domains(clock):
+    limiter = RateLimiter(per_minute=0, allowed_domains=["example.com"])
+    assert limiter.check("https://shop.example.com/x") == "shop.example.com"
+    with pytest.raises(DomainNotAllowed): limiter.acquire("https://example.org/")
+    with pytest.raises(DomainNotAllowed): limiter.acquire("https://badexample.com/")
+    assert limiter.rejected == 2
+
+
+def test_cancelled_async_wait_refunds_token(clock):
+    limiter = RateLimiter(per_minute=60, burst=1, allowed_domains=[])
+
+    async def scenario():
+        assert await limiter.aacquire("https://a.example/") == 0.0
+        task = asyncio.ensure_future(limiter.aacquire("https://a.example/"))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError): await task
+
+    asyncio.run(scenario())
+    assert limiter._buckets["a.example"].tokens == 0.0
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from src.request_policy import RESOURCE_PATTERNS, THIRD_PARTY_HOSTS, RequestPolicy, apply_request_policy, policy_for
+from src.settings import settings
+
+
+class FakeDriver:
+    """execute_cdp_cmd çağrılarını kaydeden sürücü; sekme current_window_handle ile değiştirilir."""
+    def __init__(self) -> None:
+        self.calls, self.current_window_handle = [], "tab-1"
+    def execute_cdp_cmd(self, cmd, params): self.calls.append((cmd, params))
+
+
+@pytest.fixture(autouse=True)
+def base_policy(monkeypatch):
+    cfg = settings.browser_config
+    for field, value in (("disable_images", False), ("disable_fonts", False), ("disable_media", False), ("disable_javascript", False),
+                         ("block_third_party", False), ("blocked_url_patterns", []), ("allowed_hosts", [])):
+        monkeypatch.setattr(cfg, field, value)
+    monkeypatch.setattr(settings, "request_policy_overrides", {
+        "example.com": {"disable_images": True},
+        "shop.example.com": {"disable_javascript": True},
+        "panel.test": {"block_third_party": True, "allowed_hosts": ["hotjar.com", "facebook.com"]},
+    })
+
+
+def test_longest_matching_host_override_wins():
+    assert policy_for("https://example.com/").resource_types == {"image"}
+    assert policy_for("https://cdn.example.com/x").resource_types == {"image"}
+    shop = policy_for("https://a.shop.example.com/menu")
+    assert shop.disable_javascript and shop.resource_types == set()  # daha uzun eşleşme tek başına uygulanır
+    assert policy_for("https://notexample.com/").is_empty and policy_for("https://other.test/").is_empty
+
+
+def test_allowed_hosts_are_excluded_from_third_party_block():
+    patterns = policy_for("https://panel.test/orders").url_patterns()
+    assert "*hotjar.com*" not in patterns and "*facebook.com/tr*" not in patterns
+    assert "*connect.facebook.net*" in patterns and "*clarity.ms*" in patterns
+    assert len(patterns) == len(THIRD_PARTY_HOSTS) - 2
+    # alan adı olarak eşleşir: "jar.com" hotjar.com'u muaf tutmaz
+    assert "*hotjar.com*" in RequestPolicy(block_third_party=True, allowed_hosts=("jar.com",)).url_patterns()
+
+
+def test_url_patterns_combine_types_and_custom():
+    policy = RequestPolicy.from_values({"disable_fonts": True, "disable_images": True, "blocked_url_patterns": ["*/tracking/*"]})
+    assert policy.url_patterns() == [*RESOURCE_PATTERNS["font"], *RESOURCE_PATTERNS["image"], "*/tracking/*"]
+    assert policy == RequestPolicy.from_values({"disable_images": True, "disable_fonts": True, "blocked_url_patterns": ["*/tracking/*"]})
+
+
+def test_cdp_skipped_when_policy_unchanged():
+    driver = FakeDriver()
+    apply_request_policy(driver, "https://other.test/")  # boş politika, sekmede henüz bir şey yok
+    assert driver.calls == []
+    apply_request_policy(driver, "https://example.com/a")
+    assert [c for c, _ in driver.calls] == ["Network.enable", "Network.setBlockedURLs", "Emulation.setScriptExecutionDisabled"]
+    assert driver.calls[1][1] == {"urls": list(RESOURCE_PATTERNS["image"])}
+    driver.calls.clear()
+    apply_request_policy(driver, "https://www.example.com/b")  # aynı politika: CDP'ye gidilmez
+    assert driver.calls == []
+
+
+def test_policy_tracked_per_tab_and_js_toggle_only_on_change():
+    driver = FakeDriver()
+    apply_request_policy(driver, "https://example.com/")
+    driver.current_window_handle = "tab-2"
+    driver.calls.clear()
+    apply_request_policy(driver, "https://example.com/")  # yeni sekme: yeniden uygulanır
+    assert [c for c, _ in driver.calls][:2] == ["Network.enable", "Network.setBlockedURLs"]
+    driver.calls.clear()
+    apply_request_policy(driver, "https://panel.test/")  # JS durumu aynı: Emulation çağrılmaz
+    assert [c for c, _ in driver.calls] == ["Network.enable", "Network.setBlockedURLs"]
+    driver.calls.clear()
+    apply_request_policy(driver, "https://shop.example.com/")
+    assert driver.calls[-1] == ("Emulation.setScriptExecutionDisabled", {"value": True})
+    driver.calls.clear()
+    apply_request_policy(driver, "https://other.test/")  # önceki politika kaldırılır
+    assert driver.calls[1:] == [("Network.setBlockedURLs", {"urls": []}), ("Emulation.setScriptExecutionDisabled", {"value": False})]
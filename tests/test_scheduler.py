@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import src.scheduler as scheduler_mod
+from src.scheduler import AdaptivePoller, Scheduler
+
+
+class _Clock:
+    def __init__(self, now: float = 1000.0) -> None: self.now = now
+    def __call__(self) -> float: return self.now
+
+
+def _scheduler(monkeypatch, clock):
+    monkeypatch.setattr(scheduler_mod.time, "monotonic", clock)
+    return Scheduler()
+
+
+def test_late_loop_does_not_drift_schedule(monkeypatch):
+    clock = _Clock()
+    sched = _scheduler(monkeypatch, clock)
+    runs = []
+    job = sched.add_job("tick", 10.0, lambda: runs.append(clock.now))
+    for _ in range(5):
+        clock.now = job.next_run + 0.7  # döngü her seferinde geç uyanır
+        assert sched.run_due() == 1
+    # vakitler 1010, 1020, ... çizgisinde kalır; gecikme birikmez
+    assert [round(t - 0.7, 6) for t in runs] == [1010.0, 1020.0, 1030.0, 1040.0, 1050.0]
+    assert job.next_run == 1060.0 and job.runs == 5
+
+
+def test_missed_periods_run_once_and_realign(monkeypatch):
+    clock = _Clock()
+    sched = _scheduler(monkeypatch, clock)
+    job = sched.add_job("tick", 10.0, lambda: None)
+    clock.now = 1047.0  # dört periyot kaçırıldı
+    assert sched.run_due() == 1 and sched.run_due() == 0
+    assert job.next_run == 1050.0 and sched.time_until_next() == 3.0
+
+
+def test_failing_job_keeps_schedule(monkeypatch):
+    clock = _Clock()
+    sched = _scheduler(monkeypatch, clock)
+    job = sched.add_job("boom", 5.0, lambda: 1 / 0, run_immediately=True)
+    assert sched.run_due() == 1
+    assert job.runs == 0 and "division" in job.last_error and job.next_run == 1005.0
+
+
+def test_adaptive_poller_backoff_and_reset():
+    poller = AdaptivePoller(min_interval=1.0, max_interval=4.0, backoff=2.0)
+    assert [poller.next_delay(0) for _ in range(4)] == [2.0, 4.0, 4.0, 4.0]
+    assert poller.next_delay(3) == 1.0
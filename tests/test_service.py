@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import asyncio, json, threading
+from datetime import datetime
+
+import pytest
+
+import src.main as app_main
+from src import service
+from src.order_export import RotatingJsonlWriter, order_record
+from src.order_index import ProcessedIndex
+
+
+async def _call(path: str, query: str = "") -> tuple:
+    sent = []
+    async def receive(): return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message): sent.append(message)
+    await service.app({"type": "http", "method": "GET", "path": path, "query_string": query.encode(), "headers": []}, receive, send)
+    return sent[0]["status"], dict(sent[0]["headers"]), json.loads(sent[1]["body"])
+
+
+@pytest.fixture
+def save_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_main, "SAVE_DIR", str(tmp_path))
+    monkeypatch.setattr(app_main, "_INDEX_PATH", str(tmp_path / "processed_orders.sqlite3"))
+    return tmp_path
+
+
+def test_scrape_returns_429_with_retry_after_when_queue_is_full(monkeypatch):
+    release = threading.Event()
+    def blocking_fetch(url, **kwargs):
+        release.wait(5)
+        return "<html></html>"
+    monkeypatch.setattr(service, "_scrape_target", lambda kind: (blocking_fetch, "html"))
+
+    async def scenario():
+        queue = service.JobQueue(workers=1, maxsize=1)
+        monkeypatch.setattr(service, "jobs", queue)
+        queue.start()
+        try:
+            running = asyncio.create_task(_call("/scrape/html", "url=http://127.0.0.1/a"))  # işçide
+            while queue.busy == 0: await asyncio.sleep(0.01)
+            waiting = asyncio.create_task(_call("/scrape/html", "url=http://127.0.0.1/b"))  # kuyrukta
+            while queue.depth == 0: await asyncio.sleep(0.01)
+            status, headers, body = await _call("/scrape/html", "url=http://127.0.0.1/c")
+            health = await _call("/health")
+            release.set()
+            done = await asyncio.gather(running, waiting)
+            return status, headers, body, health, done
+        finally: await queue.stop()
+
+    status, headers, body, health, done = asyncio.run(scenario())
+    assert status == 429 and headers[b"retry-after"] == b"1" and "dolu" in body["error"]
+    # dolu kuyruk geri basınçtır, arıza değil: health 200 + queue_full
+    assert health[0] == 200 and health[2]["queue_full"] is True and health[2]["problems"] == []
+    assert [d[0] for d in done] == [200, 200]
+
+
+def test_processed_count_follows_writes_from_another_connection(save_dir):
+    writer = ProcessedIndex(app_main._INDEX_PATH, namespace="cards", hot_size=10)
+    try:
+        writer.add("a")
+        assert asyncio.run(_call("/processed"))[2]["count"] == 1
+        writer.add("b")  # main.py'nin ayrı süreçte eklemesi gibi
+        status, _, body = asyncio.run(_call("/processed", "key=b"))
+        assert status == 200 and body == {"namespace": "cards", "count": 2, "key": "b", "processed": True}
+    finally: writer.close()
+
+
+def test_orders_include_per_store_directories(save_dir):
+    primary = RotatingJsonlWriter(str(save_dir / "orders"))
+    other = RotatingJsonlWriter(str(save_dir / "orders" / "777"))
+    primary.write(order_record({"customer_info": {"Sipariş No": "1"}}, "bir", ts=datetime(2026, 1, 1, 10)))
+    other.write(order_record({"customer_info": {"Sipariş No": "2"}}, "iki", ts=datetime(2026, 1, 1, 11)))
+    primary.write(order_record({"customer_info": {"Sipariş No": "3"}}, "üç", ts=datetime(2026, 1, 1, 12)))
+    _, _, body = asyncio.run(_call("/orders"))
+    assert [o["order_no"] for o in body["orders"]] == ["1", "2", "3"]
+    assert [o["order_no"] for o in asyncio.run(_call("/orders", "limit=2"))[2]["orders"]] == ["2", "3"]
+    status, _, order = asyncio.run(_call("/orders/2"))
+    assert status == 200 and order["store"] == "777"
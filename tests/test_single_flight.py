@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import asyncio, threading, time
+
+import pytest
+
+from src.single_flight import SingleFlight, fetch_key
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "zaman aşımı"
+        time.sleep(0.005)
+
+
+def _run_threads(flight, key, fn, n):
+    results, errors = [None] * n, [None] * n
+    def worker(i):
+        try: results[i] = flight.do(key, fn)
+        except Exception as e: errors[i] = e
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    threads[0].start()
+    _wait_for(lambda: flight.in_flight == 1)  # lider uçuşta
+    for t in threads[1:]: t.start()
+    _wait_for(lambda: flight.coalesced == n - 1)
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_fetch():
+    flight, gate, calls = SingleFlight(), threading.Event(), []
+    def fetch():
+        calls.append(1)
+        gate.wait(2)
+        return "<html>"
+    threads, results, errors = _run_threads(flight, fetch_key("https://a.example/"), fetch, 5)
+    gate.set()
+    for t in threads: t.join(2)
+    assert len(calls) == 1 and results == ["<html>"] * 5 and errors == [None] * 5
+    assert flight.stats() == {"issued": 1, "coalesced": 4, "in_flight": 0, "coalesce_ratio": 0.8}
+    assert flight.do(fetch_key("https://a.example/"), lambda: "yeni") == "yeni"  # anahtar serbest kaldı
+
+
+def test_error_reaches_every_waiter_and_key_is_released():
+    flight, gate = SingleFlight(), threading.Event()
+    def fetch():
+        gate.wait(2)
+        raise ConnectionError("bağlantı koptu")
+    threads, results, errors = _run_threads(flight, "k", fetch, 3)
+    gate.set()
+    for t in threads: t.join(2)
+    assert all(isinstance(e, ConnectionError) for e in errors) and results == [None] * 3
+    assert flight.in_flight == 0 and flight.do("k", lambda: 42) == 42
+
+
+def test_different_keys_do_not_coalesce():
+    assert fetch_key("https://a.example/") != fetch_key("https://a.example/", encoding="utf-8")
+    assert fetch_key("https://a.example/") != fetch_key("https://a.example/", use_browser=False)
+    flight = SingleFlight()
+    assert [flight.do(k, lambda k=k: k) for k in ("a", "b")] == ["a", "b"]
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_async_callers_coalesce_and_cancel_independently():
+    flight, calls = SingleFlight(), []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.ado("k", fetch))
+        await asyncio.sleep(0)
+        others = [asyncio.ensure_future(flight.ado("k", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        others[0].cancel()  # bir bekleyenin iptali çekimi durdurmaz
+        results = await asyncio.gather(first, *others[1:])
+        with pytest.raises(asyncio.CancelledError): await others[0]
+        return results
+
+    assert asyncio.run(scenario()) == ["ok"] * 3
+    assert len(calls) == 1 and flight.in_flight == 0
+
+
+def test_async_error_and_sync_fn_in_executor():
+    flight = SingleFlight()
+
+    async def failing():
+        raise ValueError("bozuk")
+
+    async def scenario():
+        results = await asyncio.gather(flight.ado("e", failing), flight.ado("e", failing), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        return await asyncio.gather(flight.ado("s", time.sleep, 0.02), flight.ado("s", time.sleep, 0.02))
+
+    assert asyncio.run(scenario()) == [None, None]
+    assert flight.stats()["issued"] == 2 and flight.stats()["coalesced"] == 2
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from src.snapshot_store import SnapshotStore, _zstd
+
+CODECS = ["gz"] + (["zst"] if _zstd() else [])
+
+
+@pytest.fixture
+def store(tmp_path, request):
+    s = SnapshotStore(str(tmp_path / "snapshots"), compression=getattr(request, "param", "gz"), compact_interval=3600)
+    yield s
+    s.close()
+
+
+@pytest.mark.parametrize("store", CODECS, indirect=True)
+def test_put_get_round_trip_and_dedupe(store):
+    html = "<html><body>Sipariş ğüşiöç " + "x" * 5000 + "</body></html>"
+    d1 = store.put(html, "detail", "Sayfa", ts="20260101_100000_000000")
+    d2 = store.put(html, "detail", "Sayfa", ts="20260101_100001_000000")
+    assert d1 == d2 and store.get(d1) == html
+    stats = store.stats()
+    assert stats["snapshots"] == 2 and stats["objects"] == 1 and stats["stored_bytes"] < stats["raw_bytes"]
+    assert [r[0] for r in store.find(prefix="detail")] == ["20260101_100001_000000", "20260101_100000_000000"]
+    assert store.get("0" * 64) is None
+
+
+def test_compact_moves_loose_objects_into_archives(store):
+    digests = [store.put(f"<p>{i}</p>", "list", "t") for i in range(5)]
+    assert store.stats()["loose_objects"] == 5
+    assert store.compact(older_than_days=0) == 5
+    assert store.stats()["loose_objects"] == 0
+    assert os.listdir(store.objects_dir) == []  # boş alt dizinler silinir
+    assert len(os.listdir(store.archives_dir)) == 1
+    assert [store.get(d) for d in digests] == [f"<p>{i}</p>" for i in range(5)]  # arşivden okunur
+    # arşivlenmiş içerik tekrar gelirse yeniden yazılmaz, arşivden okunmaya devam eder
+    assert store.put("<p>0</p>", "list", "t") == digests[0] and store.get(digests[0]) == "<p>0</p>"
+    assert dict((h, html) for h, html in store.iter_html("list")) == {d: f"<p>{i}</p>" for i, d in enumerate(digests)}
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+import src.main as app
+from src.network_capture import _FAKE_ORDERS
+from src.order_export import iter_records
+
+OTHER_URL = "https://partner.tgoyemek.com/meal/777/order/list"
+
+
+class _InlineWriter:
+    """output_writer yerine: işleri hemen çalıştırır."""
+    def append(self, path, content):
+        with open(path, "a", encoding="utf-8") as f: f.write(content)
+    def call(self, func): func()
+    def close(self): pass
+
+
+class _Switch:
+    def __init__(self, driver): self.driver = driver
+    def window(self, handle):
+        self.driver.switches.append(handle)
+        self.driver.current_window_handle = handle
+
+
+class TabDriver:
+    def __init__(self): self.switches, self.current_window_handle = [], None
+    @property
+    def switch_to(self): return _Switch(self)
+
+
+class CaptureManager:
+    def __init__(self, responses): self.responses = responses
+    def drain_network_responses(self, url_patterns):
+        out, self.responses = self.responses, []
+        return out
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    """Geçici SAVE_DIR'de birincil + ikinci mağaza; modül durumu test sonunda geri alınır."""
+    for name, value in (("SAVE_DIR", str(tmp_path)), ("_INDEX_PATH", str(tmp_path / "processed_orders.sqlite3")),
+                        ("_primary_store", None), ("_stores", []), ("_active_handle", None), ("_startup", {}),
+                        ("get_output_writer", lambda: _InlineWriter())):
+        monkeypatch.setattr(app, name, value)
+    for name in ("browser_manager", "output_writer", "order_jsonl", "snapshot_store", "_clicked_cards", "_processed_detail_urls"):
+        monkeypatch.setattr(app, name, getattr(app, name))
+    app._init_state()
+    other = app.StoreMonitor(OTHER_URL)
+    monkeypatch.setattr(app, "_stores", [app._primary_store, other])
+    yield app._primary_store, other
+    for store in app._stores: store.close()
+    app._clicked_cards.close(), app._processed_detail_urls.close(), app.snapshot_store.close()
+
+
+def _response(url: str, order: dict) -> dict: return {"url": url, "status": 200, "body": json.dumps(order)}
+
+
+def test_network_orders_land_in_per_store_files(stores, monkeypatch, tmp_path):
+    primary, other = stores
+    manager = CaptureManager([
+        _response("https://partner.tgoyemek.com/api/meal/777/orders/1001", _FAKE_ORDERS[0]),
+        _response("https://partner.tgoyemek.com/api/orders/1002?storeId=245018", _FAKE_ORDERS[1]),
+        _response("https://partner.tgoyemek.com/api/orders/1001?restaurantId=777", _FAKE_ORDERS[0]),  # aynı mağazada tekrar
+    ])
+    monkeypatch.setattr(app, "browser_manager", manager)
+    assert app._network_step() == 2
+
+    assert other.orders_txt == str(tmp_path / "siparisler-777.txt") and primary.orders_txt == str(tmp_path / "siparisler.txt")
+    with open(other.orders_txt, encoding="utf-8") as f: assert "1001" in f.read()
+    with open(primary.orders_txt, encoding="utf-8") as f: text = f.read()
+    assert "1002" in text and "1001" not in text
+    assert [r["order_no"] for r in iter_records(str(tmp_path / "orders" / "777"))] == ["1001"]
+    assert [r["order_no"] for r in iter_records(str(tmp_path / "orders"))] == ["1002"]
+
+
+def test_dedupe_state_is_isolated_and_persistent(stores, tmp_path):
+    primary, other = stores
+    other.clicked_cards.add("kart-1")
+    assert "kart-1" in other.clicked_cards and "kart-1" not in primary.clicked_cards
+    other.close()
+    reopened = app.StoreMonitor(OTHER_URL)
+    app._stores[1] = reopened
+    assert "kart-1" in reopened.clicked_cards and reopened.store_id == "777"
+
+
+def test_activate_switches_tabs_only_on_change(stores):
+    primary, other = stores
+    primary.handle, other.handle = "tab-a", "tab-b"
+    driver = TabDriver()
+    for store in (primary, primary, other, other, primary): store.activate(driver)
+    assert driver.switches == ["tab-a", "tab-b", "tab-a"]
+    assert primary.label == "[245018] " and other.label == "[777] "
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import json, threading, tracemalloc
+
+import pytest
+
+import src.tracing as tracing
+from src.tracing import _NULL_SPAN, Tracer
+
+
+def test_disabled_tracer_returns_shared_span_and_keeps_nothing():
+    tracer = Tracer(enabled=False)
+    assert tracer.span("order", key="k") is _NULL_SPAN
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for i in range(10_000):
+            with tracer.span("order", key=i) as sp: sp.set(clicked=True)
+            tracer.instant("click_failed")
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    grown = [s for s in after.compare_to(before, "filename") if s.traceback[0].filename == tracing.__file__ and s.size_diff > 0]
+    assert grown == []
+    assert len(tracer._events) == 0 and tracer._threads == {}
+    assert [e["ph"] for e in tracer.events()] == ["M"]
+
+
+def test_span_event_format(tmp_path):
+    tracer = Tracer(enabled=True)
+    with tracer.span("order", key="5001") as sp:
+        with tracer.span("click", cat="ui"): pass
+        sp.set(clicked=True)
+    with pytest.raises(RuntimeError):
+        with tracer.span("parse"): raise RuntimeError("bozuk panel")
+    worker = threading.Thread(target=lambda: tracer.instant("flush", cat="writer"), name="writer-thread")
+    worker.start(); worker.join()
+
+    meta, events = tracer.events()[:3], tracer.events()[3:]
+    assert meta[0]["name"] == "process_name" and {m["args"]["name"] for m in meta[1:]} == {threading.current_thread().name, "writer-thread"}
+    click, order, parse, flush = events
+    assert (click["name"], click["cat"], click["ph"]) == ("click", "ui", "X")
+    assert order["args"] == {"key": "5001", "clicked": True} and parse["args"] == {"error": "RuntimeError"}
+    assert order["ts"] <= click["ts"] and click["ts"] + click["dur"] <= order["ts"] + order["dur"]  # iç içe
+    assert (flush["ph"], flush["s"], flush["tid"]) == ("i", "t", worker.ident) and "dur" not in flush
+    assert all(e["pid"] == meta[0]["pid"] for e in events)
+
+    path = tmp_path / "trace" / "order.json"
+    assert tracer.write(str(path)) == 7
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["displayTimeUnit"] == "ms" and len(data["traceEvents"]) == 7 and data["otherData"] == {"dropped_events": 0}
+    assert not (tmp_path / "trace" / "order.json.tmp").exists()
+
+
+def test_ring_buffer_counts_dropped_events():
+    tracer = Tracer(enabled=True, max_events=3)
+    for i in range(5): tracer.instant(f"e{i}")
+    assert [e["name"] for e in tracer.events()[2:]] == ["e2", "e3", "e4"] and tracer.dropped == 2
+    tracer.clear()
+    assert tracer.dropped == 0 and len(tracer._events) == 0
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import json, os, subprocess, sys, threading, time
+
+import pytest
+
+from src.settings import settings
+
+settings_mod = sys.modules["src.settings"]  # src paketi "settings" adını örneğe bağlar
+
+
+@pytest.fixture
+def probe(tmp_path, monkeypatch):
+    """Geçici önbellek dosyası + '--version' çağrılarını sayan sahte subprocess.run."""
+    runs = []
+    def fake_run(cmd, **kw):
+        runs.append(cmd[0])
+        return subprocess.CompletedProcess(cmd, 0, stdout=f"Google Chrome 124.0.{len(runs)}.207\n", stderr="")
+    monkeypatch.setattr(settings_mod, "_VERSION_CACHE_PATH", tmp_path / "cache" / "version_probes.json")
+    monkeypatch.setattr(settings_mod, "_version_cache", None)
+    monkeypatch.setattr(settings_mod.subprocess, "run", fake_run)
+    binary = tmp_path / "chrome"
+    binary.write_bytes(b"v1")
+    return binary, runs
+
+
+def test_probe_is_cached_in_memory_and_on_disk(probe, monkeypatch):
+    binary, runs = probe
+    assert settings_mod._probe_version(binary) == "124.0.1.207"
+    assert settings_mod._probe_version(binary) == "124.0.1.207" and len(runs) == 1
+    monkeypatch.setattr(settings_mod, "_version_cache", None)  # yeni süreç: diskten okunur
+    assert settings_mod._probe_version(binary) == "124.0.1.207" and len(runs) == 1
+    (key,) = json.loads(settings_mod._VERSION_CACHE_PATH.read_text(encoding="utf-8"))
+    assert key.startswith(str(binary.resolve()) + "|")
+
+
+def test_binary_update_invalidates_entry(probe):
+    binary, runs = probe
+    settings_mod._probe_version(binary)
+    st = binary.stat()
+    os.utime(binary, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))  # güncelleme: mtime değişir
+    assert settings_mod._probe_version(binary) == "124.0.2.207" and len(runs) == 2
+    binary.write_bytes(b"v2-daha-uzun")  # boyut değişimi de yeni ölçüm gerektirir
+    os.utime(binary, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert settings_mod._probe_version(binary) == "124.0.3.207" and len(runs) == 3
+    cached = json.loads(settings_mod._VERSION_CACHE_PATH.read_text(encoding="utf-8"))
+    assert list(cached.values()) == ["124.0.3.207"]  # aynı yolun eski kayıtları atılır
+
+
+def test_missing_binary_or_unparsable_output_is_not_cached(probe, monkeypatch, tmp_path):
+    binary, runs = probe
+    assert settings_mod._probe_version(tmp_path / "yok") is None and runs == []
+    monkeypatch.setattr(settings_mod.subprocess, "run", lambda cmd, **kw: subprocess.CompletedProcess(cmd, 1, stdout="", stderr="hata"))
+    assert settings_mod._probe_version(binary) is None and not settings_mod._VERSION_CACHE_PATH.exists()
+
+
+def test_browser_and_driver_versions_are_probed_in_parallel(tmp_path, monkeypatch):
+    driver = tmp_path / "chromedriver"
+    driver.write_bytes(b"")
+    monkeypatch.setattr(settings, "chromedriver_path", str(driver))
+    monkeypatch.setattr(settings, "app_base_dir", str(tmp_path))
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow(version):
+        def probe(path):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.2)
+            with lock: active[0] -= 1
+            return version
+        return probe
+
+    monkeypatch.setattr(settings_mod, "_get_chrome_version", slow("124.0.6367.207"))
+    monkeypatch.setattr(settings_mod, "_get_chromedriver_version", slow("124.0.6367.91"))
+    start = time.perf_counter()
+    assert settings_mod._get_chrome_driver_path() == str(driver)  # ana sürümler uyumlu: indirme yok
+    assert peak[0] == 2 and time.perf_counter() - start < 0.35